@@ -0,0 +1,194 @@
+"""
+Per-action overhead of every connection in connection_manager.py, without network access.
+
+Each connection runs its actions through ConnectionManager.call_action while HTTP traffic
+(REST, Web3 and Solana RPC) is served from benchmarks/cassettes/<connection>.json, so the
+numbers cover everything the agent adds on top of the provider: validation, circuit breakers,
+rate limiter, tracing, metrics, request signing and response parsing.
+
+Run from the robot directory:
+    python -m benchmarks.bench_connections [--iterations N] [--latency SECONDS] [connection ...]
+
+Record fresh cassettes against the live APIs, with real credentials in .env:
+    python -m benchmarks.bench_connections --record twitter discord
+"""
+import argparse
+import logging
+import os
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.cassette import RECORD, REPLAY, CassetteMiss, use_cassette, wrap_solana_client
+from src.connection_manager import CONNECTION_MODULES, ConnectionManager
+from src.helpers.cache import action_cache
+
+CASSETTE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cassettes")
+
+
+def _solana_key() -> str:
+    from solders.keypair import Keypair
+    return str(Keypair())
+
+
+@dataclass
+class Scenario:
+    config: Dict[str, Any]
+    actions: List[Tuple[str, List[Any]]]
+    # Placeholder credentials for replay, values may be callables for keys that must parse
+    env: Dict[str, Any] = field(default_factory=dict)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "twitter": Scenario(
+        config={"name": "twitter", "timeline_read_count": 10, "own_tweet_replies_count": 2, "tweet_interval": 5400},
+        env={
+            "TWITTER_CONSUMER_KEY": "bench", "TWITTER_CONSUMER_SECRET": "bench",
+            "TWITTER_ACCESS_TOKEN": "bench", "TWITTER_ACCESS_TOKEN_SECRET": "bench",
+            "TWITTER_USER_ID": "1000"
+        },
+        actions=[("read-timeline", [])]
+    ),
+    "discord": Scenario(
+        config={"name": "discord", "server_id": "1300000000000000000", "message_read_count": 10, "message_emoji_name": "❤️"},
+        env={"DISCORD_TOKEN": "bench"},
+        actions=[("read-messages", ["1300000000000000001"]), ("list-channels", [])]
+    ),
+    "echochambers": Scenario(
+        config={
+            "name": "echochambers", "api_url": "https://echochambers.art", "api_key": "bench", "room": "general",
+            "sender_username": "bench_bot", "sender_model": "bench", "history_read_count": 10, "post_history_track": 20
+        },
+        actions=[("get-room-history", []), ("get-room-info", [])]
+    ),
+    "sonic": Scenario(
+        config={"name": "sonic", "network": "mainnet"},
+        env={"SONIC_PRIVATE_KEY": "0x" + "11" * 32},
+        actions=[("get-token-by-ticker", ["USDC"]), ("get-balance", [])]
+    ),
+    "ethereum": Scenario(
+        config={"name": "ethereum", "rpc": "https://ethereum-rpc.publicnode.com"},
+        env={"ETH_PRIVATE_KEY": "0x" + "11" * 32},
+        actions=[("get-token-by-ticker", ["USDC"]), ("get-balance", [])]
+    ),
+    "solana": Scenario(
+        config={"name": "solana", "rpc": "https://api.mainnet-beta.solana.com"},
+        env={"SOLANA_PRIVATE_KEY": _solana_key},
+        actions=[
+            ("fetch-price", ["So11111111111111111111111111111111111111112"]),
+            ("get-token-by-ticker", ["WIF"]),
+            ("get-balance", []),
+            ("get-tps", [])
+        ]
+    ),
+    "ollama": Scenario(
+        config={"name": "ollama", "base_url": "http://localhost:11434", "model": "llama3.2"},
+        actions=[("generate-text", ["Write a haiku about latency", "You are a terse poet"])]
+    ),
+}
+
+# Connections whose SDKs open their own HTTP clients, which the cassette layer does not hook
+UNHOOKED = {
+    "anthropic": "anthropic SDK client",
+    "openai": "openai SDK client",
+    "xai": "openai SDK client",
+    "hyperbolic": "openai SDK client",
+    "galadriel": "openai SDK client",
+    "eternalai": "openai SDK client",
+    "farcaster": "farcaster SDK client",
+    "goat": "goat SDK plugins",
+    "allora": "allora SDK client",
+}
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _apply_env(env: Dict[str, Any]) -> None:
+    for key, value in env.items():
+        os.environ[key] = value() if callable(value) else value
+
+
+def run_scenario(name: str, scenario: Scenario, mode: str, iterations: int, latency: float, recorded_latency: bool) -> List[str]:
+    path = os.path.join(CASSETTE_DIR, f"{name}.json")
+    if mode == REPLAY:
+        if not os.path.exists(path):
+            return [f"{name:<14} skipped: no cassette at {os.path.relpath(path)}"]
+        _apply_env(scenario.env)
+
+    lines = []
+    with use_cassette(path, mode=mode, latency=latency, recorded_latency=recorded_latency):
+        manager = ConnectionManager([scenario.config], shared=False)
+        try:
+            if name not in manager.connections:
+                return [f"{name:<14} skipped: connection failed to initialize"]
+            if name == "solana":
+                # solana-py sends RPC calls through its own httpx client, point it at the cassette
+                wrap_solana_client(manager.connections[name]._get_connection_async())
+            if not manager.connections[name].check_configured(verbose=True):
+                return [f"{name:<14} skipped: connection is not configured"]
+
+            for action, params in scenario.actions:
+                runs = 1 if mode == RECORD else iterations
+                samples = []
+                error: Optional[str] = None
+                for _ in range(runs):
+                    # Measure the full path, not the action cache
+                    action_cache.invalidate()
+                    started = time.perf_counter()
+                    try:
+                        manager.call_action(name, action, params)
+                    except CassetteMiss as e:
+                        error = str(e)
+                        break
+                    except Exception as e:
+                        error = f"{type(e).__name__}: {e}"
+                        break
+                    samples.append(time.perf_counter() - started)
+
+                label = f"{name} {action}"
+                if error:
+                    lines.append(f"{label:<36} failed: {error}")
+                elif mode == RECORD:
+                    lines.append(f"{label:<36} recorded")
+                else:
+                    lines.append(
+                        f"{label:<36} {statistics.mean(samples) * 1000:9.3f} {_percentile(samples, 0.5) * 1000:9.3f} "
+                        f"{_percentile(samples, 0.99) * 1000:9.3f} {len(samples) / sum(samples):10.0f}"
+                    )
+        finally:
+            manager.close()
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline per-action overhead of every connection")
+    parser.add_argument("connections", nargs="*", help="Connections to run (default: all)")
+    parser.add_argument("--iterations", type=int, default=200, help="Calls per action")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every replayed response")
+    parser.add_argument("--recorded-latency", action="store_true", help="Replay responses with the latency measured while recording")
+    parser.add_argument("--record", action="store_true", help="Call the live APIs once per action and overwrite the cassettes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    mode = RECORD if args.record else REPLAY
+    names = args.connections or list(CONNECTION_MODULES)
+
+    if mode == REPLAY:
+        print(f"{'action':<36} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'calls/s':>10}")
+    for name in names:
+        if name in SCENARIOS:
+            lines = run_scenario(name, SCENARIOS[name], mode, args.iterations, args.latency, args.recorded_latency)
+        elif name in UNHOOKED:
+            lines = [f"{name:<14} skipped: traffic goes through the {UNHOOKED[name]}"]
+        else:
+            lines = [f"{name:<14} skipped: unknown connection"]
+        for line in lines:
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+How many agent loops one host sustains.
+
+Starts N ZerePyAgent loops in the supervisor's thread pool against local stand-ins for every
+provider they call (benchmarks/mock_providers.py): an OpenAI compatible LLM, Twitter v2,
+Discord, Echochambers, and JSON-RPC nodes for Sonic, Ethereum and Solana. The stand-ins run
+in a child process so their CPU is not counted. Agent intervals are divided by --speedup,
+so a one minute run at 60x covers an hour of agent time.
+
+After a warm up, it reports action throughput, p50/p99 action latency (from the
+"action <task>" spans), and the CPU and RSS the fleet costs per agent. Run it with growing
+--agents: the host is saturated once actions per agent-hour drop or p99 latency climbs.
+
+Run from the robot directory:
+    python -m benchmarks.bench_fleet --agents 50 --duration 60 --speedup 60
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from requests.adapters import HTTPAdapter
+
+from benchmarks.mock_providers import BOT_USER_ID, BOT_USERNAME, DISCORD_CHANNEL_ID, DISCORD_SERVER_ID, serve_until_closed
+from src import tracing
+from src.action_handler import register_action
+from src.http_client import http_client
+from src.supervisor import AgentSupervisor
+import src.actions.ethereum_actions
+import src.actions.sonic_actions
+
+# Hosts the connections hard code, sent to the matching stand-in instead
+REDIRECTED_HOSTS = {
+    "api.twitter.com": "twitter",
+    "discord.com": "discord",
+    "rpc.soniclabs.com": "evm"
+}
+
+# (task, weight, seconds of agent time between runs). post-tweet is left out because it
+# also stores every tweet in MongoDB, which has no stand-in
+TASK_MIX = [
+    ("reply-to-tweet", 3, 900),
+    ("like-tweet", 3, 600),
+    ("reply-echochambers", 2, 900),
+    ("post-echochambers", 1, 1800),
+    ("reply-discord", 2, 900),
+    ("get-sonic-balance", 1, 3600),
+    ("get-eth-balance", 1, 3600),
+    ("sol-balance", 1, 3600)
+]
+LOOP_DELAY = 900
+RETRY_DELAY = 60
+
+
+@register_action("reply-discord", connection="discord")
+def reply_discord(agent, **kwargs):
+    """Reply to the newest message mentioning the bot. Discord has no agent task yet, this mirrors reply-echochambers"""
+    messages = agent.connection_manager.perform_action(
+        connection_name="discord",
+        action_name="read-mentioned-messages",
+        params=[DISCORD_CHANNEL_ID]
+    )
+    if not messages:
+        return False
+
+    message = messages[0]
+    reply = agent.prompt_llm(f"Reply in one or two sentences to this Discord message from @{message['author']}: {message['message']}")
+    if reply:
+        agent.connection_manager.perform_action(
+            connection_name="discord",
+            action_name="reply-to-message",
+            params=[DISCORD_CHANNEL_ID, message["id"], reply]
+        )
+        return True
+    return False
+
+
+class RedirectAdapter(HTTPAdapter):
+    """Sends requests for the hosts in redirects to local base URLs, everything else passes through"""
+
+    def __init__(self, redirects: Dict[str, str], **kwargs):
+        super().__init__(**kwargs)
+        self.redirects = {host: urlsplit(url) for host, url in redirects.items()}
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        target = self.redirects.get(parts.hostname)
+        if target is not None:
+            # OAuth signatures were computed for the original URL, the stand-ins do not check them
+            request.url = urlunsplit((target.scheme, target.netloc, parts.path, parts.query, ""))
+        return super().send(request, **kwargs)
+
+
+class ActionLatencies:
+    """
+    Span sink that keeps the duration of every agent action. "action <task>" spans are
+    matched to the agent.iteration span around them, which names the agent.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple[str, float, bool]] = {}
+        self.recording = False
+        self.by_agent: Dict[str, List[float]] = defaultdict(list)
+        self.by_task: Dict[str, List[float]] = defaultdict(list)
+        self.failed_actions = 0
+        self.http_requests = 0
+        self.http_errors = 0
+
+    def export(self, spans: List[tracing.Span]) -> None:
+        for span in spans:
+            if span.name.startswith("HTTP "):
+                if self.recording:
+                    failed = span.status_code == tracing.STATUS_ERROR or span.attributes.get("http.status_code", 0) >= 400
+                    with self._lock:
+                        self.http_requests += 1
+                        self.http_errors += failed
+            elif span.name.startswith("action ") and "connection" not in span.attributes and span.parent_span_id:
+                with self._lock:
+                    self._pending[span.parent_span_id] = (
+                        span.attributes.get("action"), span.duration, span.status_code == tracing.STATUS_ERROR
+                    )
+            elif span.name == "agent.iteration":
+                with self._lock:
+                    action = self._pending.pop(span.span_id, None)
+                    if action is None or not self.recording:
+                        continue
+                    task, duration, failed = action
+                    self.by_agent[span.attributes.get("agent")].append(duration)
+                    self.by_task[task].append(duration)
+                    self.failed_actions += failed
+
+    def close(self) -> None:
+        pass
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _rss_bytes() -> int:
+    """Current resident set size, or the peak where /proc is not available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _cpu_seconds() -> float:
+    times = os.times()
+    return times.user + times.system
+
+
+def _placeholder_env(urls: Dict[str, str]) -> Dict[str, str]:
+    """Credentials the connections need to start, the stand-ins accept anything"""
+    from solders.keypair import Keypair
+    return {
+        "OPENAI_API_KEY": "bench",
+        "OPENAI_BASE_URL": f"{urls['llm']}/v1",
+        "TWITTER_CONSUMER_KEY": "bench",
+        "TWITTER_CONSUMER_SECRET": "bench",
+        "TWITTER_ACCESS_TOKEN": "bench",
+        "TWITTER_ACCESS_TOKEN_SECRET": "bench",
+        "TWITTER_USER_ID": BOT_USER_ID,
+        "TWITTER_USERNAME": BOT_USERNAME,
+        "DISCORD_TOKEN": "bench",
+        "SONIC_PRIVATE_KEY": "0x" + "11" * 32,
+        "ETH_PRIVATE_KEY": "0x" + "11" * 32,
+        "SOLANA_PRIVATE_KEY": str(Keypair())
+    }
+
+
+def agent_config(index: int, urls: Dict[str, str], speedup: float, loop_mode: str, concurrency: int) -> Dict[str, Any]:
+    name = f"loadtest-{index}"
+    return {
+        "name": name,
+        "bio": [f"{name} is a load test persona that talks about agents, chains and markets."],
+        "traits": ["curious", "concise"],
+        "examples": ["Blocks are just heartbeats with receipts."],
+        "example_accounts": [],
+        "loop_delay": LOOP_DELAY / speedup,
+        "loop_mode": loop_mode,
+        "max_concurrent_tasks": concurrency,
+        "retry_delay": RETRY_DELAY / speedup,
+        "config": [
+            {"name": "openai", "model": "gpt-4o-mini"},
+            {"name": "twitter", "timeline_read_count": 10, "own_tweet_replies_count": 2, "tweet_interval": 5400 / speedup},
+            {"name": "discord", "server_id": DISCORD_SERVER_ID, "message_read_count": 10, "message_emoji_name": "❤️"},
+            {
+                "name": "echochambers", "api_url": urls["echochambers"], "api_key": "bench", "room": "general",
+                "sender_username": name, "sender_model": "gpt-4o-mini", "history_read_count": 10,
+                "post_history_track": 20, "message_interval": 1800 / speedup
+            },
+            {"name": "sonic", "network": "mainnet"},
+            {"name": "ethereum", "rpc": urls["evm"]},
+            {"name": "solana", "rpc": urls["solana"]}
+        ],
+        "tasks": [{"name": task, "weight": weight, "interval": interval / speedup} for task, weight, interval in TASK_MIX],
+        "use_time_based_weights": False,
+        "time_based_multipliers": {}
+    }
+
+
+def report(
+    latencies: ActionLatencies,
+    supervisor: AgentSupervisor,
+    agents: int,
+    window: float,
+    speedup: float,
+    cpu: float,
+    rss: int
+) -> None:
+    samples = [duration for durations in latencies.by_agent.values() for duration in durations]
+    states = supervisor.status()["states"]
+    agent_hours = window * speedup / 3600
+
+    print(f"\nAgents: {agents} ({', '.join(f'{state}={count}' for state, count in sorted(states.items()))})")
+    print(f"Window: {window:.0f} s wall, {agent_hours:.2f} h agent time at {speedup:g}x")
+    print(f"Actions: {len(samples)} ({latencies.failed_actions} raised), {len(samples) / window:.1f}/s, "
+          f"{len(samples) / agents / agent_hours if agent_hours else 0:.1f} per agent-hour")
+    print(f"HTTP requests to providers: {latencies.http_requests} ({latencies.http_errors} failed), "
+          f"{latencies.http_requests / window:.1f}/s")
+    if samples:
+        print(f"Action latency: p50 {_percentile(samples, 0.5) * 1000:.1f} ms, p99 {_percentile(samples, 0.99) * 1000:.1f} ms, "
+              f"max {max(samples) * 1000:.1f} ms")
+        print(f"\n  {'task':<22} {'count':>7} {'p50 ms':>9} {'p99 ms':>9}")
+        for task, durations in sorted(latencies.by_task.items()):
+            print(f"  {task:<22} {len(durations):>7} {_percentile(durations, 0.5) * 1000:>9.1f} {_percentile(durations, 0.99) * 1000:>9.1f}")
+        counts = [len(latencies.by_agent.get(f"loadtest-{index}", [])) for index in range(agents)]
+        print(f"\nActions per agent: min {min(counts)}, median {statistics.median(counts):g}, max {max(counts)}")
+    print(f"CPU per agent: {cpu / window / agents * 100:.2f}% of a core ({cpu / window * 100:.0f}% for the fleet)")
+    print(f"RSS per agent: {rss / agents / 2 ** 20:.2f} MiB ({rss / 2 ** 20:.0f} MiB for the fleet)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a fleet of agents against local provider stand-ins")
+    parser.add_argument("--agents", type=int, default=10, help="Agent loops to run")
+    parser.add_argument("--duration", type=float, default=60, help="Measured wall clock seconds, after the warm up")
+    parser.add_argument("--warmup", type=float, default=10, help="Seconds to let agents start before measuring")
+    parser.add_argument("--speedup", type=float, default=60, help="Agent time runs this many times faster than wall time")
+    parser.add_argument("--loop-mode", choices=("sync", "async"), default="sync", help="Agent loop mode")
+    parser.add_argument("--concurrency", type=int, default=1, help="max_concurrent_tasks of async loops")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds the LLM stand-in takes per completion")
+    parser.add_argument("--api-latency", type=float, default=0.05, help="Seconds the other stand-ins take per request")
+    parser.add_argument("--pool-size", type=int, default=None, help="Keep-alive sockets per host of the shared HTTP client")
+    parser.add_argument("--verbose", action="store_true", help="Show agent logs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL, format="[%(threadName)s] %(message)s")
+
+    latencies = {name: args.api_latency for name in ("twitter", "discord", "echochambers", "evm", "solana")}
+    latencies["llm"] = args.llm_latency
+    parent_conn, child_conn = multiprocessing.Pipe()
+    providers = multiprocessing.Process(target=serve_until_closed, args=(child_conn, latencies), name="mock-providers", daemon=True)
+    providers.start()
+    urls = parent_conn.recv()
+
+    os.environ.update(_placeholder_env(urls))
+    if args.pool_size:
+        http_client.configure(pool_size=args.pool_size)
+    pool = http_client.adapter
+    previous_adapter = http_client.set_adapter(RedirectAdapter(
+        {host: urls[provider] for host, provider in REDIRECTED_HOSTS.items()},
+        pool_connections=pool._pool_connections,
+        pool_maxsize=pool._pool_maxsize
+    ))
+    collector = ActionLatencies()
+    previous_exporter = tracing.set_exporter(collector)
+
+    agents_dir = tempfile.mkdtemp(prefix="zerepy-loadtest-")
+    names = []
+    for index in range(args.agents):
+        config = agent_config(index, urls, args.speedup, args.loop_mode, args.concurrency)
+        with open(os.path.join(agents_dir, f"{config['name']}.json"), "w") as f:
+            json.dump(config, f)
+        names.append(config["name"])
+
+    supervisor = AgentSupervisor(names, mode="thread", restart_backoff=RETRY_DELAY / args.speedup, agents_dir=agents_dir)
+    rss_before = _rss_bytes()
+    print(f"Starting {args.agents} agents ({args.loop_mode} loops) at {args.speedup:g}x, "
+          f"warm up {args.warmup:g} s, measuring {args.duration:g} s")
+    try:
+        supervisor.start()
+        deadline = time.monotonic() + args.warmup
+        while time.monotonic() < deadline:
+            supervisor.poll()
+            time.sleep(0.5)
+
+        collector.recording = True
+        cpu_start, started = _cpu_seconds(), time.monotonic()
+        deadline = started + args.duration
+        while time.monotonic() < deadline:
+            supervisor.poll()
+            time.sleep(0.5)
+        collector.recording = False
+        window, cpu = time.monotonic() - started, _cpu_seconds() - cpu_start
+        rss = _rss_bytes() - rss_before
+
+        report(collector, supervisor, args.agents, window, args.speedup, cpu, rss)
+    except KeyboardInterrupt:
+        print("\nLoad test interrupted")
+    finally:
+        supervisor.stop(timeout=30)
+        tracing.set_exporter(previous_exporter)
+        http_client.set_adapter(previous_adapter)
+        parent_conn.close()
+        providers.join(timeout=5)
+        shutil.rmtree(agents_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Cost of decoding the largest API payloads the connections parse, before and after json_codec.
+
+"before" is what the connections used to do: decode the body to str, then json.loads it
+(requests' response.json() and Discord's json.loads(response.text)). "after" is
+json_codec.decode on the raw bytes with every installed backend. "typed" decodes the token
+list into dataclasses, which only pays off with msgspec: it skips the unused fields while
+parsing, whereas the fallback has to build every dict first.
+
+Run from the robot directory: python -m benchmarks.bench_json_codec [--repeat N]
+"""
+import argparse
+import json
+import random
+import string
+import timeit
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from src.helpers import json_codec
+
+
+@dataclass
+class VerifiedToken:
+    """The fields get-token-by-address reads from each entry of the verified token list"""
+    address: str
+    symbol: Optional[str] = None
+    name: Optional[str] = None
+
+
+def _text(rng: random.Random, length: int) -> str:
+    return "".join(rng.choices(string.ascii_letters + string.digits, k=length))
+
+
+def _address(rng: random.Random) -> str:
+    return _text(rng, 44)
+
+
+def jupiter_token_list(rng: random.Random, count: int = 5000) -> List[Dict[str, Any]]:
+    """tokens.jup.ag/tokens?tags=verified, used by get-token-by-address"""
+    return [{
+        "address": _address(rng),
+        "name": _text(rng, 16),
+        "symbol": _text(rng, 5).upper(),
+        "decimals": rng.choice([6, 8, 9]),
+        "logoURI": f"https://arweave.net/{_text(rng, 43)}",
+        "tags": ["verified", "strict"] if rng.random() < 0.3 else ["verified"],
+        "daily_volume": rng.random() * 1e7,
+        "created_at": "2024-04-26T10:56:58.893768Z",
+        "freeze_authority": None,
+        "mint_authority": None,
+        "permanent_delegate": None,
+        "minted_at": None,
+        "extensions": {"coingeckoId": _text(rng, 10).lower()}
+    } for _ in range(count)]
+
+
+def dexscreener_search(rng: random.Random, count: int = 30) -> Dict[str, Any]:
+    """api.dexscreener.com/latest/dex/search, used by get-token-by-ticker"""
+    def token():
+        return {"address": _address(rng), "name": _text(rng, 12), "symbol": _text(rng, 4).upper()}
+
+    return {"schemaVersion": "1.0.0", "pairs": [{
+        "chainId": rng.choice(["solana", "ethereum", "sonic", "base"]),
+        "dexId": rng.choice(["raydium", "orca", "uniswap"]),
+        "url": f"https://dexscreener.com/solana/{_address(rng).lower()}",
+        "pairAddress": _address(rng),
+        "labels": ["CLMM"],
+        "baseToken": token(),
+        "quoteToken": token(),
+        "priceNative": f"{rng.random():.8f}",
+        "priceUsd": f"{rng.random() * 100:.6f}",
+        "txns": {window: {"buys": rng.randint(0, 9999), "sells": rng.randint(0, 9999)} for window in ("m5", "h1", "h6", "h24")},
+        "volume": {window: rng.random() * 1e6 for window in ("h24", "h6", "h1", "m5")},
+        "priceChange": {window: rng.uniform(-50, 50) for window in ("m5", "h1", "h6", "h24")},
+        "liquidity": {"usd": rng.random() * 1e7, "base": rng.random() * 1e6, "quote": rng.random() * 1e5},
+        "fdv": rng.randint(1, 10 ** 10),
+        "marketCap": rng.randint(1, 10 ** 10),
+        "pairCreatedAt": 1723000000000 + rng.randint(0, 10 ** 9),
+        "info": {
+            "imageUrl": f"https://dd.dexscreener.com/ds-data/tokens/solana/{_address(rng)}.png",
+            "websites": [{"label": "Website", "url": "https://example.com"}],
+            "socials": [{"type": "twitter", "url": "https://x.com/example"}]
+        }
+    } for _ in range(count)]}
+
+
+def kyberswap_route(rng: random.Random, hops: int = 12) -> Dict[str, Any]:
+    """aggregator-api.kyberswap.com/{chain}/api/v1/routes, used by swaps on Sonic and Ethereum"""
+    def swap():
+        return {
+            "pool": "0x" + _text(rng, 40).lower(),
+            "tokenIn": "0x" + _text(rng, 40).lower(),
+            "tokenOut": "0x" + _text(rng, 40).lower(),
+            "swapAmount": str(rng.randint(1, 10 ** 20)),
+            "amountOut": str(rng.randint(1, 10 ** 20)),
+            "exchange": rng.choice(["uniswapv3", "curve", "balancer-v2"]),
+            "poolType": "uniswap-v3",
+            "poolExtra": {"swapFee": 500, "priceLimit": str(rng.randint(1, 10 ** 30))},
+            "extra": {"nSqrtRx96": str(rng.randint(1, 10 ** 30))}
+        }
+
+    return {"code": 0, "message": "successfully", "data": {
+        "routeSummary": {
+            "tokenIn": "0x" + _text(rng, 40).lower(),
+            "amountIn": "1000000000000000000",
+            "amountInUsd": "3412.12",
+            "tokenOut": "0x" + _text(rng, 40).lower(),
+            "amountOut": "3409000000",
+            "amountOutUsd": "3409.87",
+            "gas": "450000",
+            "gasPrice": "12000000000",
+            "gasUsd": "4.12",
+            "extraFee": {"feeAmount": "0", "chargeFeeBy": "", "isInBps": False, "feeReceiver": ""},
+            "route": [[swap() for _ in range(3)] for _ in range(hops // 3)],
+            "routeID": _text(rng, 36),
+            "checksum": str(rng.randint(1, 10 ** 19)),
+            "timestamp": 1723000000
+        },
+        "routerAddress": "0x6131B5fae19EA4f9D964eAc0408E4408b66337b5"
+    }}
+
+
+def discord_messages(rng: random.Random, count: int = 100) -> List[Dict[str, Any]]:
+    """GET /channels/{id}/messages?limit=100, used by read-messages and read-mentioned-messages"""
+    def user():
+        return {"id": str(rng.randint(10 ** 17, 10 ** 18)), "username": _text(rng, 10), "avatar": _text(rng, 32),
+                "discriminator": "0", "public_flags": 0, "flags": 0, "banner": None, "accent_color": None,
+                "global_name": _text(rng, 12), "avatar_decoration_data": None, "banner_color": None, "clan": None}
+
+    return [{
+        "type": 0,
+        "content": " ".join(_text(rng, rng.randint(2, 10)) for _ in range(rng.randint(5, 60))),
+        "mentions": [user() for _ in range(rng.randint(0, 2))],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "timestamp": "2024-11-20T12:34:56.789000+00:00",
+        "edited_timestamp": None,
+        "flags": 0,
+        "components": [],
+        "id": str(rng.randint(10 ** 17, 10 ** 18)),
+        "channel_id": str(rng.randint(10 ** 17, 10 ** 18)),
+        "author": user(),
+        "pinned": False,
+        "mention_everyone": False,
+        "tts": False
+    } for _ in range(count)]
+
+
+def _stdlib_from_text(body: bytes) -> Callable[[], Any]:
+    return lambda: json.loads(body.decode("utf-8"))
+
+
+def _codec(backend: str, body: bytes, target: Any = None) -> Callable[[], Any]:
+    def run():
+        json_codec.set_backend(backend)
+        return json_codec.decode(body, target)
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="Decodes per measurement")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    payloads = {
+        "jupiter verified tokens": (json.dumps(jupiter_token_list(rng)).encode(), List[VerifiedToken]),
+        "dexscreener search": (json.dumps(dexscreener_search(rng)).encode(), None),
+        "kyberswap route": (json.dumps(kyberswap_route(rng)).encode(), None),
+        "discord messages page": (json.dumps(discord_messages(rng)).encode(), None)
+    }
+
+    default_backend = json_codec.backend_name()
+    print(f"Backends available: {', '.join(json_codec.BACKENDS)} (default {default_backend}, msgspec typed decoding: {'yes' if json_codec.msgspec else 'no'})")
+    for name, (body, target) in payloads.items():
+        print(f"\n{name}: {len(body) / 1024:.0f} KiB")
+        cases = {"before: json.loads(body.decode())": _stdlib_from_text(body)}
+        for backend in json_codec.BACKENDS:
+            cases[f"after: {backend} from bytes"] = _codec(backend, body)
+            if target is not None:
+                cases[f"after: {backend} typed"] = _codec(backend, body, target)
+
+        baseline = None
+        for label, run in cases.items():
+            best = min(timeit.repeat(run, number=args.repeat, repeat=5)) / args.repeat
+            baseline = baseline or best
+            print(f"  {label:<38} {best * 1000:8.3f} ms  {baseline / best:5.1f}x")
+
+    json_codec.set_backend(default_backend)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+"""
+Local stand-ins for the providers agents talk to, used by bench_fleet.py.
+
+Each provider is a small ThreadingHTTPServer that answers the endpoints the connections
+call with well formed, freshly numbered payloads: an OpenAI compatible LLM, Twitter v2,
+Discord, Echochambers, an EVM JSON-RPC node and a Solana JSON-RPC node. Every response can
+be delayed to stand in for the provider's real latency. Rate limit headers always report a
+large budget, so the load test measures the agent, not the limiter.
+"""
+import itertools
+import json
+import logging
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qs
+
+logger = logging.getLogger("benchmarks.mock_providers")
+
+BOT_USERNAME = "bench_bot"
+BOT_USER_ID = "1000"
+DISCORD_SERVER_ID = "1300000000000000000"
+DISCORD_CHANNEL_ID = "1300000000000000001"
+SONIC_CHAIN_ID = 146
+
+_ids = itertools.count(1800000000000000000)
+_WORDS = (
+    "agents chains blocks latency tokens liquidity validators consensus memes markets "
+    "signals narratives builders wallets bridges oracles yields rollups"
+).split()
+
+Reply = Tuple[int, Any, Dict[str, str]]
+
+
+def _next_id() -> str:
+    return str(next(_ids))
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Hundreds of agents may connect at once
+    request_queue_size = 256
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Routes requests to handler methods by method and path pattern"""
+
+    # Keep-alive, like the real APIs, so the client's connection pools behave as in production
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    routes: List[Tuple[str, Pattern, str]] = []
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def _dispatch(self, method: str) -> None:
+        path, _, query = self.path.partition("?")
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        for route_method, pattern, name in self.routes:
+            match = pattern.fullmatch(path)
+            if route_method == method and match:
+                if self.latency:
+                    time.sleep(self.latency)
+                status, payload, headers = getattr(self, name)(match, parse_qs(query), body)
+                self._reply(status, payload, headers)
+                return
+        self._reply(404, {"error": f"No stand-in for {method} {path}"}, {})
+
+    def _reply(self, status: int, payload: Any, headers: Dict[str, str]) -> None:
+        data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    @property
+    def rng(self) -> random.Random:
+        return random.Random(threading.get_ident() ^ time.monotonic_ns())
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _routes(*routes: Tuple[str, str, str]) -> List[Tuple[str, Pattern, str]]:
+    return [(method, re.compile(pattern), name) for method, pattern, name in routes]
+
+
+class LLMHandler(MockHandler):
+    """OpenAI compatible chat completions, the SDK is pointed here with OPENAI_BASE_URL"""
+
+    routes = _routes(
+        ("GET", r"/v1/models", "list_models"),
+        ("GET", r"/v1/models/(?P<model>[^/]+)", "get_model"),
+        ("POST", r"/v1/chat/completions", "chat_completion")
+    )
+
+    def list_models(self, match, query, body) -> Reply:
+        models = [{"id": model, "object": "model", "created": 1700000000, "owned_by": "system"}
+                  for model in ("gpt-4o-mini", "gpt-4o", "gpt-3.5-turbo")]
+        return 200, {"object": "list", "data": models}, {}
+
+    def get_model(self, match, query, body) -> Reply:
+        return 200, {"id": match["model"], "object": "model", "created": 1700000000, "owned_by": "system"}, {}
+
+    def chat_completion(self, match, query, body) -> Reply:
+        request = json.loads(body)
+        rng = self.rng
+        text = " ".join(_sentence(rng, rng.randint(6, 12)) for _ in range(rng.randint(1, 3)))
+        return 200, {
+            "id": f"chatcmpl-{_next_id()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o-mini"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text[:270]},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 300, "completion_tokens": 40, "total_tokens": 340}
+        }, {}
+
+
+class TwitterHandler(MockHandler):
+    """The Twitter v2 endpoints used by the timeline, reply and like tasks"""
+
+    routes = _routes(
+        ("GET", r"/2/users/me", "users_me"),
+        ("GET", r"/2/users/(?P<user_id>\d+)/timelines/reverse_chronological", "timeline"),
+        ("GET", r"/2/tweets/search/recent", "search"),
+        ("GET", r"/2/users/by/username/(?P<username>[^/]+)", "user_by_username"),
+        ("GET", r"/2/users/(?P<user_id>\d+)/tweets", "user_tweets"),
+        ("POST", r"/2/tweets", "create_tweet"),
+        ("POST", r"/2/users/(?P<user_id>\d+)/likes", "like")
+    )
+
+    @staticmethod
+    def _rate_limit() -> Dict[str, str]:
+        return {
+            "x-rate-limit-limit": "100000",
+            "x-rate-limit-remaining": "99999",
+            "x-rate-limit-reset": str(int(time.time()) + 900)
+        }
+
+    def _tweets(self, count: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        rng = self.rng
+        users = [{"id": str(2000 + i), "name": f"Account {i}", "username": f"account_{i}"} for i in range(5)]
+        tweets = []
+        for _ in range(count):
+            tweet_id = _next_id()
+            tweets.append({
+                "id": tweet_id,
+                "text": _sentence(rng, rng.randint(8, 30)),
+                "author_id": rng.choice(users)["id"],
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime()),
+                "edit_history_tweet_ids": [tweet_id]
+            })
+        return tweets, users
+
+    def users_me(self, match, query, body) -> Reply:
+        return 200, {"data": {"id": BOT_USER_ID, "username": BOT_USERNAME, "name": "Bench Bot"}}, self._rate_limit()
+
+    def user_by_username(self, match, query, body) -> Reply:
+        return 200, {"data": {"id": "2000", "username": match["username"], "name": match["username"]}}, self._rate_limit()
+
+    def timeline(self, match, query, body) -> Reply:
+        count = int(query.get("max_results", ["10"])[0])
+        tweets, users = self._tweets(count)
+        return 200, {"data": tweets, "includes": {"users": users}, "meta": {"result_count": count}}, self._rate_limit()
+
+    def user_tweets(self, match, query, body) -> Reply:
+        tweets, _ = self._tweets(int(query.get("max_results", ["10"])[0]))
+        return 200, {"data": tweets, "meta": {"result_count": len(tweets)}}, self._rate_limit()
+
+    def search(self, match, query, body) -> Reply:
+        tweets, _ = self._tweets(int(query.get("max_results", ["10"])[0]) // 2)
+        return 200, {"data": tweets, "meta": {"result_count": len(tweets)}}, self._rate_limit()
+
+    def create_tweet(self, match, query, body) -> Reply:
+        request = json.loads(body)
+        return 201, {"data": {"id": _next_id(), "text": request["text"], "edit_history_tweet_ids": []}}, self._rate_limit()
+
+    def like(self, match, query, body) -> Reply:
+        return 200, {"data": {"liked": True}}, self._rate_limit()
+
+
+class DiscordHandler(MockHandler):
+    """Discord REST v10, one text channel whose messages mention the bot now and then"""
+
+    routes = _routes(
+        ("GET", r"/api/v10/users/@me", "users_me"),
+        ("GET", r"/api/v10/channels/(?P<channel_id>\d+)/messages", "read_messages"),
+        ("POST", r"/api/v10/channels/(?P<channel_id>\d+)/messages", "post_message"),
+        ("PUT", r"/api/v10/channels/(?P<channel_id>\d+)/messages/(?P<message_id>\d+)/reactions/[^/]+/@me", "react"),
+        ("GET", r"/api/v10/guilds/(?P<guild_id>\d+)/channels", "list_channels")
+    )
+
+    @staticmethod
+    def _rate_limit(bucket: str) -> Dict[str, str]:
+        return {
+            "X-RateLimit-Bucket": bucket,
+            "X-RateLimit-Limit": "100000",
+            "X-RateLimit-Remaining": "99999",
+            "X-RateLimit-Reset-After": "1"
+        }
+
+    @staticmethod
+    def _user(username: str) -> Dict[str, Any]:
+        return {"id": _next_id(), "username": username, "global_name": username, "avatar": None, "discriminator": "0"}
+
+    def _message(self, channel_id: str, content: str, author: str, mentions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "type": 0,
+            "id": _next_id(),
+            "channel_id": channel_id,
+            "author": self._user(author),
+            "content": content,
+            "mentions": mentions,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S.000000+00:00", time.gmtime()),
+            "edited_timestamp": None,
+            "attachments": [],
+            "embeds": []
+        }
+
+    def users_me(self, match, query, body) -> Reply:
+        return 200, dict(self._user(BOT_USERNAME), bot=True), {}
+
+    def read_messages(self, match, query, body) -> Reply:
+        rng = self.rng
+        count = int(query.get("limit", ["10"])[0])
+        messages = [
+            self._message(
+                match["channel_id"], _sentence(rng, rng.randint(5, 25)), f"member_{rng.randint(1, 50)}",
+                [self._user(BOT_USERNAME)] if rng.random() < 0.3 else []
+            )
+            for _ in range(count)
+        ]
+        return 200, messages, self._rate_limit("messages")
+
+    def post_message(self, match, query, body) -> Reply:
+        request = json.loads(body)
+        return 200, self._message(match["channel_id"], request["content"], BOT_USERNAME, []), self._rate_limit("post")
+
+    def react(self, match, query, body) -> Reply:
+        return 204, None, self._rate_limit("reactions")
+
+    def list_channels(self, match, query, body) -> Reply:
+        channels = [{"id": str(int(DISCORD_CHANNEL_ID) + i), "type": 0 if i % 4 else 2, "name": f"channel-{i}",
+                     "guild_id": match["guild_id"], "position": i} for i in range(12)]
+        return 200, channels, self._rate_limit("channels")
+
+
+class EchochambersHandler(MockHandler):
+    """Echochambers rooms API with a single busy room"""
+
+    routes = _routes(
+        ("GET", r"/api/rooms", "rooms"),
+        ("GET", r"/api/rooms/(?P<room>[^/]+)/history", "history"),
+        ("POST", r"/api/rooms/(?P<room>[^/]+)/message", "message")
+    )
+
+    def rooms(self, match, query, body) -> Reply:
+        return 200, {"rooms": [{
+            "id": "general",
+            "name": "General",
+            "topic": "Autonomous agents onchain",
+            "tags": ["ai", "crypto", "agents"],
+            "messageCount": 1000,
+            "participants": []
+        }]}, {}
+
+    def history(self, match, query, body) -> Reply:
+        rng = self.rng
+        messages = [{
+            "id": f"msg-{_next_id()}",
+            "content": _sentence(rng, rng.randint(8, 30)),
+            "sender": {"username": f"agent_{rng.randint(1, 50)}", "model": "gpt-4o-mini"},
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime()),
+            "roomId": match["room"]
+        } for _ in range(20)]
+        return 200, {"messages": messages}, {}
+
+    def message(self, match, query, body) -> Reply:
+        request = json.loads(body)
+        return 200, {"id": f"msg-{_next_id()}", "content": request.get("content"), "roomId": match["room"]}, {}
+
+
+class JsonRpcHandler(MockHandler):
+    """JSON-RPC 2.0 on any path, subclasses map method names to results"""
+
+    routes = _routes(("POST", r"/.*", "rpc"))
+    results: Dict[str, Any] = {}
+
+    def result(self, method: str, params: Any) -> Any:
+        if method not in self.results:
+            raise KeyError(method)
+        result = self.results[method]
+        return result() if callable(result) else result
+
+    def _call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "result": self.result(request["method"], request.get("params"))}
+        except KeyError:
+            return {"jsonrpc": "2.0", "id": request.get("id"),
+                    "error": {"code": -32601, "message": f"Method {request.get('method')} not found"}}
+
+    def rpc(self, match, query, body) -> Reply:
+        request = json.loads(body)
+        if isinstance(request, list):
+            return 200, [self._call(item) for item in request], {}
+        return 200, self._call(request), {}
+
+
+class EvmRpcHandler(JsonRpcHandler):
+    """Enough of an EVM node for connection checks and native balance reads"""
+
+    results = {
+        "web3_clientVersion": "mock/v1.0.0",
+        "net_version": str(SONIC_CHAIN_ID),
+        "eth_chainId": hex(SONIC_CHAIN_ID),
+        "eth_blockNumber": lambda: hex(int(time.time())),
+        "eth_gasPrice": hex(10 ** 9),
+        "eth_getBalance": hex(2 * 10 ** 18),
+        "eth_getTransactionCount": "0x0"
+    }
+
+
+class SolanaRpcHandler(JsonRpcHandler):
+    """Enough of a Solana node for balance and TPS reads"""
+
+    @staticmethod
+    def _slot() -> int:
+        return int(time.time() * 2.5)
+
+    def result(self, method: str, params: Any) -> Any:
+        context = {"context": {"apiVersion": "2.0.15", "slot": self._slot()}}
+        if method == "getBalance":
+            return dict(context, value=1500000000)
+        if method == "getLatestBlockhash":
+            return dict(context, value={"blockhash": "EkSnNWid2cvwEVnVx9aBqawnmiCNiDgp3gUdkDPTKN1N", "lastValidBlockHeight": self._slot()})
+        if method == "getRecentPerformanceSamples":
+            return [{"numSlots": 150, "numTransactions": 250000, "numNonVoteTransactions": 1100,
+                     "samplePeriodSecs": 60, "slot": self._slot()}]
+        if method == "getSlot":
+            return self._slot()
+        if method == "getHealth":
+            return "ok"
+        if method == "getVersion":
+            return {"solana-core": "2.0.15", "feature-set": 607245837}
+        raise KeyError(method)
+
+
+PROVIDERS = {
+    "llm": LLMHandler,
+    "twitter": TwitterHandler,
+    "discord": DiscordHandler,
+    "echochambers": EchochambersHandler,
+    "evm": EvmRpcHandler,
+    "solana": SolanaRpcHandler
+}
+
+
+def serve(latencies: Optional[Dict[str, float]] = None, host: str = "127.0.0.1") -> Dict[str, ThreadingHTTPServer]:
+    """Start every provider on a free port in background threads"""
+    latencies = latencies or {}
+    servers = {}
+    for name, handler in PROVIDERS.items():
+        handler = type(handler.__name__, (handler,), {"latency": latencies.get(name, 0.0)})
+        server = _Server((host, 0), handler)
+        threading.Thread(target=server.serve_forever, name=f"mock-{name}", daemon=True).start()
+        servers[name] = server
+    return servers
+
+
+def base_urls(servers: Dict[str, ThreadingHTTPServer]) -> Dict[str, str]:
+    return {name: f"http://{server.server_address[0]}:{server.server_address[1]}" for name, server in servers.items()}
+
+
+def serve_until_closed(conn: Connection, latencies: Dict[str, float]) -> None:
+    """Process entry point: send the base URLs back, then serve until the other end closes the pipe"""
+    servers = serve(latencies)
+    conn.send(base_urls(servers))
+    try:
+        conn.recv()
+    except EOFError:
+        pass
+    for server in servers.values():
+        server.shutdown()
@@ -1,20 +1,45 @@
+import asyncio
 import logging
+from src.tracing import span
 
 logger = logging.getLogger("action_handler")
 
 action_registry = {}    
+# Action name -> connection it depends on, lets the scheduler skip actions whose connection is down
+action_connections = {}
 
-def register_action(action_name):
+def register_action(action_name, connection=None):
     def decorator(func):
         action_registry[action_name] = func
+        if connection:
+            action_connections[action_name] = connection
         return func
     return decorator
 
 def execute_action(agent, action_name, **kwargs):
     if action_name in action_registry:
-       return action_registry[action_name](agent, **kwargs)
+        action = action_registry[action_name]
+        with span(f"action {action_name}", action=action_name):
+            if asyncio.iscoroutinefunction(action):
+                return asyncio.run(action(agent, **kwargs))
+            return action(agent, **kwargs)
     else:
         logger.error(f"Action {action_name} not found")
         return None
-    
 
+async def execute_action_async(agent, action_name, **kwargs):
+    """Run a registered action as a coroutine.
+
+    Coroutine actions are awaited directly, plain actions are pushed to the
+    event loop's default executor so blocking I/O does not stall other tasks.
+    """
+    if action_name in action_registry:
+        action = action_registry[action_name]
+        # asyncio.to_thread copies the context, so spans opened by the action nest under this one
+        with span(f"action {action_name}", action=action_name):
+            if asyncio.iscoroutinefunction(action):
+                return await action(agent, **kwargs)
+            return await asyncio.to_thread(action, agent, **kwargs)
+    else:
+        logger.error(f"Action {action_name} not found")
+        return None
@@ -1,8 +1,25 @@
 import time,random
 from src.action_handler import register_action
 from src.prompts import REPLY_ECHOCHAMBER_PROMPT, POST_ECHOCHAMBER_PROMPT
+from src.content_queue import register_content
 
-@register_action("post-echochambers")
+
+# Candidates build on the room history, so they go stale sooner than tweets
+@register_content("post-echochambers", ttl=1800)
+def post_echochambers_prompt(agent):
+    if not agent.state.get("room_info"):
+        return None
+    previous_messages = agent.connection_manager.connections["echochambers"].sent_messages
+    previous_content = "\n".join([f"- {msg['content']}" for msg in previous_messages])
+    agent.logger.info(f"Found {len(previous_messages)} messages in post history")
+    return POST_ECHOCHAMBER_PROMPT.format(
+        room_topic=agent.state['room_info']['topic'],
+        tags=", ".join(agent.state['room_info']['tags']),
+        previous_content=previous_content
+    )
+
+
+@register_action("post-echochambers", connection="echochambers")
 def post_echochambers(agent, **kwargs):
     current_time = time.time()
 
@@ -15,17 +32,12 @@ def post_echochambers(agent, **kwargs):
     if current_time - agent.state["echochambers_last_message"] > agent.echochambers_message_interval:
         agent.logger.info("\n📝 GENERATING NEW ECHOCHAMBERS MESSAGE")
         
-        # Generate message based on room topic and tags
-        previous_messages = agent.connection_manager.connections["echochambers"].sent_messages
-        previous_content = "\n".join([f"- {msg['content']}" for msg in previous_messages])
-        agent.logger.info(f"Found {len(previous_messages)} messages in post history")
-        
-        prompt  = POST_ECHOCHAMBER_PROMPT.format(
-            room_topic=agent.state['room_info']['topic'],
-            tags=", ".join(agent.state['room_info']['tags']),
-            previous_content=previous_content
-        )
-        message = agent.prompt_llm(prompt)
+        # Generated ahead of time when the agent has a content_queue, live otherwise
+        message = agent.pop_content("post-echochambers")
+        if not message:
+            # Generate message based on room topic and tags
+            prompt = post_echochambers_prompt(agent)
+            message = agent.prompt_llm(prompt, cache=False) if prompt else None
         
         if message:
             agent.logger.info(f"\n🚀 Posting message: '{message[:69]}...'")
@@ -39,7 +51,7 @@ def post_echochambers(agent, **kwargs):
             return True
     return False
 
-@register_action("reply-echochambers")
+@register_action("reply-echochambers", connection="echochambers")
 def reply_echochambers(agent, **kwargs):
     agent.logger.info("\n🔍 CHECKING FOR MESSAGES TO REPLY TO")
     
@@ -87,7 +99,7 @@ def reply_echochambers(agent, **kwargs):
                 tags=", ".join(agent.state['room_info']['tags']),
                 username_prompt=username_prompt
             )
-            reply = agent.prompt_llm(prompt)
+            reply = agent.prompt_llm(prompt, cache=False)
             
             if reply:
                 agent.logger.info(f"\n🚀 Posting reply: '{reply[:69]}...'")
@@ -5,7 +5,7 @@ from src.action_handler import register_action
 
 logger = logging.getLogger("actions.ethereum_actions")
 
-@register_action("get-token-by-ticker")
+@register_action("get-token-by-ticker", connection="ethereum")
 def get_token_by_ticker(agent, **kwargs):
     """Get token address by ticker symbol"""
     try:
@@ -27,7 +27,7 @@ def get_token_by_ticker(agent, **kwargs):
         logger.error(f"Failed to get token by ticker: {str(e)}")
         return None
 
-@register_action("get-eth-balance")
+@register_action("get-eth-balance", connection="ethereum")
 def get_eth_balance(agent, **kwargs):
     """Get native or token balance"""
     try:
@@ -55,7 +55,7 @@ def get_eth_balance(agent, **kwargs):
         logger.error(f"Failed to get balance: {str(e)}")
         return None
 
-@register_action("send-eth")
+@register_action("send-eth", connection="ethereum")
 def send_eth(agent, **kwargs):
     """Send native tokens to an address"""
     try:
@@ -75,7 +75,7 @@ def send_eth(agent, **kwargs):
         logger.error(f"Failed to send native tokens: {str(e)}")
         return None
 
-@register_action("send-eth-token")
+@register_action("send-eth-token", connection="ethereum")
 def send_eth_token(agent, **kwargs):
     """Send ERC20 tokens"""
     try:
@@ -97,7 +97,7 @@ def send_eth_token(agent, **kwargs):
         logger.error(f"Failed to send tokens: {str(e)}")
         return None
 
-@register_action("get-address")
+@register_action("get-address", connection="ethereum")
 def get_address(agent, **kwargs):
     """Get configured Ethereum wallet address"""
     try:
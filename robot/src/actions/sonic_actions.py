@@ -5,7 +5,7 @@ from src.action_handler import register_action
 
 logger = logging.getLogger("actions.sonic_actions")
 
-@register_action("get-token-by-ticker")
+@register_action("get-token-by-ticker", connection="sonic")
 def get_token_by_ticker(agent, **kwargs):
     """Get token address by ticker symbol"""
     try:
@@ -27,7 +27,7 @@ def get_token_by_ticker(agent, **kwargs):
         logger.error(f"Failed to get token by ticker: {str(e)}")
         return None
 
-@register_action("get-sonic-balance")
+@register_action("get-sonic-balance", connection="sonic")
 def get_sonic_balance(agent, **kwargs):
     """Get $S or token balance"""
     try:
@@ -57,7 +57,7 @@ def get_sonic_balance(agent, **kwargs):
         logger.error(f"Failed to get balance: {str(e)}")
         return None
 
-@register_action("send-sonic")
+@register_action("send-sonic", connection="sonic")
 def send_sonic(agent, **kwargs):
     """Send $S tokens to an address"""
     try:
@@ -77,7 +77,7 @@ def send_sonic(agent, **kwargs):
         logger.error(f"Failed to send $S: {str(e)}")
         return None
 
-@register_action("send-sonic-token")
+@register_action("send-sonic-token", connection="sonic")
 def send_sonic_token(agent, **kwargs):
     """Send tokens on Sonic chain"""
     try:
@@ -99,7 +99,7 @@ def send_sonic_token(agent, **kwargs):
         logger.error(f"Failed to send tokens: {str(e)}")
         return None
 
-@register_action("swap-sonic")
+@register_action("swap-sonic", connection="sonic")
 def swap_sonic(agent, **kwargs):
     """Swap tokens on Sonic chain"""
     try:
@@ -2,9 +2,15 @@ import time
 from src.action_handler import register_action
 from src.helpers import print_h_bar
 from src.prompts import POST_TWEET_PROMPT, REPLY_TWEET_PROMPT
+from src.content_queue import register_content
 
 
-@register_action("post-tweet")
+@register_content("post-tweet", max_length=280)
+def post_tweet_prompt(agent):
+    return POST_TWEET_PROMPT.format(agent_name = agent.name)
+
+
+@register_action("post-tweet", connection="twitter")
 def post_tweet(agent, **kwargs):
     current_time = time.time()
 
@@ -17,17 +23,30 @@ def post_tweet(agent, **kwargs):
         agent.logger.info("\n📝 GENERATING NEW TWEET")
         print_h_bar()
 
-        prompt = POST_TWEET_PROMPT.format(agent_name = agent.name)
-        tweet_text = agent.prompt_llm(prompt)
+        # A queued job that crashed after generating keeps its text, so a retry posts the same tweet
+        job = kwargs.get("job")
+        tweet_text = job.state.get("tweet_text") if job else None
+        if not tweet_text:
+            # Generated ahead of time when the agent has a content_queue, live otherwise
+            tweet_text = agent.pop_content("post-tweet")
+        if not tweet_text:
+            # The prompt never changes, a cached response would post the same tweet again
+            tweet_text = agent.prompt_llm(post_tweet_prompt(agent), cache=False)
+        if job and tweet_text and "tweet_text" not in job.state:
+            job.checkpoint(tweet_text=tweet_text)
 
         if tweet_text:
             agent.logger.info("\n🚀 Posting tweet:")
             agent.logger.info(f"'{tweet_text}'")
-            agent.connection_manager.perform_action(
+            posted = agent.connection_manager.perform_action(
                 connection_name="twitter",
                 action_name="post-tweet",
                 params=[tweet_text]
             )
+            if not posted:
+                # Failing the job retries it with the checkpointed text
+                agent.logger.error("\n❌ Failed to post tweet")
+                return False
             agent.state["last_tweet_time"] = current_time
             agent.logger.info("\n✅ Tweet posted successfully!")
             return True
@@ -36,7 +55,14 @@ def post_tweet(agent, **kwargs):
         return False
 
 
-@register_action("reply-to-tweet")
+def generate_reply(agent, tweet):
+    base_prompt = REPLY_TWEET_PROMPT.format(tweet_text =tweet.get('text') )
+    system_prompt = agent._construct_system_prompt()
+    # Replies answer one tweet in its current conversation, a cached reply would be stale
+    return agent.prompt_llm(prompt=base_prompt, system_prompt=system_prompt, cache=False)
+
+
+@register_action("reply-to-tweet", connection="twitter")
 def reply_to_tweet(agent, **kwargs):
     if "timeline_tweets" in agent.state and agent.state["timeline_tweets"] is not None and len(agent.state["timeline_tweets"]) > 0:
         tweet = agent.state["timeline_tweets"].pop(0)
@@ -44,11 +70,11 @@ def reply_to_tweet(agent, **kwargs):
         if not tweet_id:
             return
 
-        agent.logger.info(f"\n💬 GENERATING REPLY to: {tweet.get('text', '')[:50]}...")
-
-        base_prompt = REPLY_TWEET_PROMPT.format(tweet_text =tweet.get('text') )
-        system_prompt = agent._construct_system_prompt()
-        reply_text = agent.prompt_llm(prompt=base_prompt, system_prompt=system_prompt)
+        # Drafted in the background once the timeline was read, see src/reply_drafts.py
+        reply_text = agent.take_reply_draft(tweet_id)
+        if not reply_text:
+            agent.logger.info(f"\n💬 GENERATING REPLY to: {tweet.get('text', '')[:50]}...")
+            reply_text = generate_reply(agent, tweet)
 
         if reply_text:
             agent.logger.info(f"\n🚀 Posting reply: '{reply_text}'")
@@ -63,7 +89,7 @@ def reply_to_tweet(agent, **kwargs):
         agent.logger.info("\n👀 No tweets found to reply to...")
         return False
 
-@register_action("like-tweet")
+@register_action("like-tweet", connection="twitter")
 def like_tweet(agent, **kwargs):
     if "timeline_tweets" in agent.state and agent.state["timeline_tweets"] is not None and len(agent.state["timeline_tweets"]) > 0:
         tweet = agent.state["timeline_tweets"].pop(0)
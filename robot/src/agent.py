@@ -1,14 +1,27 @@
+import asyncio
 import json
 import random
 import time
 import logging
 import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator, Optional
 from dotenv import load_dotenv
 from src.connection_manager import ConnectionManager
 from src.helpers import print_h_bar
-from src.action_handler import execute_action
+from src.action_handler import execute_action, execute_action_async, action_connections
+from src.scheduler import TaskScheduler, DEFAULT_RETRY_DELAY
+from src.job_queue import Job, JobQueue, JobWorkerPool, DEFAULT_JOB_DB, DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS
+from src.tracing import span
+from src.llm_cache import llm_cache, cache_key
+from src.llm_router import LLMRouter, ROUTER_SETTINGS
+from src.reply_drafts import ReplyDrafter, DEFAULT_MAX_WORKERS, DEFAULT_LOOKAHEAD, DEFAULT_MAX_AGE
+from src.content_queue import ContentQueue, content_sources, refill, DEFAULT_CONTENT_DB, DEFAULT_MAX_SIZE, DEFAULT_MIN_IDLE
 import src.actions.twitter_actions  
+from src.actions.twitter_actions import generate_reply
 import src.actions.echochamber_actions
 import src.actions.solana_actions
 from datetime import datetime
@@ -20,10 +33,12 @@ logger = logging.getLogger("agent")
 class ZerePyAgent:
     def __init__(
             self,
-            agent_name: str
+            agent_name: str,
+            stop_event=None,
+            agents_dir: str = "agents"
     ):
         try:
-            agent_path = Path("agents") / f"{agent_name}.json"
+            agent_path = Path(agents_dir) / f"{agent_name}.json"
             agent_dict = json.load(open(agent_path, "r"))
 
             missing_fields = [field for field in REQUIRED_FIELDS if field not in agent_dict]
@@ -36,6 +51,20 @@ class ZerePyAgent:
             self.examples = agent_dict["examples"]
             self.example_accounts = agent_dict["example_accounts"]
             self.loop_delay = agent_dict["loop_delay"]
+            self.loop_mode = agent_dict.get("loop_mode", "sync")
+            self.max_concurrent_tasks = max(1, int(agent_dict.get("max_concurrent_tasks", 1)))
+            self.retry_delay = agent_dict.get("retry_delay", DEFAULT_RETRY_DELAY)
+            self.job_queue_config = agent_dict.get("job_queue", {})
+            self.llm_router_config = agent_dict.get("llm_router", {})
+            unknown_options = set(self.llm_router_config) - {"providers", "enabled", *ROUTER_SETTINGS}
+            if unknown_options:
+                raise ValueError(
+                    f"Unknown llm_router options: {', '.join(sorted(unknown_options))} "
+                    f"(expected providers, enabled, {', '.join(ROUTER_SETTINGS)})"
+                )
+            # Pre-generation of posts is off unless the agent has a content_queue block
+            self.content_queue_config = agent_dict.get("content_queue")
+            self.reply_drafts_config = agent_dict.get("reply_drafts", {})
             self.connection_manager = ConnectionManager(agent_dict["config"])
             self.use_time_based_weights = agent_dict["use_time_based_weights"]
             self.time_based_multipliers = agent_dict["time_based_multipliers"]
@@ -55,6 +84,9 @@ class ZerePyAgent:
                 self.echochambers_history_count = echochambers_config.get("history_read_count", 50)
 
             self.is_llm_set = False
+            self.llm_router = None
+            self._content_queue = None
+            self._reply_drafter = None
 
             # Cache for system prompt
             self._system_prompt = None
@@ -67,6 +99,9 @@ class ZerePyAgent:
             # Set up empty agent state
             self.state = {}
 
+            # Set to stop the loop, may be shared with a supervisor (threading or multiprocessing Event)
+            self._stop_event = stop_event or threading.Event()
+
         except Exception as e:
             logger.error("Could not load ZerePy agent")
             raise e
@@ -78,6 +113,22 @@ class ZerePyAgent:
             raise ValueError("No configured LLM provider found")
         self.model_provider = llm_providers[0]
 
+        # With several providers, generate-text is routed with failover and hedging. Providers are
+        # resolved here, when the loop or a CLI chat starts: one configured later joins on the next start
+        settings = dict(self.llm_router_config)
+        preferred = settings.pop("providers", None)
+        if preferred:
+            llm_providers = [name for name in preferred if name in llm_providers] or llm_providers
+            self.model_provider = llm_providers[0]
+        route = len(llm_providers) > 1 and settings.pop("enabled", True)
+        # Called again by every CLI chat, keep the latency history when nothing changed
+        if self.llm_router is not None and (not route or self.llm_router.providers != llm_providers):
+            self.llm_router.close()
+            self.llm_router = None
+        if route and self.llm_router is None:
+            self.llm_router = LLMRouter(self.connection_manager, llm_providers, **settings)
+            logger.info(f"Routing LLM requests across {', '.join(llm_providers)}")
+
         # Load Twitter username for self-reply detection if Twitter tasks exist
         if any("tweet" in task["name"] for task in self.tasks):
             load_dotenv()
@@ -88,29 +139,30 @@ class ZerePyAgent:
     def _construct_system_prompt(self) -> str:
         """Construct the system prompt from agent configuration"""
         if self._system_prompt is None:
-            prompt_parts = []
-            prompt_parts.extend(self.bio)
-
-            if self.traits:
-                prompt_parts.append("\nYour key traits are:")
-                prompt_parts.extend(f"- {trait}" for trait in self.traits)
-
-            if self.examples or self.example_accounts:
-                prompt_parts.append("\nHere are some examples of your style (Please avoid repeating any of these):")
-                if self.examples:
-                    prompt_parts.extend(f"- {example}" for example in self.examples)
-
-                if self.example_accounts:
-                    for example_account in self.example_accounts:
-                        tweets = self.connection_manager.perform_action(
-                            connection_name="twitter",
-                            action_name="get-latest-tweets",
-                            params=[example_account]
-                        )
-                        if tweets:
-                            prompt_parts.extend(f"- {tweet['text']}" for tweet in tweets)
-
-            self._system_prompt = "\n".join(prompt_parts)
+            with span("agent.construct_system_prompt", agent=self.name):
+                prompt_parts = []
+                prompt_parts.extend(self.bio)
+
+                if self.traits:
+                    prompt_parts.append("\nYour key traits are:")
+                    prompt_parts.extend(f"- {trait}" for trait in self.traits)
+
+                if self.examples or self.example_accounts:
+                    prompt_parts.append("\nHere are some examples of your style (Please avoid repeating any of these):")
+                    if self.examples:
+                        prompt_parts.extend(f"- {example}" for example in self.examples)
+
+                    if self.example_accounts:
+                        for example_account in self.example_accounts:
+                            tweets = self.connection_manager.perform_action(
+                                connection_name="twitter",
+                                action_name="get-latest-tweets",
+                                params=[example_account]
+                            )
+                            if tweets:
+                                prompt_parts.extend(f"- {tweet['text']}" for tweet in tweets)
+
+                self._system_prompt = "\n".join(prompt_parts)
 
         return self._system_prompt
     
@@ -135,29 +187,236 @@ class ZerePyAgent:
         
         return weights
 
-    def prompt_llm(self, prompt: str, system_prompt: str = None) -> str:
-        """Generate text using the configured LLM provider"""
+    def _llm_cache_key(self, prompt: str, system_prompt: str) -> str:
+        # Any provider of the router may answer, so the key covers all of them
+        providers = self.llm_router.providers if self.llm_router is not None else [self.model_provider]
+        # The connection config holds the model and any sampling parameters
+        params = {
+            provider: {
+                name: value for name, value in self.connection_manager.connections[provider].config.items() if name != "name"
+            }
+            for provider in providers
+        }
+        return cache_key(",".join(providers), params, system_prompt, prompt)
+
+    def prompt_llm(self, prompt: str, system_prompt: str = None, cache: bool = True) -> str:
+        """
+        Generate text using the configured LLM provider
+
+        Args:
+            cache: Reuse the response to an identical earlier request when the LLM cache is on (see src/llm_cache.py),
+                pass False for creative generation that must differ on every call
+        """
         system_prompt = system_prompt or self._construct_system_prompt()
 
-        return self.connection_manager.perform_action(
-            connection_name=self.model_provider,
-            action_name="generate-text",
-            params=[prompt, system_prompt]
-        )
+        key = self._llm_cache_key(prompt, system_prompt) if cache and llm_cache.enabled else None
+        if key is not None:
+            cached = llm_cache.get(key)
+            if cached is not None:
+                return cached
+
+        if self.llm_router is not None:
+            response = self.llm_router.generate(prompt, system_prompt)
+        else:
+            response = self.connection_manager.perform_action(
+                connection_name=self.model_provider,
+                action_name="generate-text",
+                params=[prompt, system_prompt]
+            )
+        if key is not None and isinstance(response, str) and response:
+            llm_cache.set(key, response)
+        return response
+
+    def prompt_llm_stream(self, prompt: str, system_prompt: str = None, cache: bool = True) -> Iterator[str]:
+        """
+        Like prompt_llm, but yields the response in chunks as the provider generates it.
+        A cached response is yielded in one piece.
+
+        Raises:
+            Exception: Whatever the provider raised, unlike prompt_llm which returns None
+        """
+        system_prompt = system_prompt or self._construct_system_prompt()
+
+        key = self._llm_cache_key(prompt, system_prompt) if cache and llm_cache.enabled else None
+        if key is not None:
+            cached = llm_cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        if self.llm_router is not None:
+            stream = self.llm_router.stream(prompt, system_prompt)
+        else:
+            stream = self.connection_manager.call_action(
+                connection_name=self.model_provider,
+                action_name="generate-text-stream",
+                params=[prompt, system_prompt]
+            )
+        chunks = []
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            # Ends the provider request (and its span) when the consumer stops early
+            getattr(stream, "close", lambda: None)()
+
+        # Only complete responses are cached, a consumer that stops early never gets here
+        response = "".join(chunks)
+        if key is not None and response:
+            llm_cache.set(key, response)
 
     def perform_action(self, connection: str, action: str, **kwargs) -> None:
         return self.connection_manager.perform_action(connection, action, **kwargs)
     
     def select_action(self, use_time_based_weights: bool = False) -> dict:
+        task_weights = self._current_task_weights(use_time_based_weights)
+        return random.choices(self.tasks, weights=task_weights, k=1)[0]
+
+    def _current_task_weights(self, use_time_based_weights: bool = False) -> list:
         task_weights = [weight for weight in self.task_weights.copy()]
         
         if use_time_based_weights:
             current_hour = datetime.now().hour
             task_weights = self._adjust_weights_for_time(current_hour, task_weights)
-        
-        return random.choices(self.tasks, weights=task_weights, k=1)[0]
 
-    def loop(self):
+        return task_weights
+
+    def _task_interval(self, task: dict) -> float:
+        """Minimum seconds between two runs of a task"""
+        if "interval" in task:
+            return task["interval"]
+        if task["name"] == "post-tweet" and hasattr(self, "tweet_interval"):
+            return self.tweet_interval
+        if task["name"] == "post-echochambers" and hasattr(self, "echochambers_message_interval"):
+            return self.echochambers_message_interval
+        return self.loop_delay
+
+    def _build_scheduler(self) -> TaskScheduler:
+        # Sync loops keep loop_delay between actions, async and queue loops let tasks overlap
+        min_gap = self.loop_delay if self.loop_mode not in ("async", "queue") else 0
+        return TaskScheduler(
+            tasks=self.tasks,
+            intervals={task["name"]: self._task_interval(task) for task in self.tasks},
+            min_gap=min_gap,
+            retry_delay=self.retry_delay
+        )
+
+    def _task_connection(self, task_name: str) -> Optional[str]:
+        """Connection a task depends on, from the task's "connection" field or the action registry"""
+        task = next((task for task in self.tasks if task["name"] == task_name), {})
+        return task.get("connection") or action_connections.get(task_name)
+
+    def _task_blocked_for(self, task_name: str) -> float:
+        connection_name = self._task_connection(task_name)
+        if connection_name is None:
+            return 0
+        return self.connection_manager.retry_after(connection_name)
+
+    def _acquire_task(self, scheduler: TaskScheduler):
+        weights = self._current_task_weights(self.use_time_based_weights)
+        return scheduler.acquire(
+            weights={task["name"]: weight for task, weight in zip(self.tasks, weights)},
+            blocked_for=self._task_blocked_for
+        )
+
+    def _replenish_inputs(self) -> None:
+        """Refill the state the tasks consume (timeline, room info)"""
+        # TODO: Add more inputs to complexify agent behavior
+        if "timeline_tweets" not in self.state or self.state["timeline_tweets"] is None or len(self.state["timeline_tweets"]) == 0:
+            if any("tweet" in task["name"] for task in self.tasks):
+                logger.info("\n👀 READING TIMELINE")
+                self.state["timeline_tweets"] = self.connection_manager.perform_action(
+                    connection_name="twitter",
+                    action_name="read-timeline",
+                    params=[]
+                )
+
+        self._sync_reply_drafts()
+
+        if "room_info" not in self.state or self.state["room_info"] is None:
+            if any("echochambers" in task["name"] for task in self.tasks):
+                logger.info("\n👀 READING ECHOCHAMBERS ROOM INFO")
+                self.state["room_info"] = self.connection_manager.perform_action(
+                    connection_name="echochambers",
+                    action_name="get-room-info",
+                    params={}
+                )
+
+    def _sync_reply_drafts(self) -> None:
+        """Start replies to the upcoming timeline tweets before reply-to-tweet needs them"""
+        if not self.reply_drafts_config.get("enabled", False) or not any(task["name"] == "reply-to-tweet" for task in self.tasks):
+            return
+        if self._reply_drafter is None:
+            self._reply_drafter = ReplyDrafter(
+                lambda tweet: generate_reply(self, tweet),
+                max_workers=self.reply_drafts_config.get("max_workers", DEFAULT_MAX_WORKERS),
+                lookahead=self.reply_drafts_config.get("lookahead", DEFAULT_LOOKAHEAD),
+                max_age=self.reply_drafts_config.get("max_age", DEFAULT_MAX_AGE),
+                name=f"{self.name}-drafts"
+            )
+        self._reply_drafter.sync(self.state.get("timeline_tweets"))
+
+    def take_reply_draft(self, tweet_id) -> Optional[str]:
+        """The reply drafted in the background for tweet_id, None if there is none"""
+        if self._reply_drafter is None:
+            return None
+        return self._reply_drafter.take(tweet_id)
+
+    def _get_content_queue(self) -> Optional[ContentQueue]:
+        if self.content_queue_config is None:
+            return None
+        if self._content_queue is None:
+            self._content_queue = ContentQueue(
+                self.content_queue_config.get("path", DEFAULT_CONTENT_DB),
+                max_size=self.content_queue_config.get("max_size", DEFAULT_MAX_SIZE)
+            )
+        return self._content_queue
+
+    def _pregenerate_content(self, idle_seconds: float) -> None:
+        """Use idle time to generate posts ahead of the tasks that will publish them"""
+        content_queue = self._get_content_queue()
+        if content_queue is None or idle_seconds < self.content_queue_config.get("min_idle", DEFAULT_MIN_IDLE):
+            return
+        task_names = self.content_queue_config.get("tasks") or [task["name"] for task in self.tasks]
+        for task_name in task_names:
+            if self.stopped or task_name not in content_sources:
+                continue
+            try:
+                refill(self, content_queue, task_name, self.content_queue_config)
+            except Exception as e:
+                logger.warning(f"Could not pre-generate {task_name} content: {e}")
+
+    def pop_content(self, task_name: str) -> Optional[str]:
+        """A pre-generated post for task_name, None when pre-generation is off or ran dry"""
+        content_queue = self._get_content_queue()
+        if content_queue is None:
+            return None
+        return content_queue.pop(self.name, task_name)
+
+    def stop(self) -> None:
+        """Ask the loop to exit after the action currently running"""
+        self._stop_event.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop_event.is_set()
+
+    def _wait(self, seconds: float) -> bool:
+        """Sleep that wakes up early on stop(), returns True if the agent was stopped"""
+        return self._stop_event.wait(max(0, seconds))
+
+    async def _wait_async(self, seconds: float) -> bool:
+        # The event may live in another process, so poll it instead of blocking an executor thread
+        deadline = time.monotonic() + max(0, seconds)
+        while not self.stopped:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(remaining, 1))
+        return self.stopped
+
+    def loop(self, countdown: bool = True):
         """Main agent loop for autonomous behavior"""
         if not self.is_llm_set:
             self._setup_llm_provider()
@@ -166,54 +425,197 @@ class ZerePyAgent:
         logger.info("Press Ctrl+C at any time to stop the loop.")
         print_h_bar()
 
-        time.sleep(2)
-        logger.info("Starting loop in 5 seconds...")
-        for i in range(5, 0, -1):
-            logger.info(f"{i}...")
-            time.sleep(1)
+        if countdown:
+            time.sleep(2)
+            logger.info("Starting loop in 5 seconds...")
+            for i in range(5, 0, -1):
+                logger.info(f"{i}...")
+                time.sleep(1)
 
         try:
-            while True:
-                success = False
+            if self.loop_mode == "async":
+                asyncio.run(self._loop_async())
+                return
+            if self.loop_mode == "queue":
+                self._loop_queued()
+                return
+
+            scheduler = self._build_scheduler()
+            while not self.stopped:
                 try:
-                    # REPLENISH INPUTS
-                    # TODO: Add more inputs to complexify agent behavior
-                    if "timeline_tweets" not in self.state or self.state["timeline_tweets"] is None or len(self.state["timeline_tweets"]) == 0:
-                        if any("tweet" in task["name"] for task in self.tasks):
-                            logger.info("\n👀 READING TIMELINE")
-                            self.state["timeline_tweets"] = self.connection_manager.perform_action(
-                                connection_name="twitter",
-                                action_name="read-timeline",
-                                params=[]
-                            )
+                    with span("agent.iteration", agent=self.name) as iteration:
+                        # REPLENISH INPUTS
+                        self._replenish_inputs()
+
+                        # CHOOSE AN ACTION
+                        # TODO: Add agentic action selection
+                        action_name = self._acquire_task(scheduler)
+
+                        # PERFORM ACTION
+                        if action_name is not None:
+                            if iteration:
+                                iteration.set_attribute("task", action_name)
+                            success = False
+                            try:
+                                success = execute_action(self, action_name)
+                            finally:
+                                scheduler.complete(action_name, bool(success))
+
+                    if action_name is None:
+                        wait = scheduler.seconds_until_next()
+                        wait = self.loop_delay if wait is None else wait
+                        self._pregenerate_content(wait)
+                        wait = scheduler.seconds_until_next()
+                        wait = self.loop_delay if wait is None else wait
+                        logger.info(f"\n⏳ Next task is due in {wait:.0f} seconds...")
+                        print_h_bar()
+                        self._wait(wait)
 
-                    if "room_info" not in self.state or self.state["room_info"] is None:
-                        if any("echochambers" in task["name"] for task in self.tasks):
-                            logger.info("\n👀 READING ECHOCHAMBERS ROOM INFO")
-                            self.state["room_info"] = self.connection_manager.perform_action(
-                                connection_name="echochambers",
-                                action_name="get-room-info",
-                                params={}
-                            )
+                except Exception as e:
+                    logger.error(f"\n❌ Error in agent loop iteration: {e}")
+                    logger.info(f"⏳ Waiting {self.loop_delay} seconds before retrying...")
+                    self._wait(self.loop_delay)
 
-                    # CHOOSE AN ACTION
-                    # TODO: Add agentic action selection
-                    
-                    action = self.select_action(use_time_based_weights=self.use_time_based_weights)
-                    action_name = action["name"]
+            logger.info(f"\n🛑 Agent loop for {self.name} stopped.")
 
-                    # PERFORM ACTION
-                    success = execute_action(self, action_name)
+        except KeyboardInterrupt:
+            logger.info("\n🛑 Agent loop stopped by user.")
+            return
 
-                    logger.info(f"\n⏳ Waiting {self.loop_delay} seconds before next loop...")
-                    print_h_bar()
-                    time.sleep(self.loop_delay if success else 60)
+        finally:
+            if self._reply_drafter is not None:
+                self._reply_drafter.close()
+                self._reply_drafter = None
+
+    async def _loop_async(self):
+        """Run up to max_concurrent_tasks actions at once on an event loop"""
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=self.max_concurrent_tasks, thread_name_prefix=f"{self.name}-action")
+        )
+        scheduler = self._build_scheduler()
+        rescheduled = asyncio.Event()
+        replenish_lock = asyncio.Lock()
+        logger.info(f"Running async loop with up to {self.max_concurrent_tasks} concurrent tasks")
+
+        await asyncio.gather(*(
+            self._async_worker(scheduler, rescheduled, replenish_lock)
+            for _ in range(self.max_concurrent_tasks)
+        ))
+
+    async def _async_worker(self, scheduler: TaskScheduler, rescheduled: asyncio.Event, replenish_lock: asyncio.Lock):
+        """One concurrency slot of the async loop"""
+        while not self.stopped:
+            try:
+                # Only one slot refills shared inputs at a time
+                async with replenish_lock:
+                    await asyncio.to_thread(self._replenish_inputs)
+
+                # In-flight tasks are not eligible, so the same task never runs twice concurrently
+                action_name = self._acquire_task(scheduler)
+                if action_name is None:
+                    wait = scheduler.seconds_until_next()
+                    wait = self.loop_delay if wait is None else wait
+                    async with replenish_lock:
+                        await asyncio.to_thread(self._pregenerate_content, wait)
+                    wait = scheduler.seconds_until_next()
+                    wait = self.loop_delay if wait is None else wait
+                    rescheduled.clear()
+                    # Wake up early when another slot finishes, its task may free up the next deadline
+                    deadline = time.monotonic() + wait
+                    while not self.stopped and not rescheduled.is_set():
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        try:
+                            await asyncio.wait_for(rescheduled.wait(), timeout=min(remaining, 1))
+                        except asyncio.TimeoutError:
+                            pass
+                    continue
+
+                success = False
+                try:
+                    with span("agent.iteration", agent=self.name, task=action_name):
+                        success = await execute_action_async(self, action_name)
+                finally:
+                    scheduler.complete(action_name, bool(success))
+                    rescheduled.set()
+
+            except Exception as e:
+                logger.error(f"\n❌ Error in agent loop iteration: {e}")
+                logger.info(f"⏳ Waiting {self.loop_delay} seconds before retrying...")
+                await self._wait_async(self.loop_delay)
+
+    def _run_job(self, job: Job):
+        """Worker pool handler, exceptions and falsy results get the job retried"""
+        with span("agent.iteration", agent=self.name, task=job.task, job=job.id, attempt=job.attempts):
+            return execute_action(self, job.task, job=job, **job.params)
+
+    def _loop_queued(self):
+        """Enqueue due tasks as jobs in an SQLite queue and run them on a worker pool"""
+        job_queue = JobQueue(self.job_queue_config.get("path", DEFAULT_JOB_DB))
+        scheduler = self._build_scheduler()
+        # Written by worker threads, drained by this one: the scheduler is not thread-safe
+        finished_jobs = deque()
+        job_finished = threading.Event()
+
+        def on_finished(job: Job, success: bool) -> None:
+            finished_jobs.append((job.task, success))
+            job_finished.set()
+
+        # Jobs a crash or Ctrl+C left behind are resumed, their tasks stay in flight until they finish
+        recovered = job_queue.recover(self.name)
+        for task_name in job_queue.unfinished_tasks(self.name):
+            scheduler.hold(task_name)
+        if recovered:
+            logger.info(f"Resuming {recovered} interrupted jobs")
+        job_queue.prune()
+
+        pool = JobWorkerPool(
+            job_queue,
+            self.name,
+            handler=self._run_job,
+            on_finished=on_finished,
+            workers=self.max_concurrent_tasks,
+            lease_seconds=self.job_queue_config.get("lease_seconds", DEFAULT_LEASE_SECONDS),
+            retry_backoff=self.retry_delay
+        )
+        pool.start()
+        logger.info(f"Running queue loop with {self.max_concurrent_tasks} workers, jobs in {job_queue.path}")
+        max_attempts = self.job_queue_config.get("max_attempts", DEFAULT_MAX_ATTEMPTS)
+        priorities = {task["name"]: task.get("priority", 0) for task in self.tasks}
+
+        try:
+            while not self.stopped:
+                try:
+                    job_finished.clear()
+                    while finished_jobs:
+                        scheduler.complete(*finished_jobs.popleft())
+
+                    self._replenish_inputs()
+                    action_name = self._acquire_task(scheduler)
+                    if action_name is not None:
+                        job_queue.enqueue(self.name, action_name, priority=priorities.get(action_name, 0), max_attempts=max_attempts)
+                        pool.notify()
+                        continue
+
+                    wait = scheduler.seconds_until_next()
+                    wait = self.loop_delay if wait is None else wait
+                    self._pregenerate_content(wait)
+                    wait = scheduler.seconds_until_next()
+                    wait = self.loop_delay if wait is None else wait
+                    # Wake up early when a job finishes, its task may be due again sooner
+                    deadline = time.monotonic() + wait
+                    while not self.stopped and not job_finished.is_set():
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        job_finished.wait(min(remaining, 1))
 
                 except Exception as e:
                     logger.error(f"\n❌ Error in agent loop iteration: {e}")
                     logger.info(f"⏳ Waiting {self.loop_delay} seconds before retrying...")
-                    time.sleep(self.loop_delay)
-
-        except KeyboardInterrupt:
-            logger.info("\n🛑 Agent loop stopped by user.")
-            return
\ No newline at end of file
+                    self._wait(self.loop_delay)
+        finally:
+            # Jobs still running when the process exits stay leased and are resumed on the next start
+            if pool.stop(timeout=self.job_queue_config.get("shutdown_timeout", 30)):
+                job_queue.close()
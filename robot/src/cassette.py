@@ -0,0 +1,291 @@
+import asyncio
+import base64
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from src.http_client import http_client
+
+logger = logging.getLogger("cassette")
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Never written to cassettes. The body is stored decoded, so encoding and length headers would lie on replay
+_DROPPED_HEADERS = {"set-cookie", "content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+_active: Optional["Cassette"] = None
+
+
+class CassetteMiss(requests.ConnectionError):
+    """Raised on replay when the cassette has no response for a request"""
+    pass
+
+
+def _normalize_url(url: str) -> str:
+    # Query parameters in a stable order, so params dicts and hand written cassettes match
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ""))
+
+
+def _json_body(body: Union[bytes, str, None]) -> Any:
+    if not body:
+        return None
+    if isinstance(body, bytes):
+        if not body.lstrip().startswith((b"{", b"[")):
+            return None
+    elif not body.lstrip().startswith(("{", "[")):
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+def _rpc_method(body: Union[bytes, str, None]) -> Optional[str]:
+    """JSON-RPC method of a request body, every call to an RPC endpoint shares one URL"""
+    payload = _json_body(body)
+    if isinstance(payload, dict) and "jsonrpc" in payload:
+        return payload.get("method")
+    return None
+
+
+class Cassette:
+    """
+    Recorded HTTP interactions of one connection, stored as a JSON file.
+
+    Requests are matched on method, URL (query order ignored) and, for JSON-RPC, the RPC
+    method. Responses for the same request are replayed in the order they were recorded,
+    the last one repeats once they run out, so replay is deterministic however often an
+    action runs.
+    """
+
+    def __init__(self, path: str, mode: str = REPLAY, latency: float = 0.0, recorded_latency: bool = False):
+        """
+        Args:
+            path: Cassette file, read on replay and (over)written when recording ends
+            mode: RECORD to pass requests through and save them, REPLAY to serve them from the file
+            latency: Seconds every replayed response is delayed by
+            recorded_latency: Delay replayed responses by the latency measured while recording instead
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Cassette mode must be '{RECORD}' or '{REPLAY}'")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.recorded_latency = recorded_latency
+        self.interactions: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._index: Dict[Tuple, List[Dict[str, Any]]] = {}
+        self._plays: Dict[Tuple, int] = {}
+        if mode == REPLAY:
+            self.load()
+
+    @staticmethod
+    def _key(method: str, url: str, body: Union[bytes, str, None]) -> Tuple:
+        return (method.upper(), _normalize_url(url), _rpc_method(body))
+
+    def load(self) -> None:
+        with open(self.path) as f:
+            self.interactions = json.load(f)["interactions"]
+        self._index = {}
+        for interaction in self.interactions:
+            request = interaction["request"]
+            key = (request["method"].upper(), _normalize_url(request["url"]), request.get("rpc_method"))
+            self._index.setdefault(key, []).append(interaction)
+        self._plays = {}
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump({"interactions": self.interactions}, f, indent=2)
+        logger.info(f"Recorded {len(self.interactions)} interactions to {self.path}")
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        body: Union[bytes, str, None],
+        status: int,
+        headers: Mapping[str, str],
+        content: bytes,
+        elapsed: float
+    ) -> None:
+        response = {
+            "status": status,
+            "headers": {name: value for name, value in headers.items() if name.lower() not in _DROPPED_HEADERS},
+            "elapsed": round(elapsed, 6)
+        }
+        decoded = _json_body(content)
+        if decoded is not None:
+            response["json"] = decoded
+        else:
+            try:
+                response["body"] = content.decode("utf-8")
+            except UnicodeDecodeError:
+                response["body_base64"] = base64.b64encode(content).decode("ascii")
+
+        interaction = {
+            "request": {"method": method.upper(), "url": url, "rpc_method": _rpc_method(body)},
+            "response": response
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def play(self, method: str, url: str, body: Union[bytes, str, None]) -> Dict[str, Any]:
+        """Next recorded response for the request"""
+        key = self._key(method, url, body)
+        with self._lock:
+            candidates = self._index.get(key)
+            if not candidates:
+                raise CassetteMiss(f"No recorded response for {method.upper()} {url} in {self.path}")
+            played = self._plays.get(key, 0)
+            self._plays[key] = played + 1
+            return candidates[min(played, len(candidates) - 1)]["response"]
+
+    def delay(self, response: Dict[str, Any]) -> float:
+        return response.get("elapsed", 0.0) if self.recorded_latency else self.latency
+
+    @staticmethod
+    def content(response: Dict[str, Any], body: Union[bytes, str, None]) -> bytes:
+        """Response body, with a JSON-RPC id rewritten to the id of the request it answers"""
+        if "json" in response:
+            payload = response["json"]
+            request = _json_body(body)
+            if isinstance(payload, dict) and isinstance(request, dict) and "id" in request and "id" in payload:
+                payload = dict(payload, id=request["id"])
+            return json.dumps(payload).encode("utf-8")
+        if "body_base64" in response:
+            return base64.b64decode(response["body_base64"])
+        return response.get("body", "").encode("utf-8")
+
+
+class CassetteAdapter(HTTPAdapter):
+    """requests transport that records through the real adapter or replays from a cassette"""
+
+    def __init__(self, cassette: Cassette, real: HTTPAdapter):
+        super().__init__()
+        self.cassette = cassette
+        self.real = real
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if self.cassette.mode == RECORD:
+            response = self.real.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+            self.cassette.record(
+                request.method, request.url, request.body,
+                response.status_code, response.headers, response.content, response.elapsed.total_seconds()
+            )
+            return response
+
+        recorded = self.cassette.play(request.method, request.url, request.body)
+        delay = self.cassette.delay(recorded)
+        if delay:
+            time.sleep(delay)
+
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.headers = CaseInsensitiveDict(recorded.get("headers", {}))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = self.cassette.content(recorded, request.body)
+        # There is no socket to stream from, iter_content/iter_lines read the body above
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = timedelta(seconds=delay)
+        return response
+
+    def close(self) -> None:
+        # The real adapter belongs to the HTTP client and is restored when the cassette ends
+        pass
+
+
+def async_transport(cassette: Cassette):
+    """httpx transport for SDKs built on httpx.AsyncClient (solana-py's RPC client)"""
+    import httpx
+
+    class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+        def __init__(self):
+            self.real = httpx.AsyncHTTPTransport() if cassette.mode == RECORD else None
+
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            body = await request.aread()
+            if self.real is not None:
+                started = time.monotonic()
+                response = await self.real.handle_async_request(request)
+                content = await response.aread()
+                cassette.record(
+                    request.method, str(request.url), body,
+                    response.status_code, response.headers, content, time.monotonic() - started
+                )
+                headers = [(name, value) for name, value in response.headers.items() if name.lower() not in _DROPPED_HEADERS]
+                return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+            recorded = cassette.play(request.method, str(request.url), body)
+            delay = cassette.delay(recorded)
+            if delay:
+                await asyncio.sleep(delay)
+            return httpx.Response(
+                recorded["status"],
+                headers=recorded.get("headers", {}),
+                content=cassette.content(recorded, body),
+                request=request
+            )
+
+        async def aclose(self) -> None:
+            if self.real is not None:
+                await self.real.aclose()
+
+    return AsyncCassetteTransport()
+
+
+def wrap_solana_client(client: Any) -> Any:
+    """
+    Route a solana AsyncClient through the active cassette, a no-op outside use_cassette().
+    The benchmark harness applies it to a connection's client, production code never does.
+    """
+    cassette = _active
+    if cassette is None:
+        return client
+    import httpx
+
+    provider = client._provider
+    provider.session = httpx.AsyncClient(transport=async_transport(cassette), timeout=provider.session.timeout)
+    return client
+
+
+def active() -> Optional[Cassette]:
+    return _active
+
+
+@contextmanager
+def use_cassette(path: str, mode: str = REPLAY, latency: float = 0.0, recorded_latency: bool = False) -> Iterator[Cassette]:
+    """
+    Record or replay every request made through the shared HTTP client and the sessions mounted
+    on it (REST connections, Twitter's OAuth session, Web3 providers), and through Solana RPC
+    clients passed to wrap_solana_client() inside the block.
+    """
+    global _active
+    cassette = Cassette(path, mode, latency, recorded_latency)
+    previous_cassette = _active
+    previous_adapter = http_client.set_adapter(CassetteAdapter(cassette, http_client.adapter))
+    _active = cassette
+    try:
+        yield cassette
+    finally:
+        _active = previous_cassette
+        http_client.set_adapter(previous_adapter)
+        if mode == RECORD:
+            cassette.save()
@@ -0,0 +1,150 @@
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("circuit_breaker")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open, retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after failure_threshold consecutive failures. While open every
+    call is rejected until a jittered, exponentially growing backoff elapses. Then
+    a single half-open trial call is let through: success closes the circuit,
+    failure opens it again with a longer backoff.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        backoff: float = 30,
+        max_backoff: float = 900,
+        jitter: float = 0.2
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        # Number of times the circuit opened in a row, drives the backoff
+        self._trips = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() >= self._open_until:
+                return HALF_OPEN
+            return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit lets a call through, 0 if it does now"""
+        with self._lock:
+            if self._state == OPEN:
+                return max(0.0, self._open_until - time.monotonic())
+            if self._state == HALF_OPEN and self._trial_in_flight:
+                # Another caller holds the trial, check back after a short while
+                return min(self.backoff, 5)
+            return 0.0
+
+    def allow(self) -> bool:
+        """Ask to make a call, must be followed by record_success or record_failure when True"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if time.monotonic() < self._open_until:
+                    return False
+                self._state = HALF_OPEN
+                self._trial_in_flight = False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def cancel(self) -> None:
+        """Give back a call allowed by allow() that was never made"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"Circuit '{self.name}' closed")
+            self._state = CLOSED
+            self._failures = 0
+            self._trips = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._open()
+            self._trial_in_flight = False
+
+    def _open(self) -> None:
+        delay = min(self.max_backoff, self.backoff * (2 ** self._trips))
+        delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        self._trips += 1
+        self._state = OPEN
+        self._open_until = time.monotonic() + delay
+        logger.warning(f"Circuit '{self.name}' opened after {self._failures} failures, retrying in {delay:.0f}s")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self._failures,
+            "retry_after": self.retry_after()
+        }
+
+
+class CircuitBreakerRegistry:
+    """Process-wide circuit breakers, keyed by connection (name@config digest) or connection/endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str, settings: Optional[Dict[str, Any]] = None) -> CircuitBreaker:
+        """Breaker for name, created with settings (failure_threshold, backoff, max_backoff, jitter) on first use"""
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, **(settings or {}))
+                self._breakers[name] = breaker
+            return breaker
+
+    def retry_after(self, name: str) -> float:
+        """Seconds until name accepts calls again, 0 for circuits that were never used"""
+        with self._lock:
+            breaker = self._breakers.get(name)
+        return breaker.retry_after() if breaker else 0.0
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+breakers = CircuitBreakerRegistry()
@@ -189,6 +189,18 @@ class ZerePyCLI:
             )
         )
         
+        # Connection readiness command
+        self._register_command(
+            Command(
+                name="readiness",
+                description="Shows the warm up state of the current agent's connections.",
+                tips=["Connections are warmed up in the background when an agent is loaded",
+                      "Use 'list-connections' to run a full configuration check"],
+                handler=self.readiness,
+                aliases=['ready', 'status']
+            )
+        )
+        
         ################## MISC ################## 
         # Exit command
         self._register_command(
@@ -333,7 +345,13 @@ class ZerePyCLI:
 
     def _load_agent_from_file(self, agent_name):
         try: 
+            previous_agent = self.agent
             self.agent = ZerePyAgent(agent_name)
+            # Released after the new agent borrowed its connections, so shared ones are reused
+            if previous_agent is not None:
+                previous_agent.connection_manager.close()
+            # Probe RPCs and APIs in the background instead of blocking the prompt
+            self.agent.connection_manager.warm_up(background=True)
             logger.info(f"\n✅ Successfully loaded agent: {self.agent.name}")
         except FileNotFoundError:
             logger.error(f"Agent file not found: {agent_name}")
@@ -508,6 +526,22 @@ class ZerePyCLI:
         else:
             logging.info("Please load an agent to see the list of supported actions")
 
+    def readiness(self, input_list: List[str] = []) -> None:
+        """Handle readiness command"""
+        if not self.agent:
+            logging.info("Please load an agent to see the readiness of its connections")
+            return
+
+        icons = {"ready": "✅", "pending": "⏳", "not configured": "❌", "failed": "❌"}
+        logger.info("\nCONNECTION READINESS:")
+        for name, readiness in self.agent.connection_manager.get_readiness().items():
+            line = f"- {name}: {icons.get(readiness['state'], '')} {readiness['state'].capitalize()}"
+            if readiness["elapsed"] is not None:
+                line += f" ({readiness['elapsed']:.1f}s)"
+            if readiness["error"]:
+                line += f" - {readiness['error']}"
+            logger.info(line)
+
     def chat_session(self, input_list: List[str]) -> None:
         """Handle chat command"""
         if self.agent is None:
@@ -526,12 +560,21 @@ class ZerePyCLI:
                 if user_input.lower() == 'exit':
                     break
                 
-                response = self.agent.prompt_llm(user_input)
-                logger.info(f"\n{self.agent.name}: {response}")
+                # Print tokens as they arrive instead of waiting for the whole reply
+                sys.stdout.write(f"\n{self.agent.name}: ")
+                sys.stdout.flush()
+                try:
+                    for chunk in self.agent.prompt_llm_stream(user_input, cache=False):
+                        sys.stdout.write(chunk)
+                        sys.stdout.flush()
+                finally:
+                    sys.stdout.write("\n")
                 print_h_bar()
-                
+
             except KeyboardInterrupt:
                 break
+            except Exception as e:
+                logger.error(f"Error generating a response: {e}")
 
     def exit(self, input_list: List[str]) -> None:
         """Exit the CLI gracefully"""
@@ -547,7 +590,8 @@ class ZerePyCLI:
         self._print_welcome_message()
         self._load_default_agent()
         self._list_loaded_agent()
-        self.list_connections()
+        if self.agent:
+            logger.info("\nConnections are warming up in the background, use 'readiness' to check on them.")
         
         # Start CLI loop
         while True:
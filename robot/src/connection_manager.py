@@ -1,67 +1,157 @@
+import copy
+import importlib
+import inspect
 import logging
-from typing import Any, List, Optional, Type, Dict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, List, Optional, Type, Dict, Tuple
 from src.connections.base_connection import BaseConnection
-from src.connections.anthropic_connection import AnthropicConnection
-from src.connections.eternalai_connection import EternalAIConnection
-from src.connections.goat_connection import GoatConnection
-from src.connections.openai_connection import OpenAIConnection
-from src.connections.twitter_connection import TwitterConnection
-from src.connections.farcaster_connection import FarcasterConnection
-from src.connections.ollama_connection import OllamaConnection
-from src.connections.echochambers_connection import EchochambersConnection
-from src.connections.solana_connection import SolanaConnection
-from src.connections.hyperbolic_connection import HyperbolicConnection
-from src.connections.galadriel_connection import GaladrielConnection
-from src.connections.sonic_connection import SonicConnection
-from src.connections.discord_connection import DiscordConnection
-from src.connections.allora_connection import AlloraConnection
-from src.connections.xai_connection import XAIConnection
-from src.connections.ethereum_connection import EthereumConnection
+from src.connection_registry import connection_key, registry, normalize_config
+from src.helpers.cache import action_cache
+from src.circuit_breaker import breakers, CircuitOpenError
+from src.rate_limiter import limiter
+from src.metrics import observe_action
+from src.tracing import bind_context, end_span, start_span, use_span
 
 logger = logging.getLogger("connection_manager")
 
+# Seconds a single configuration check may take in list_connections / get_model_providers
+DEFAULT_CHECK_TIMEOUT = 10
+# Actions in flight at once in perform_actions
+DEFAULT_BATCH_WORKERS = 8
+
+# Config name -> (module, class). Modules are only imported when an agent uses the connection,
+# so heavy SDKs (web3, solana, goat, allora...) are not loaded by agents that don't need them.
+CONNECTION_MODULES: Dict[str, Tuple[str, str]] = {
+    "twitter": ("src.connections.twitter_connection", "TwitterConnection"),
+    "anthropic": ("src.connections.anthropic_connection", "AnthropicConnection"),
+    "openai": ("src.connections.openai_connection", "OpenAIConnection"),
+    "farcaster": ("src.connections.farcaster_connection", "FarcasterConnection"),
+    "eternalai": ("src.connections.eternalai_connection", "EternalAIConnection"),
+    "ollama": ("src.connections.ollama_connection", "OllamaConnection"),
+    "echochambers": ("src.connections.echochambers_connection", "EchochambersConnection"),
+    "goat": ("src.connections.goat_connection", "GoatConnection"),
+    "solana": ("src.connections.solana_connection", "SolanaConnection"),
+    "hyperbolic": ("src.connections.hyperbolic_connection", "HyperbolicConnection"),
+    "galadriel": ("src.connections.galadriel_connection", "GaladrielConnection"),
+    "sonic": ("src.connections.sonic_connection", "SonicConnection"),
+    "discord": ("src.connections.discord_connection", "DiscordConnection"),
+    "allora": ("src.connections.allora_connection", "AlloraConnection"),
+    "xai": ("src.connections.xai_connection", "XAIConnection"),
+    "ethereum": ("src.connections.ethereum_connection", "EthereumConnection"),
+}
+
+
+class ActionRequestError(Exception):
+    """Raised when an action cannot be dispatched (unknown, not configured, bad parameters)"""
+    pass
+
+
+@dataclass
+class ActionResult:
+    """Outcome of one action in a perform_actions batch"""
+    connection: str
+    action: str
+    result: Any = None
+    error: Optional[str] = None
+    elapsed: Optional[float] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ActionStream:
+    """
+    The chunks of a streaming action (e.g. generate-text-stream). The action only succeeds
+    or fails once the stream is exhausted or raises, so that is when its outcome is recorded.
+    A stream must be read to the end or close()d: one that is only garbage collected never
+    reports an outcome.
+    """
+
+    def __init__(self, chunks: Iterator[Any]):
+        self._chunks = chunks
+        self._callbacks: List[Callable[[str, Optional[BaseException]], None]] = []
+        self._finished = False
+
+    def add_done_callback(self, callback: Callable[[str, Optional[BaseException]], None]) -> None:
+        """callback(outcome, error) runs once the stream ends, outcome is success, error or cancelled"""
+        self._callbacks.append(callback)
+
+    def __iter__(self) -> "ActionStream":
+        return self
+
+    def __next__(self) -> Any:
+        if self._finished:
+            raise StopIteration
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            self._finish("success", None)
+            raise
+        except Exception as e:
+            self._finish("error", e)
+            raise
+        except BaseException:
+            # KeyboardInterrupt or GeneratorExit, the consumer stopped reading
+            self._finish("cancelled", None)
+            raise
+
+    def close(self) -> None:
+        """Stop reading before the end, which neither succeeds nor fails the action"""
+        if self._finished:
+            return
+        try:
+            _close_chunks(self._chunks)
+        finally:
+            self._finish("cancelled", None)
+
+    def __del__(self):
+        # Only releases the provider's response: callbacks take locks and export spans,
+        # which must not run on whatever thread the garbage collector interrupts
+        if not self._finished:
+            _close_chunks(self._chunks)
+
+    def _finish(self, outcome: str, error: Optional[BaseException]) -> None:
+        self._finished = True
+        for callback in self._callbacks:
+            try:
+                callback(outcome, error)
+            except Exception as e:
+                logger.error(f"Stream completion callback failed: {e}")
+
+
+def _close_chunks(chunks: Iterator[Any]) -> None:
+    close = getattr(chunks, "close", None)
+    if close is not None:
+        close()
+
 
 class ConnectionManager:
-    def __init__(self, agent_config):
+    def __init__(self, agent_config, shared: bool = True, check_timeout: float = DEFAULT_CHECK_TIMEOUT):
         self.connections: Dict[str, BaseConnection] = {}
+        self.check_timeout = check_timeout
+        # Shared connections are borrowed from the process-wide registry
+        self.shared = shared
+        # Connection name -> {"state": pending|ready|not configured|failed, "error", "elapsed"}
+        self._readiness: Dict[str, Dict[str, Any]] = {}
+        self._readiness_lock = threading.Lock()
+        # Connection name -> circuit breaker name, see _circuit_name
+        self._circuit_names: Dict[str, str] = {}
+        self._warm_up_threads: List[threading.Thread] = []
         for config in agent_config:
             self._register_connection(config)
 
     @staticmethod
     def _class_name_to_type(class_name: str) -> Type[BaseConnection]:
-        if class_name == "twitter":
-            return TwitterConnection
-        elif class_name == "anthropic":
-            return AnthropicConnection
-        elif class_name == "openai":
-            return OpenAIConnection
-        elif class_name == "farcaster":
-            return FarcasterConnection
-        elif class_name == "eternalai":
-            return EternalAIConnection
-        elif class_name == "ollama":
-            return OllamaConnection
-        elif class_name == "echochambers":
-            return EchochambersConnection
-        elif class_name == "goat":
-            return GoatConnection
-        elif class_name == "solana":
-            return SolanaConnection
-        elif class_name == "hyperbolic":
-            return HyperbolicConnection
-        elif class_name == "galadriel":
-            return GaladrielConnection
-        elif class_name == "sonic":
-            return SonicConnection
-        elif class_name == "discord":
-            return DiscordConnection
-        elif class_name == "allora":
-            return AlloraConnection
-        elif class_name == "xai":
-            return XAIConnection
-        elif class_name == "ethereum":
-            return EthereumConnection
-        return None
+        """Import the connection class for a config name on first use"""
+        if class_name not in CONNECTION_MODULES:
+            return None
+        module_name, attribute = CONNECTION_MODULES[class_name]
+        module = importlib.import_module(module_name)
+        return getattr(module, attribute)
 
     def _register_connection(self, config_dic: Dict[str, Any]) -> None:
         """
@@ -75,11 +165,105 @@ class ConnectionManager:
         try:
             name = config_dic["name"]
             connection_class = self._class_name_to_type(name)
-            connection = connection_class(config_dic)
+            if connection_class is None:
+                raise ValueError(f"Unknown connection type '{name}'")
+            if self.shared:
+                connection = registry.acquire(connection_class, config_dic)
+            else:
+                connection = connection_class(config_dic)
             self.connections[name] = connection
         except Exception as e:
             logging.error(f"Failed to initialize connection {name}: {e}")
 
+    def close(self) -> None:
+        """Give back every connection, shared ones are closed once no agent uses them"""
+        for connection in self.connections.values():
+            if self.shared:
+                registry.release(connection)
+            else:
+                connection.close()
+        self.connections = {}
+
+    def _warm_up_connection(self, name: str, connection: BaseConnection) -> None:
+        started = time.monotonic()
+        try:
+            ready = connection.warm_up()
+            result = {"state": "ready" if ready else "not configured", "error": None}
+        except Exception as e:
+            result = {"state": "failed", "error": str(e)}
+        result["elapsed"] = time.monotonic() - started
+        with self._readiness_lock:
+            self._readiness[name] = result
+
+    def warm_up(self, background: bool = True) -> None:
+        """
+        Establish every connection's network state in parallel.
+
+        Args:
+            background: Return immediately and let get_readiness() report progress
+        """
+        with self._readiness_lock:
+            for name in self.connections:
+                self._readiness[name] = {"state": "pending", "error": None, "elapsed": None}
+
+        self._warm_up_threads = [
+            threading.Thread(
+                target=self._warm_up_connection,
+                args=(name, connection),
+                name=f"warm-up-{name}",
+                daemon=True
+            )
+            for name, connection in self.connections.items()
+        ]
+        for thread in self._warm_up_threads:
+            thread.start()
+
+        if not background:
+            self.wait_ready()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until warm up finished, returns False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._warm_up_threads:
+            thread.join(None if deadline is None else max(0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in self._warm_up_threads)
+
+    def get_readiness(self) -> Dict[str, Dict[str, Any]]:
+        """Warm up state of every connection, connections never warmed up are reported as pending"""
+        with self._readiness_lock:
+            return {
+                name: dict(self._readiness.get(name, {"state": "pending", "error": None, "elapsed": None}))
+                for name in self.connections
+            }
+
+    def _check_configured_parallel(self, names: List[str]) -> Dict[str, Optional[bool]]:
+        """
+        Run check_configured for several connections at once.
+
+        Returns:
+            Dict[str, Optional[bool]]: Status per connection in the given order, None if the check timed out
+        """
+        if not names:
+            return {}
+
+        executor = ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="check-configured")
+        futures = {name: executor.submit(bind_context(self.connections[name].check_configured)) for name in names}
+        # The checks run side by side, so the slowest one bounds the total
+        wait(futures.values(), timeout=self.check_timeout)
+        # Don't wait for checks that timed out, they finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        results = {}
+        for name, future in futures.items():
+            if not future.done():
+                logging.warning(f"Configuration check for {name} timed out after {self.check_timeout}s")
+                results[name] = None
+            elif future.cancelled() or future.exception() is not None:
+                results[name] = False
+            else:
+                results[name] = future.result()
+        return results
+
     def _check_connection(self, connection_string: str) -> bool:
         try:
             connection = self.connections[connection_string]
@@ -98,6 +282,7 @@ class ConnectionManager:
         try:
             connection = self.connections[connection_name]
             success = connection.configure()
+            connection.invalidate_configured()
 
             if success:
                 logging.info(
@@ -118,11 +303,13 @@ class ConnectionManager:
 
     def list_connections(self) -> None:
         """List all available connections and their status"""
+        statuses = self._check_configured_parallel(list(self.connections))
         logging.info("\nAVAILABLE CONNECTIONS:")
-        for name, connection in self.connections.items():
-            status = (
-                "✅ Configured" if connection.is_configured() else "❌ Not Configured"
-            )
+        for name, configured in statuses.items():
+            if configured is None:
+                status = "⏳ Timed Out"
+            else:
+                status = "✅ Configured" if configured else "❌ Not Configured"
             logging.info(f"- {name}: {status}")
 
     def list_actions(self, connection_name: str) -> None:
@@ -130,7 +317,7 @@ class ConnectionManager:
         try:
             connection = self.connections[connection_name]
 
-            if connection.is_configured():
+            if connection.check_configured():
                 logging.info(
                     f"\n✅ {connection_name} is configured. You can use any of its actions."
                 )
@@ -154,51 +341,150 @@ class ConnectionManager:
         except Exception as e:
             logging.error(f"\nAn error occurred: {e}")
 
+    def call_action(
+        self, connection_name: str, action_name: str, params: List[Any]
+    ) -> Any:
+        """
+        Perform an action on a specific connection, raising instead of logging on failure
+
+        Raises:
+            ActionRequestError: If the connection or action is unknown, not configured, or parameters are missing
+            Exception: Whatever the connection raised while performing the action
+        """
+        current = start_span(f"{connection_name} {action_name}", connection=connection_name, action=action_name)
+        try:
+            with use_span(current):
+                result = self._call_action(connection_name, action_name, params)
+        except BaseException as e:
+            end_span(current, e)
+            raise
+        if isinstance(result, ActionStream):
+            # Spans the whole stream, it ends on whichever thread reads the last chunk
+            result.add_done_callback(lambda outcome, error: end_span(current, error))
+        else:
+            end_span(current)
+        return result
+
+    def _call_action(
+        self, connection_name: str, action_name: str, params: List[Any]
+    ) -> Any:
+        connection = self.connections.get(connection_name)
+        if connection is None:
+            raise ActionRequestError(f"Unknown connection '{connection_name}'")
+
+        if action_name not in connection.actions:
+            raise ActionRequestError(f"Unknown action '{action_name}' for connection '{connection_name}'")
+
+        action = connection.actions[action_name]
+
+        # Convert list of params to kwargs dictionary, handling both required and optional params
+        kwargs = {}
+        param_index = 0
+
+        # Add provided parameters up to the number provided
+        for i, param in enumerate(action.parameters):
+            if param_index < len(params):
+                kwargs[param.name] = params[param_index]
+                param_index += 1
+
+        # Validate all required parameters are present
+        missing_required = [
+            param.name
+            for param in action.parameters
+            if param.required and param.name not in kwargs
+        ]
+
+        if missing_required:
+            raise ActionRequestError(f"Missing required parameters: {', '.join(missing_required)}")
+
+        cache_key = None
+        if action.cache_ttl:
+            # Keyed by the connection config too, e.g. get-room-info depends on the configured room
+            cache_key = (
+                type(connection).__name__,
+                normalize_config(getattr(connection, "config", {})),
+                action_name,
+                normalize_config(kwargs)
+            )
+            cached = action_cache.get(cache_key)
+            if cached is not None:
+                observe_action(connection_name, action_name, "cache_hit")
+                # Every caller gets its own copy, so one that mutates it cannot corrupt the cached value
+                return copy.deepcopy(cached)
+
+        # One circuit for the whole connection and one per action (endpoint), so a single
+        # broken endpoint (e.g. the swap aggregator) does not take the other actions down
+        settings = (getattr(connection, "config", None) or {}).get("circuit_breaker")
+        circuit_name = self._circuit_name(connection_name)
+        circuits = [
+            breakers.get(circuit_name, settings),
+            breakers.get(f"{circuit_name}/{action_name}", settings)
+        ]
+        for index, circuit in enumerate(circuits):
+            if not circuit.allow():
+                for allowed in circuits[:index]:
+                    allowed.cancel()
+                observe_action(connection_name, action_name, "rejected")
+                raise CircuitOpenError(circuit.name, circuit.retry_after())
+
+        # Checked after the circuits: an outage often shows up as a failed probe, it has to count
+        # as a failure of the connection so the circuit opens and callers back off
+        if not connection.check_configured():
+            circuits[0].record_failure()
+            circuits[1].cancel()
+            observe_action(connection_name, action_name, "rejected")
+            raise ActionRequestError(f"Connection '{connection_name}' is not configured")
+
+        def record(outcome: str, error: Optional[BaseException] = None) -> None:
+            if outcome == "cancelled":
+                # An abandoned stream says nothing about the provider, give back a half-open trial
+                observe_action(connection_name, action_name, outcome)
+                for circuit in circuits:
+                    circuit.cancel()
+                return
+            observe_action(connection_name, action_name, outcome, time.monotonic() - started)
+            for circuit in circuits:
+                if outcome == "success":
+                    circuit.record_success()
+                else:
+                    circuit.record_failure()
+            if outcome == "error":
+                # Credentials may have been revoked or expired, re-check before the next action
+                connection.invalidate_configured()
+
+        started = time.monotonic()
+        try:
+            result = connection.perform_action(action_name, kwargs)
+        except Exception as e:
+            record("error", e)
+            raise
+
+        if inspect.isgenerator(result):
+            # Nothing has been sent yet, the outcome is only known once the stream ends
+            stream = ActionStream(result)
+            stream.add_done_callback(record)
+            return stream
+
+        record("success")
+
+        if cache_key is not None and result is not None:
+            try:
+                # A snapshot, so later changes to result by this caller do not leak into the cache
+                action_cache.set(cache_key, copy.deepcopy(result), action.cache_ttl)
+            except Exception as e:
+                logger.debug(f"Not caching {connection_name} {action_name}, its result cannot be copied: {e}")
+        return result
+
     def perform_action(
         self, connection_name: str, action_name: str, params: List[Any]
     ) -> Optional[Any]:
         """Perform an action on a specific connection with given parameters"""
         try:
-            connection = self.connections[connection_name]
-
-            if not connection.is_configured():
-                logging.error(
-                    f"\nError: Connection '{connection_name}' is not configured"
-                )
-                return None
+            return self.call_action(connection_name, action_name, params)
 
-            if action_name not in connection.actions:
-                logging.error(
-                    f"\nError: Unknown action '{action_name}' for connection '{connection_name}'"
-                )
-                return None
-
-            action = connection.actions[action_name]
-
-            # Convert list of params to kwargs dictionary, handling both required and optional params
-            kwargs = {}
-            param_index = 0
-
-            # Add provided parameters up to the number provided
-            for i, param in enumerate(action.parameters):
-                if param_index < len(params):
-                    kwargs[param.name] = params[param_index]
-                    param_index += 1
-
-            # Validate all required parameters are present
-            missing_required = [
-                param.name
-                for param in action.parameters
-                if param.required and param.name not in kwargs
-            ]
-
-            if missing_required:
-                logging.error(
-                    f"\nError: Missing required parameters: {', '.join(missing_required)}"
-                )
-                return None
-
-            return connection.perform_action(action_name, kwargs)
+        except ActionRequestError as e:
+            logging.error(f"\nError: {e}")
+            return None
 
         except Exception as e:
             logging.error(
@@ -206,10 +492,114 @@ class ConnectionManager:
             )
             return None
 
+    def perform_actions(
+        self,
+        batch: List[Tuple[str, str, List[Any]]],
+        max_workers: int = DEFAULT_BATCH_WORKERS,
+        timeout: Optional[float] = None
+    ) -> List[ActionResult]:
+        """
+        Perform independent actions concurrently
+
+        Args:
+            batch: (connection_name, action_name, params) per action
+            max_workers: Maximum number of actions in flight at once
+            timeout: Seconds each action may run, counted from when it starts
+
+        Returns:
+            List[ActionResult]: One result per batch item, in the same order. Failures are
+            reported in ActionResult.error instead of being raised.
+        """
+        if not batch:
+            return []
+
+        started: Dict[int, float] = {}
+        finished: Dict[int, float] = {}
+
+        def run(index: int, connection_name: str, action_name: str, params: List[Any]) -> Any:
+            started[index] = time.monotonic()
+            try:
+                return self.call_action(connection_name, action_name, params)
+            finally:
+                finished[index] = time.monotonic()
+
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(batch))),
+            thread_name_prefix="perform-actions"
+        )
+        futures = [
+            executor.submit(bind_context(run), index, connection_name, action_name, params)
+            for index, (connection_name, action_name, params) in enumerate(batch)
+        ]
+
+        results = []
+        for index, ((connection_name, action_name, _), future) in enumerate(zip(batch, futures)):
+            result = ActionResult(connection=connection_name, action=action_name)
+            if timeout is not None:
+                # Queued items get their full timeout once a worker picks them up
+                while not future.done():
+                    start = started.get(index)
+                    remaining = timeout if start is None else start + timeout - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    wait([future], timeout=remaining)
+
+            if not future.done():
+                result.error = f"Timed out after {timeout}s"
+                future.cancel()
+            elif future.exception() is not None:
+                result.error = str(future.exception()) or type(future.exception()).__name__
+            else:
+                result.result = future.result()
+
+            if index in started:
+                result.elapsed = finished.get(index, time.monotonic()) - started[index]
+            if result.error:
+                logging.error(f"\nBatch action {action_name} for {connection_name} connection failed: {result.error}")
+            results.append(result)
+
+        # Timed out actions keep running in the background, don't block on them
+        executor.shutdown(wait=False, cancel_futures=True)
+        return results
+
+    def _circuit_name(self, connection_name: str) -> str:
+        """
+        Circuits are shared by the agents using the same connection config, e.g. "sonic@1a2b3c4d5e".
+        An agent on another server, key or network, or with other circuit_breaker settings, never
+        trips them: in a fleet one misconfigured agent must not stop the others.
+        """
+        name = self._circuit_names.get(connection_name)
+        if name is None:
+            connection = self.connections.get(connection_name)
+            if connection is None:
+                return connection_name
+            name = self._circuit_names[connection_name] = f"{connection_name}@{connection_key(connection)}"
+        return name
+
+    def retry_after(self, connection_name: str) -> float:
+        """Seconds until the connection accepts calls again (open circuit or rate limited), 0 if it does now"""
+        # Connections with per-credential budgets name their limiter scope, the others use their name
+        scope = getattr(self.connections.get(connection_name), "rate_limit_scope", None) or connection_name
+        return max(breakers.retry_after(self._circuit_name(connection_name)), limiter.retry_after(scope))
+
+    def rate_limits(self) -> Dict[str, Dict[str, Any]]:
+        """Remaining budget per rate limited route"""
+        return limiter.snapshot()
+
+    def circuit_status(self) -> Dict[str, Dict[str, Any]]:
+        """State of every circuit opened by this process"""
+        return breakers.snapshot()
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Size and hit/miss counters of the shared action result cache"""
+        return action_cache.stats()
+
     def get_model_providers(self) -> List[str]:
         """Get a list of all LLM provider connections"""
-        return [
+        candidates = [
             name
             for name, conn in self.connections.items()
-            if conn.is_configured() and getattr(conn, "is_llm_provider", lambda: False)
+            if getattr(conn, "is_llm_provider", False)
         ]
+        statuses = self._check_configured_parallel(candidates)
+        return [name for name in candidates if statuses[name]]
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple, Type
+from src.connections.base_connection import BaseConnection
+
+logger = logging.getLogger("connection_registry")
+
+
+def normalize_config(config: Dict[str, Any]) -> str:
+    """Stable representation of a connection config, independent of key order"""
+    return json.dumps(config, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def connection_key(connection: BaseConnection) -> str:
+    """Short digest of a connection's type and config, equal for the instances the registry shares"""
+    key = ConnectionRegistry._key(type(connection), getattr(connection, "config", None) or {})
+    return hashlib.sha1("\0".join(key).encode()).hexdigest()[:10]
+
+
+@dataclass
+class _Entry:
+    connection: BaseConnection
+    refs: int = 0
+
+
+class ConnectionRegistry:
+    """
+    Process-wide pool of connection instances.
+
+    Agents that configure the same connection type with an identical config
+    borrow the same instance instead of building their own. Instances are
+    reference counted and closed when the last agent releases them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        # One lock per key, so slow constructors for different connections run in parallel
+        self._build_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+    @staticmethod
+    def _key(connection_class: Type[BaseConnection], config: Dict[str, Any]) -> Tuple[str, str]:
+        return (f"{connection_class.__module__}.{connection_class.__qualname__}", normalize_config(config))
+
+    def acquire(self, connection_class: Type[BaseConnection], config: Dict[str, Any]) -> BaseConnection:
+        """Borrow a connection for config, creating it on first use"""
+        key = self._key(connection_class, config)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refs += 1
+                return entry.connection
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refs += 1
+                    return entry.connection
+
+            # Built outside the registry lock, failures propagate and nothing is stored
+            connection = connection_class(config)
+
+            with self._lock:
+                self._entries[key] = _Entry(connection=connection, refs=1)
+                self._build_locks.pop(key, None)
+            logger.debug(f"Created shared connection {key[0]}")
+            return connection
+
+    def release(self, connection: BaseConnection) -> None:
+        """Return a borrowed connection, closing it once nobody uses it"""
+        with self._lock:
+            key = next((key for key, entry in self._entries.items() if entry.connection is connection), None)
+            if key is None:
+                return
+            entry = self._entries[key]
+            entry.refs -= 1
+            if entry.refs > 0:
+                return
+            del self._entries[key]
+
+        try:
+            connection.close()
+        except Exception as e:
+            logger.warning(f"Failed to close connection {key[0]}: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Number of live instances and borrowers"""
+        with self._lock:
+            return {
+                "connections": len(self._entries),
+                "references": sum(entry.refs for entry in self._entries.values())
+            }
+
+
+# Shared by every ConnectionManager in the process
+registry = ConnectionRegistry()
@@ -55,7 +55,8 @@ class AlloraConnection(BaseConnection):
             Action(
                 name="list-topics",
                 parameters=[],
-                description="List all available Allora Network topics"
+                description="List all available Allora Network topics",
+                cache_ttl=600
             )
         ]
         self.actions = {action.name: action for action in actions}
@@ -1,7 +1,23 @@
 import logging
+import os
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Callable
+from typing import Any, Dict, List, Callable, Optional
 from dataclasses import dataclass
+from src.tracing import span
+
+# Seconds a configuration check result is reused, overridable per connection with "status_ttl"
+DEFAULT_STATUS_TTL = 300
+# Seconds a failed check is reused, overridable with "failed_status_ttl". Kept short because
+# is_configured() also fails on transient errors (DNS, timeouts) and not only on bad credentials
+DEFAULT_FAILED_STATUS_TTL = 5
+ENV_FILE = ".env"
+
+def _env_mtime():
+    try:
+        return os.path.getmtime(ENV_FILE)
+    except OSError:
+        return None
 
 @dataclass
 class ActionParameter:
@@ -15,6 +31,9 @@ class Action:
     name: str
     parameters: List[ActionParameter]
     description: str
+    # Seconds a result may be served from the action cache, None for actions that must always run.
+    # Only set this on pure reads, never on transfers, swaps, posts...
+    cache_ttl: Optional[float] = None
     
     def validate_params(self, params: Dict[str, Any]) -> List[str]:
         errors = []
@@ -92,6 +111,52 @@ class BaseConnection(ABC):
         """
         pass
 
+    def check_configured(self, verbose: bool = False) -> bool:
+        """
+        Cached is_configured(). A success is reused for status_ttl seconds, a failure only for
+        failed_status_ttl seconds, and both are dropped early when .env changes or
+        invalidate_configured() is called. A cached failure is not reused for verbose checks,
+        so the reason still gets logged.
+        """
+        # Read with getattr, some connections do not call BaseConnection.__init__
+        cached = getattr(self, "_configured_cache", None)
+        config = getattr(self, "config", None) or getattr(self, "_config", None) or {}
+        env_mtime = _env_mtime()
+
+        if cached is not None:
+            result, checked_at, cached_mtime = cached
+            if result:
+                ttl = config.get("status_ttl", DEFAULT_STATUS_TTL)
+            else:
+                ttl = config.get("failed_status_ttl", DEFAULT_FAILED_STATUS_TTL)
+            fresh = time.monotonic() - checked_at < ttl and cached_mtime == env_mtime
+            if fresh and (result or not verbose):
+                return result
+
+        with span(f"{type(self).__name__}.is_configured"):
+            result = self.is_configured(verbose=verbose)
+        self._configured_cache = (result, time.monotonic(), env_mtime)
+        return result
+
+    def invalidate_configured(self) -> None:
+        """Forget the cached configuration status, e.g. after new credentials or an auth failure"""
+        self._configured_cache = None
+
+    def warm_up(self) -> bool:
+        """
+        Establish network state ahead of the first action (RPC handshakes, API clients).
+        Construction must stay I/O free, anything slow belongs here.
+
+        Returns:
+            bool: True if the connection is configured and reachable
+        """
+        self.invalidate_configured()
+        return self.check_configured()
+
+    def close(self) -> None:
+        """Release sockets and clients held by the connection, called when the last agent lets go of it"""
+        pass
+
     def perform_action(self, action_name: str, **kwargs) -> Any:
         """
         Perform a registered action with the given parameters.
@@ -4,8 +4,10 @@ from typing import Dict, Any
 from dotenv import set_key, load_dotenv
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 from src.helpers import print_h_bar
+from src.rate_limiter import route_key, scope_key
+from src.http_client import http_client
+from src.helpers import json_codec
 import requests
-import json
 
 logger = logging.getLogger("connections.discord_connection")
 
@@ -38,6 +40,11 @@ class DiscordConnection(BaseConnection):
     def is_llm_provider(self) -> bool:
         return False
 
+    @property
+    def rate_limit_scope(self) -> str:
+        """Discord budgets (and global limits) belong to the bot token"""
+        return scope_key("discord", os.getenv("DISCORD_TOKEN"))
+
     def validate_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Validate Discord configuration from JSON"""
         required_fields = ["server_id", "message_read_count", "message_emoji_name"]
@@ -165,6 +172,7 @@ class DiscordConnection(BaseConnection):
                     ),
                 ],
                 description="List all the channels for a specified discord server",
+                cache_ttl=300,
             ),
         }
 
@@ -281,7 +289,7 @@ class DiscordConnection(BaseConnection):
         logger.debug("Sending a new message")
 
         request_path = f"/channels/{channel_id}/messages"
-        payload = json.dumps({"content": f"{message}"})
+        payload = json_codec.dumps({"content": f"{message}"})
         response = self._post_request(request_path, payload)
         formatted_response = self._format_posted_message(response)
 
@@ -295,7 +303,7 @@ class DiscordConnection(BaseConnection):
         logger.debug("Replying to a message")
 
         request_path = f"/channels/{channel_id}/messages"
-        payload = json.dumps(
+        payload = json_codec.dumps(
             {
                 "content": f"{message}",
                 "message_reference": {
@@ -385,12 +393,11 @@ class DiscordConnection(BaseConnection):
 
     def _put_request(self, url_path: str) -> None:
         """Helper method to make PUT request"""
-        url = f"{self.base_url}{url_path}"
         headers = {
             "Accept": "application/json",
             "Authorization": self._get_request_auth_token(),
         }
-        response = requests.request("PUT", url, headers=headers, data={})
+        response = self._send("PUT", url_path, headers=headers, data={})
         if response.status_code != 204:
             raise DiscordAPIError(
                 f"Failed to called PUT to Discord: {response.status_code} - {response.text}"
@@ -399,33 +406,36 @@ class DiscordConnection(BaseConnection):
 
     def _post_request(self, url_path: str, payload: str) -> dict:
         """Helper method to make POST request"""
-        url = f"{self.base_url}{url_path}"
         headers = {
             "Content-Type": "application/json",
             "Accept": "application/json",
             "Authorization": self._get_request_auth_token(),
         }
-        response = requests.request("POST", url, headers=headers, data=payload)
+        response = self._send("POST", url_path, headers=headers, data=payload)
         if response.status_code != 200:
             raise DiscordAPIError(
                 f"Failed to call POST to Discord: {response.status_code} - {response.text}"
             )
-        return json.loads(response.text)
+        return json_codec.decode_response(response)
 
     def _get_request(self, url_path: str) -> str:
         """Helper method to make GET request"""
-        url = f"{self.base_url}{url_path}"
         headers = {
             "Accept": "application/json",
             "Authorization": self._get_request_auth_token(),
         }
-        print(headers)
-        response = requests.request("GET", url, headers=headers, data={})
+        response = self._send("GET", url_path, headers=headers, data={})
         if response.status_code != 200:
             raise DiscordAPIError(
                 f"Failed to call GET to Discord: {response.status_code} - {response.text}"
             )
-        return json.loads(response.text)
+        return json_codec.decode_response(response)
+
+    def _send(self, method: str, url_path: str, **kwargs) -> requests.Response:
+        """Send a request within the route's rate limit budget"""
+        # Discord budgets per channel/guild, so ids stay part of the route
+        route = route_key(self.rate_limit_scope, method, url_path, keep_ids=True)
+        return http_client.request(method, f"{self.base_url}{url_path}", service="discord", route=route, **kwargs)
 
     def _get_request_auth_token(self) -> str:
         return f"Bot {os.getenv('DISCORD_TOKEN')}"
@@ -435,13 +445,13 @@ class DiscordConnection(BaseConnection):
         try:
             url = f"{self.base_url}/users/@me"
             headers = {"Accept": "application/json", "Authorization": f"Bot {api_key}"}
-            response = requests.request("GET", url, headers=headers, data={})
+            response = http_client.get(url, service="discord", headers=headers)
             if response.status_code != 200:
                 raise DiscordAPIError(
                     f"Failed to call GET to Discord: {response.status_code} - {response.text}"
                 )
 
-            self.bot_username = json.loads(response.text)["username"]
+            self.bot_username = json_codec.decode_response(response)["username"]
 
         except Exception as e:
             raise DiscordConnectionError(f"Connection test failed: {e}")
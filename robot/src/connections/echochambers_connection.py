@@ -6,6 +6,9 @@ from collections import deque
 import requests
 from dotenv import load_dotenv
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.rate_limiter import route_key, scope_key
+from src.http_client import http_client
+from src.helpers import json_codec
 
 logger = logging.getLogger("connections.echochambers_connection")
 
@@ -33,6 +36,8 @@ class EchochambersConnection(BaseConnection):
         self.sender_model = config.get("sender_model")
         self.history_read_count = config.get("history_read_count")
         self.post_history_track = config.get("post_history_track")
+        # Budgets belong to a server and key, not to every echochambers agent in the process
+        self.rate_limit_scope = scope_key("echochambers", self.api_url, self.api_key)
 
         # Validate essential configurations
         if not all([self.api_url, self.api_key, self.room, self.sender_username, self.sender_model, self.history_read_count, self.post_history_track]):
@@ -55,7 +60,8 @@ class EchochambersConnection(BaseConnection):
         self.metrics = {
             'messages_sent': 0,
             'messages_failed': 0,
-            'api_latency': [],
+            # Milliseconds, last 100 requests
+            'api_latency': deque(maxlen=100),
             'last_error': None,
             'last_metrics_log': time.time()
         }
@@ -85,7 +91,8 @@ class EchochambersConnection(BaseConnection):
             Action(
                 name="get-room-info",
                 description="Get information about the current room including topic and tags",
-                parameters=[]
+                parameters=[],
+                cache_ttl=60
             ),
             Action(
                 name="get-room-history",
@@ -208,21 +215,22 @@ class EchochambersConnection(BaseConnection):
             "x-api-key": self.api_key
         }
         kwargs['headers'] = headers
+        route = route_key(self.rate_limit_scope, method, url.replace(self.api_url, "", 1))
 
         for attempt in range(3):
             try:
-                response = requests.request(method, url, timeout=10, **kwargs)
+                # Waits out a Retry-After learned from an earlier 429 (also one hit by another agent)
+                response = http_client.request(method, url, service="echochambers", route=route, timeout=10, **kwargs)
+                self.metrics['api_latency'].append(response.elapsed.total_seconds() * 1000)
                 if response.status_code == 429:  # Rate limit
-                    retry_after = int(response.headers.get('Retry-After', 60))
-                    logger.warning(f"Rate limit hit, waiting {retry_after}s")
-                    time.sleep(retry_after)
+                    logger.warning("Rate limit hit, retrying once the limiter allows it")
                     continue
                 response.raise_for_status()
-                return response.json()
+                return json_codec.decode_response(response)
             except requests.Timeout:
                 logger.error(f"Timeout on attempt {attempt + 1}")
                 time.sleep(2 ** attempt)  # Exponential backoff
-            except requests.RequestException as e:
+            except (requests.RequestException, json_codec.JsonDecodeError) as e:
                 if attempt == 2:
                     raise EchochambersAPIError(f"Failed after 3 attempts: {str(e)}")
                 logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
@@ -1,12 +1,12 @@
 import logging
 import os
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 from dotenv import load_dotenv, set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 from web3 import Web3
-import requests
+from src.http_client import http_client
 
 logger = logging.getLogger("connections.eternalai_connection")
 IPFS = "ipfs://"
@@ -63,6 +63,15 @@ class EternalAIConnection(BaseConnection):
                 ],
                 description="Generate text using EternalAI models"
             ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream text from EternalAI models as it is generated"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -147,12 +156,12 @@ class EternalAIConnection(BaseConnection):
     def get_on_chain_system_prompt_content(on_chain_data: str) -> str:
         if IPFS in on_chain_data:
             light_house = on_chain_data.replace(IPFS, LIGHTHOUSE_IPFS)
-            response = requests.get(light_house)
+            response = http_client.get(light_house, service="ipfs")
             if response.status_code == 200:
                 return response.text
             else:
                 gcs = on_chain_data.replace(IPFS, GCS_ETERNAL_AI_BASE_URL)
-                response = requests.get(gcs)
+                response = http_client.get(gcs, service="ipfs")
                 if response.status_code == 200:
                     return response.text
                 else:
@@ -163,36 +172,42 @@ class EternalAIConnection(BaseConnection):
             else:
                 raise Exception(f"invalid on-chain system prompt")
 
+    def _resolve_request(self, system_prompt: str, model: str = None, chain_id: str = None):
+        """Model, chain id and system prompt of a request, preferring the agent's on-chain system prompt"""
+        model = model or self.config["model"]
+        logger.info(f"model {model}")
+
+        chain_id = chain_id or self.config["chain_id"]
+        if not chain_id or chain_id == "":
+            chain_id = "45762"
+        logger.info(f"chain_id {chain_id}")
+
+        agent_id = self.config["agent_id"] or None
+        contract_address = self.config["contract_address"] or None
+        rpc = self.config["rpc_url"] or None
+
+        if agent_id and contract_address and rpc:
+            logger.info(f"agent_id: {agent_id}, contract_address: {contract_address}")
+            # call on-chain system prompt
+            web3 = Web3(Web3.HTTPProvider(rpc))
+            logger.info(f"web3 connected to {rpc} {web3.is_connected()}")
+            contract = web3.eth.contract(address=contract_address, abi=AGENT_CONTRACT_ABI)
+            result = contract.functions.getAgentSystemPrompt(agent_id).call()
+            logger.info(f"on-chain system_prompt: {result}")
+            if len(result) > 0:
+                try:
+                    system_prompt = self.get_on_chain_system_prompt_content(result[0].decode("utf-8"))
+                    logging.info(f"new system_prompt: {system_prompt}")
+                except Exception as e:
+                    logger.error(f"get on-chain system_prompt fail {e}")
+
+        return model, chain_id, system_prompt
+
     def generate_text(self, prompt: str, system_prompt: str, model: str = None, chain_id: str = None, **kwargs) -> str:
         """Generate text using EternalAI models"""
         try:
             client = self._get_client()
-            model = model or self.config["model"]
-            logger.info(f"model {model}")
-
-            chain_id = chain_id or self.config["chain_id"]
-            if not chain_id or chain_id == "":
-                chain_id = "45762"
-            logger.info(f"chain_id {chain_id}")
-
-            agent_id = self.config["agent_id"] or None
-            contract_address = self.config["contract_address"] or None
-            rpc = self.config["rpc_url"] or None
-
-            if agent_id and contract_address and rpc:
-                logger.info(f"agent_id: {agent_id}, contract_address: {contract_address}")
-                # call on-chain system prompt
-                web3 = Web3(Web3.HTTPProvider(rpc))
-                logger.info(f"web3 connected to {rpc} {web3.is_connected()}")
-                contract = web3.eth.contract(address=contract_address, abi=AGENT_CONTRACT_ABI)
-                result = contract.functions.getAgentSystemPrompt(agent_id).call()
-                logger.info(f"on-chain system_prompt: {result}")
-                if len(result) > 0:
-                    try:
-                        system_prompt = self.get_on_chain_system_prompt_content(result[0].decode("utf-8"))
-                        logging.info(f"new system_prompt: {system_prompt}")
-                    except Exception as e:
-                        logger.error(f"get on-chain system_prompt fail {e}")
+            model, chain_id, system_prompt = self._resolve_request(system_prompt, model, chain_id)
 
             completion = client.chat.completions.create(
                 model=model,
@@ -215,6 +230,28 @@ class EternalAIConnection(BaseConnection):
         except Exception as e:
             raise EternalAIAPIError(f"Text generation failed: {e}")
 
+    def generate_text_stream(self, prompt: str, system_prompt: str, model: str = None, chain_id: str = None, **kwargs) -> Iterator[str]:
+        """Yield text from EternalAI models as it is generated"""
+        try:
+            client = self._get_client()
+            model, chain_id, system_prompt = self._resolve_request(system_prompt, model, chain_id)
+
+            stream = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+                extra_body={"chain_id": chain_id},
+                stream=True,
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            raise EternalAIAPIError(f"Text generation failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
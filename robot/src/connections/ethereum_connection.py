@@ -1,7 +1,7 @@
 import logging
 import os
+import threading
 import time
-import requests
 from typing import Dict, Any, Optional, Union
 from dotenv import load_dotenv, set_key
 from web3 import Web3
@@ -9,6 +9,8 @@ from web3.middleware import geth_poa_middleware
 from src.constants.networks import EVM_NETWORKS
 from src.constants.abi import ERC20_ABI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.http_client import http_client
+from src.helpers import json_codec
 
 logger = logging.getLogger("connections.ethereum_connection")
 
@@ -20,6 +22,8 @@ class EthereumConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         logger.info("Initializing Ethereum connection...")
         self._web3 = None
+        self._connected = False
+        self._connect_lock = threading.Lock()
         self.NATIVE_TOKEN = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
         
         # Get network configuration
@@ -42,13 +46,20 @@ class EthereumConnection(BaseConnection):
         return f"https://{self.scanner_url}/tx/{tx_hash}"
 
     def _initialize_web3(self) -> None:
-        """Initialize Web3 connection with retry logic"""
+        """Create the Web3 client, no request is sent until the connection is used"""
         if not self._web3:
+            self._web3 = Web3(Web3.HTTPProvider(self.rpc_url, session=http_client.session))
+            self._web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+
+    def _ensure_connected(self) -> None:
+        """Probe the RPC endpoint and chain ID once with retry logic, on first use or during warm up"""
+        if self._connected:
+            return
+        with self._connect_lock:
+            if self._connected:
+                return
             for attempt in range(3):
                 try:
-                    self._web3 = Web3(Web3.HTTPProvider(self.rpc_url))
-                    self._web3.middleware_onion.inject(geth_poa_middleware, layer=0)
-                    
                     if not self._web3.is_connected():
                         raise EthereumConnectionError("Failed to connect to Ethereum network")
                     
@@ -57,6 +68,7 @@ class EthereumConnection(BaseConnection):
                         raise EthereumConnectionError(f"Connected to wrong chain. Expected {self.chain_id}, got {chain_id}")
                         
                     logger.info(f"Connected to Ethereum network with chain ID: {chain_id}")
+                    self._connected = True
                     break
                     
                 except Exception as e:
@@ -65,6 +77,10 @@ class EthereumConnection(BaseConnection):
                     logger.warning(f"Web3 initialization attempt {attempt + 1} failed: {str(e)}")
                     time.sleep(1)
 
+    def warm_up(self) -> bool:
+        self._ensure_connected()
+        return super().warm_up()
+
     @property
     def is_llm_provider(self) -> bool:
         return False
@@ -83,7 +99,8 @@ class EthereumConnection(BaseConnection):
                 parameters=[
                     ActionParameter("ticker", True, str, "Token ticker symbol to look up")
                 ],
-                description="Get token address by ticker symbol"
+                description="Get token address by ticker symbol",
+                cache_ttl=3600
             ),
             "get-balance": Action(
                 name="get-balance",
@@ -202,12 +219,14 @@ class EthereumConnection(BaseConnection):
     def _get_token_address(self, ticker: str) -> Optional[str]:
         """Helper function to get token address from DEXScreener"""
         try:
-            response = requests.get(
-                f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
+            response = http_client.get(
+                "https://api.dexscreener.com/latest/dex/search",
+                service="dexscreener",
+                params={"q": ticker}
             )
             response.raise_for_status()
 
-            data = response.json()
+            data = json_codec.decode_response(response)
             if not data.get('pairs'):
                 return None
 
@@ -308,14 +327,14 @@ class EthereumConnection(BaseConnection):
             # Try to get ETH value using Kyberswap price API
             try:
                 kyber_url = f"{self.aggregator_api}/tokens/rates"
-                response = requests.get(kyber_url, params={
+                response = http_client.get(kyber_url, service="kyberswap", params={
                     "tokenIn": token_address, 
                     "tokenOut": self.NATIVE_TOKEN, 
                     "amount": str(raw_balance) 
                 })
                 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = json_codec.decode_response(response)
                     eth_value = float(data.get("data", {}).get("amountOut", 0))
                     eth_value = self._web3.from_wei(eth_value, 'ether')
                     return token_balance
@@ -441,10 +460,10 @@ class EthereumConnection(BaseConnection):
                 "gasInclude": "true"
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = http_client.get(url, service="kyberswap", headers=headers, params=params)
             response.raise_for_status()
             
-            data = response.json()
+            data = json_codec.decode_response(response)
             if data.get("code") != 0:
                 raise ValueError(f"API error: {data.get('message')}")
                 
@@ -479,10 +498,10 @@ class EthereumConnection(BaseConnection):
                 "source": "zerepy"
             }
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = http_client.post(url, service="kyberswap", headers=headers, json=payload)
             response.raise_for_status()
             
-            data = response.json()
+            data = json_codec.decode_response(response)
             if data.get("code") != 0:
                 raise ValueError(f"API error: {data.get('message')}")
                 
@@ -635,9 +654,11 @@ class EthereumConnection(BaseConnection):
 
         load_dotenv()
         
-        if not self.is_configured(verbose=True):
+        if not self.check_configured(verbose=True):
             raise EthereumConnectionError("Ethereum connection is not properly configured")
 
+        self._ensure_connected()
+
         action = self.actions[action_name]
         errors = action.validate_params(kwargs)
         if errors:
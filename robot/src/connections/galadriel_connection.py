@@ -1,8 +1,8 @@
 import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 
-import requests
+from src.http_client import http_client
 from dotenv import load_dotenv, set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
@@ -58,6 +58,15 @@ class GaladrielConnection(BaseConnection):
                 ],
                 description="Generate text using Galadriel models"
             ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream text from Galadriel models as it is generated"
+            ),
         }
 
     def _get_client(self) -> OpenAI:
@@ -127,8 +136,9 @@ class GaladrielConnection(BaseConnection):
             return False
 
     def _is_api_key_valid(self, api_key):
-        response = requests.get(
+        response = http_client.get(
             f"{API_BASE_URL}/chat/completions",
+            service="galadriel",
             headers={
                 "Authorization": f"Bearer {api_key}"
             },
@@ -158,6 +168,30 @@ class GaladrielConnection(BaseConnection):
         except Exception as e:
             raise GaladrielAPIError(f"Text generation failed: {e}")
 
+    def generate_text_stream(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> Iterator[str]:
+        """Yield text from Galadriel models as it is generated"""
+        try:
+            client = self._get_client()
+
+            # Use configured model if none provided
+            if not model:
+                model = self.config["model"]
+
+            stream = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            raise GaladrielAPIError(f"Text generation failed: {e}")
+
     def perform_action(self, action_name: str, kwargs) -> Any:
         """Execute an action with validation"""
         if action_name not in self.actions:
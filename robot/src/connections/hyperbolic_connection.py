@@ -1,6 +1,6 @@
 import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 from dotenv import load_dotenv, set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
@@ -55,6 +55,16 @@ class HyperbolicConnection(BaseConnection):
                 ],
                 description="Generate text using Hyperbolic models"
             ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation"),
+                    ActionParameter("temperature", False, float, "A decimal number that determines the degree of randomness in the response.")
+                ],
+                description="Stream text from Hyperbolic models as it is generated"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -163,6 +173,30 @@ class HyperbolicConnection(BaseConnection):
         except Exception as e:
             raise HyperbolicAPIError(f"Text generation failed: {e}")
 
+    def generate_text_stream(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> Iterator[str]:
+        """Yield text from Hyperbolic models as it is generated"""
+        try:
+            client = self._get_client()
+
+            # Use configured model if none provided
+            if not model:
+                model = self.config["model"]
+
+            stream = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            raise HyperbolicAPIError(f"Text generation failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
@@ -202,7 +236,7 @@ class HyperbolicConnection(BaseConnection):
         # Explicitly reload environment variables
         load_dotenv()
         
-        if not self.is_configured(verbose=True):
+        if not self.check_configured(verbose=True):
             raise HyperbolicConfigurationError("Hyperbolic is not properly configured")
 
         action = self.actions[action_name]
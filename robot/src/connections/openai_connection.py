@@ -1,6 +1,6 @@
 import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 from dotenv import load_dotenv, set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
@@ -54,6 +54,15 @@ class OpenAIConnection(BaseConnection):
                 ],
                 description="Generate text using OpenAI models"
             ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream text from OpenAI models as it is generated"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -152,6 +161,30 @@ class OpenAIConnection(BaseConnection):
         except Exception as e:
             raise OpenAIAPIError(f"Text generation failed: {e}")
 
+    def generate_text_stream(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> Iterator[str]:
+        """Yield text from OpenAI models as it is generated"""
+        try:
+            client = self._get_client()
+
+            # Use configured model if none provided
+            if not model:
+                model = self.config["model"]
+
+            stream = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            raise OpenAIAPIError(f"Text generation failed: {e}")
+
     def check_model(self, model, **kwargs):
         try:
             client = self._get_client()
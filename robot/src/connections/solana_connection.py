@@ -1,8 +1,10 @@
 import logging
 import os
-import requests
 import asyncio
-from typing import Dict, Any, Optional
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import aiohttp
 
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 from src.types import JupiterTokenData
@@ -30,6 +32,11 @@ from solders.keypair import Keypair  # type: ignore
 
 logger = logging.getLogger("connections.solana_connection")
 
+# Shared aiohttp pool for the Jupiter, Lulo and Pump.fun APIs
+HTTP_POOL_SIZE = 20
+DNS_CACHE_TTL = 300
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=60, connect=10)
+
 
 class SolanaConnectionError(Exception):
     """Base exception for Solana connection errors"""
@@ -46,15 +53,78 @@ class SolanaConfigurationError(SolanaConnectionError):
 class SolanaConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         logger.info("Initializing Solana connection...")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        self._async_client: Optional[AsyncClient] = None
+        self._http_session: Optional[aiohttp.ClientSession] = None
         super().__init__(config)
 
     @property
     def is_llm_provider(self) -> bool:
         return False
 
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop owned by the connection, running in a daemon thread until close()"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="solana-event-loop", daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def _run(self, coro: Awaitable) -> Any:
+        """Run a coroutine on the connection's loop and wait for the result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
+
     def _get_connection_async(self) -> AsyncClient:
-        conn = AsyncClient(self.config["rpc"])
-        return conn
+        # One RPC client per loop, so its connection pool stays warm between actions
+        with self._loop_lock:
+            if self._async_client is None:
+                self._async_client = AsyncClient(self.config["rpc"])
+            return self._async_client
+
+    async def _get_http_session(self) -> aiohttp.ClientSession:
+        """Shared aiohttp session, created on the connection's loop on first use"""
+        if self._http_session is None or self._http_session.closed:
+            connector = aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, ttl_dns_cache=DNS_CACHE_TTL)
+            self._http_session = aiohttp.ClientSession(connector=connector, timeout=HTTP_TIMEOUT)
+        return self._http_session
+
+    async def _with_session(self, helper: Callable[..., Awaitable], *args: Any) -> Any:
+        """Call a helper that takes (async_client, session, ...) with the shared clients"""
+        session = await self._get_http_session()
+        return await helper(self._get_connection_async(), session, *args)
+
+    async def _close_clients(self) -> None:
+        if self._http_session is not None:
+            await self._http_session.close()
+        if self._async_client is not None:
+            await self._async_client.close()
+
+    def close(self) -> None:
+        """Close the HTTP session and RPC client, then stop the event loop"""
+        if self._async_client is not None or self._http_session is not None:
+            # The RPC client may have been created before any coroutine started the loop
+            self._get_loop()
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_clients(), loop).result(timeout=10)
+        except Exception as e:
+            logger.warning(f"Failed to close Solana clients cleanly: {e}")
+        finally:
+            self._http_session = None
+            self._async_client = None
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            if not thread.is_alive():
+                loop.close()
 
     def _get_wallet(self):
         creds = self._get_credentials()
@@ -189,6 +259,7 @@ class SolanaConnection(BaseConnection):
                     )
                 ],
                 description="Get token price",
+                cache_ttl=30,
             ),
             "get-tps": Action(
                 name="get-tps", parameters=[], description="Get current Solana TPS"
@@ -199,11 +270,13 @@ class SolanaConnection(BaseConnection):
                     ActionParameter("ticker", True, str, "Token ticker symbol")
                 ],
                 description="Get token data by ticker symbol",
+                cache_ttl=3600,
             ),
             "get-token-by-address": Action(
                 name="get-token-by-address",
                 parameters=[ActionParameter("mint", True, str, "Token mint address")],
                 description="Get token data by mint address",
+                cache_ttl=3600,
             ),
             "launch-pump-token": Action(
                 name="launch-pump-token",
@@ -293,7 +366,7 @@ class SolanaConnection(BaseConnection):
             amount,
             token_mint,
         )
-        res = asyncio.run(res)
+        res = self._run(res)
         logger.debug(f"Transferred {amount} to {to_address}\nTransaction ID: {res}")
         return res
 
@@ -318,7 +391,7 @@ class SolanaConnection(BaseConnection):
             input_mint,
             slippage_bps,
         )
-        res = asyncio.run(res)
+        res = self._run(res)
         return res
 
     def get_balance(self, token_address: str = None) -> float:
@@ -329,15 +402,14 @@ class SolanaConnection(BaseConnection):
         res = SolanaReadHelper.get_balance(
             self._get_connection_async(), self._get_wallet(), token_address
         )
-        res = asyncio.run(res)
+        res = self._run(res)
         return res
 
     def stake(self, amount: float) -> str:
         logger.info(f"Staking {amount} SOL")
-        res = StakeManager.stake_with_jup(
-            self._get_connection_async(), self._get_wallet(), amount
+        res = self._run(
+            self._with_session(StakeManager.stake_with_jup, self._get_wallet(), amount)
         )
-        res = asyncio.run(res)
         logger.debug(f"Staked {amount} SOL\nTransaction ID: {res}")
         return res
 
@@ -345,17 +417,18 @@ class SolanaConnection(BaseConnection):
     def lend_assets(self, amount: float) -> str:
         return "Not implemented"
         # logger.info(f"STUB: Lend {amount}")
-        # res = AssetLender.lend_asset(
-        #     self._get_connection_async(), self._get_wallet(), amount
+        # res = self._run(
+        #     self._with_session(AssetLender.lend_asset, self._get_wallet(), amount)
         # )
-        # res = asyncio.run(res)
         # logger.debug(f"Lent {amount} USDC\nTransaction ID: {res}")
         # return res
 
     def request_faucet(self) -> str:
         logger.info("Requesting faucet funds")
-        res = FaucetManager.request_faucet_funds(self)
-        res = asyncio.run(res)
+        res = FaucetManager.request_faucet_funds(
+            self._get_connection_async(), self._get_wallet()
+        )
+        res = self._run(res)
         logger.debug(f"Requested faucet funds\nTransaction ID: {res}")
         return res
 
@@ -365,7 +438,7 @@ class SolanaConnection(BaseConnection):
         # res = TokenDeploymentManager.deploy_token(
         #     self._get_connection_async(), self._get_wallet(), decimals
         # )
-        # res = asyncio.run(res)
+        # res = self._run(res)
         # logger.debug(
         #     f"Deployed token with {decimals} decimals\nToken Mint: {res['mint']}"
         # )
@@ -377,7 +450,7 @@ class SolanaConnection(BaseConnection):
     # todo: test on mainnet
     def get_tps(self) -> int:
         res = SolanaPerformanceTracker.fetch_current_tps(self._get_connection_async())
-        res = asyncio.run(res)
+        res = self._run(res)
         return res
 
     def get_token_by_ticker(self, ticker: str) -> str:
@@ -400,16 +473,17 @@ class SolanaConnection(BaseConnection):
     ) -> str:
         return "Not implemented"
         # logger.info(f"STUB: Launch Pump & Fun token {token_ticker}")
-        # res = PumpfunTokenManager.launch_pumpfun_token(
-        #    self._get_connection_async(),
-        #    self._get_wallet(),
-        #    token_name,
-        #    token_ticker,
-        #    description,
-        #    image_url,
-        #    options,
+        # res = self._run(
+        #    self._with_session(
+        #        PumpfunTokenManager.launch_pumpfun_token,
+        #        self._get_wallet(),
+        #        token_name,
+        #        token_ticker,
+        #        description,
+        #        image_url,
+        #        options,
+        #    )
         # )
-        # res = asyncio.run(res)
         # logger.debug(
         #    f"Launched Pump & Fun token {token_ticker}\nToken Mint: {res['mint']}"
         # )
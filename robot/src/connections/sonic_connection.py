@@ -1,6 +1,6 @@
 import logging
 import os
-import requests
+import threading
 import time
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv, set_key
@@ -8,6 +8,8 @@ from web3 import Web3
 from web3.middleware import geth_poa_middleware
 from src.constants.abi import ERC20_ABI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.http_client import http_client
+from src.helpers import json_codec
 from src.constants.networks import SONIC_NETWORKS
 
 logger = logging.getLogger("connections.sonic_connection")
@@ -22,6 +24,8 @@ class SonicConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         logger.info("Initializing Sonic connection...")
         self._web3 = None
+        self._connected = False
+        self._connect_lock = threading.Lock()
         
         # Get network configuration
         network = config.get("network", "mainnet")
@@ -43,18 +47,31 @@ class SonicConnection(BaseConnection):
         return f"{self.explorer}/tx/{tx_hash}"
 
     def _initialize_web3(self):
-        """Initialize Web3 connection"""
+        """Create the Web3 client, no request is sent until the connection is used"""
         if not self._web3:
-            self._web3 = Web3(Web3.HTTPProvider(self.rpc_url))
+            self._web3 = Web3(Web3.HTTPProvider(self.rpc_url, session=http_client.session))
             self._web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+
+    def _ensure_connected(self) -> None:
+        """Probe the RPC endpoint once, on first use or during warm up"""
+        if self._connected:
+            return
+        with self._connect_lock:
+            if self._connected:
+                return
             if not self._web3.is_connected():
                 raise SonicConnectionError("Failed to connect to Sonic network")
-            
+
             try:
                 chain_id = self._web3.eth.chain_id
                 logger.info(f"Connected to network with chain ID: {chain_id}")
             except Exception as e:
                 logger.warning(f"Could not get chain ID: {e}")
+            self._connected = True
+
+    def warm_up(self) -> bool:
+        self._ensure_connected()
+        return super().warm_up()
 
     @property
     def is_llm_provider(self) -> bool:
@@ -78,12 +95,14 @@ class SonicConnection(BaseConnection):
             if ticker.lower() in ["s", "S"]:
                 return "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
                 
-            response = requests.get(
-                f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
+            response = http_client.get(
+                "https://api.dexscreener.com/latest/dex/search",
+                service="dexscreener",
+                params={"q": ticker}
             )
             response.raise_for_status()
 
-            data = response.json()
+            data = json_codec.decode_response(response)
             if not data.get('pairs'):
                 return None
 
@@ -113,7 +132,8 @@ class SonicConnection(BaseConnection):
                 parameters=[
                     ActionParameter("ticker", True, str, "Token ticker symbol to look up")
                 ],
-                description="Get token address by ticker symbol"
+                description="Get token address by ticker symbol",
+                cache_ttl=3600
             ),
             "get-balance": Action(
                 name="get-balance",
@@ -289,10 +309,10 @@ class SonicConnection(BaseConnection):
                 "gasInclude": "true"
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = http_client.get(url, service="kyberswap", headers=headers, params=params)
             response.raise_for_status()
             
-            data = response.json()
+            data = json_codec.decode_response(response)
             if data.get("code") != 0:
                 raise SonicConnectionError(f"API error: {data.get('message')}")
                 
@@ -320,10 +340,10 @@ class SonicConnection(BaseConnection):
                 "source": "ZerePyBot"
             }
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = http_client.post(url, service="kyberswap", headers=headers, json=payload)
             response.raise_for_status()
             
-            data = response.json()
+            data = json_codec.decode_response(response)
             if data.get("code") != 0:
                 raise SonicConnectionError(f"API error: {data.get('message')}")
                 
@@ -445,9 +465,11 @@ class SonicConnection(BaseConnection):
 
         load_dotenv()
         
-        if not self.is_configured(verbose=True):
+        if not self.check_configured(verbose=True):
             raise SonicConnectionError("Sonic is not properly configured")
 
+        self._ensure_connected()
+
         action = self.actions[action_name]
         errors = action.validate_params(kwargs)
         if errors:
@@ -5,8 +5,9 @@ from requests_oauthlib import OAuth1Session
 from dotenv import set_key, load_dotenv
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 from src.helpers import print_h_bar
-from src.database import Database
-from src.scraper import Scraper
+from src.rate_limiter import route_key
+from src.http_client import http_client
+from src.helpers import json_codec
 logger = logging.getLogger("connections.twitter_connection")
 
 class TwitterConnectionError(Exception):
@@ -141,7 +142,8 @@ class TwitterConnection(BaseConnection):
             oauth = self._get_oauth()
             full_url = f"https://api.twitter.com/2/{endpoint.lstrip('/')}"
 
-            response = getattr(oauth, method.lower())(full_url, **kwargs)
+            route = route_key("twitter", method, endpoint)
+            response = http_client.request(method, full_url, service="twitter", route=route, session=oauth, **kwargs)
 
             if response.status_code not in [200, 201]:
                 logger.error(
@@ -152,7 +154,7 @@ class TwitterConnection(BaseConnection):
                 )
 
             logger.debug(f"Request successful: {response.status_code}")
-            return response.json()
+            return json_codec.decode_response(response)
 
         except Exception as e:
             raise TwitterAPIError(f"API request failed: {str(e)}")
@@ -170,6 +172,8 @@ class TwitterConnection(BaseConnection):
                     resource_owner_secret=credentials[
                         'TWITTER_ACCESS_TOKEN_SECRET'],
                 )
+                # Sign with OAuth but keep connections in the shared keep-alive pools
+                http_client.mount(self._oauth_session)
                 logger.debug("OAuth session created successfully")
             except Exception as e:
                 logger.error(f"Failed to create OAuth session: {str(e)}")
@@ -441,6 +445,8 @@ class TwitterConnection(BaseConnection):
             response = self._make_request('post', 'tweets', json={'text': message})
             logger.info("Tweet posted successfully with V2")
         except Exception as e:
+            # Scraper and Database pull in pyotp/pymongo, only import them when posting
+            from src.scraper import Scraper
             scraper = Scraper()
             scraper.login()
             response = scraper.send_tweet(message)
@@ -448,6 +454,7 @@ class TwitterConnection(BaseConnection):
 
 
         logger.info("Tweet posted successfully")
+        from src.database import Database
         db = Database()
         db.insert_tweet(response['data'])
         db.close()
@@ -0,0 +1,219 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.metrics import registry as metrics_registry
+from src.prompts import BATCH_CANDIDATES_PROMPT
+from src.tracing import bind_context
+
+logger = logging.getLogger("content_queue")
+
+DEFAULT_CONTENT_DB = "content.sqlite"
+DEFAULT_BATCH_SIZE = 5
+# Refill once fewer candidates than this are ready
+DEFAULT_MIN_READY = 2
+DEFAULT_MAX_SIZE = 20
+DEFAULT_TTL = 6 * 3600
+# Only pre-generate when the next task is at least this many seconds away
+DEFAULT_MIN_IDLE = 10
+BATCH = "batch"
+BURST = "burst"
+MODES = (BATCH, BURST)
+
+CONTENT = metrics_registry.counter(
+    "zerepy_content_queue_total",
+    "Pre-generated posts by task and outcome (generated, popped, expired)",
+    ("task", "outcome")
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS content (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    agent TEXT NOT NULL,
+    task TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS content_ready ON content (agent, task, id);
+"""
+
+
+@dataclass
+class ContentSource:
+    """How to pre-generate the posts of a task"""
+    task: str
+    build_prompt: Callable[[Any], Optional[str]]
+    max_length: Optional[int] = None
+    ttl: float = DEFAULT_TTL
+
+
+# Task name -> source, filled by register_content in the action modules
+content_sources: Dict[str, ContentSource] = {}
+
+
+def register_content(task: str, max_length: Optional[int] = None, ttl: float = DEFAULT_TTL):
+    """
+    Register the prompt builder of a posting task, so its posts can be generated ahead of time.
+    build_prompt(agent) returns the single-post prompt, or None when its inputs are not there yet.
+    """
+    def decorator(build_prompt: Callable[[Any], Optional[str]]):
+        content_sources[task] = ContentSource(task, build_prompt, max_length, ttl)
+        return build_prompt
+    return decorator
+
+
+class ContentQueue:
+    """
+    Bounded queue of pre-generated posts per agent and task in an SQLite file.
+    Candidates are popped oldest first and dropped once they expire.
+    """
+
+    def __init__(self, path: str = DEFAULT_CONTENT_DB, max_size: int = DEFAULT_MAX_SIZE, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.max_size = max_size
+        self.clock = clock
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # IMMEDIATE takes the write lock up front, so two processes never pop the same post
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def _expire(self, db: sqlite3.Connection, agent: str, task: str, now: float) -> None:
+        cursor = db.execute("DELETE FROM content WHERE agent = ? AND task = ? AND expires_at <= ?", (agent, task, now))
+        if cursor.rowcount:
+            CONTENT.labels(task=task, outcome="expired").inc(cursor.rowcount)
+
+    def push(self, agent: str, task: str, texts: List[str], ttl: float = DEFAULT_TTL) -> int:
+        """Add candidates, dropping the oldest beyond max_size. Returns how many are ready"""
+        now = self.clock()
+        with self._transaction() as db:
+            self._expire(db, agent, task, now)
+            db.executemany(
+                "INSERT INTO content (agent, task, text, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                [(agent, task, text, now, now + ttl) for text in texts]
+            )
+            db.execute(
+                "DELETE FROM content WHERE agent = ? AND task = ? AND id NOT IN "
+                "(SELECT id FROM content WHERE agent = ? AND task = ? ORDER BY id DESC LIMIT ?)",
+                (agent, task, agent, task, self.max_size)
+            )
+            count = db.execute("SELECT COUNT(*) FROM content WHERE agent = ? AND task = ?", (agent, task)).fetchone()[0]
+        CONTENT.labels(task=task, outcome="generated").inc(len(texts))
+        return count
+
+    def pop(self, agent: str, task: str) -> Optional[str]:
+        """Take the oldest unexpired candidate, None when the queue is empty"""
+        with self._transaction() as db:
+            self._expire(db, agent, task, self.clock())
+            row = db.execute(
+                "SELECT id, text FROM content WHERE agent = ? AND task = ? ORDER BY id LIMIT 1", (agent, task)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute("DELETE FROM content WHERE id = ?", (row["id"],))
+        CONTENT.labels(task=task, outcome="popped").inc()
+        return row["text"]
+
+    def count(self, agent: str, task: str) -> int:
+        """Candidates ready to be popped"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM content WHERE agent = ? AND task = ? AND expires_at > ?", (agent, task, self.clock())
+            ).fetchone()[0]
+
+    def stats(self, agent: Optional[str] = None) -> Dict[str, int]:
+        query = "SELECT task, COUNT(*) AS count FROM content WHERE expires_at > ?"
+        params = (self.clock(),)
+        if agent is not None:
+            query += " AND agent = ?"
+            params += (agent,)
+        with self._lock:
+            rows = self._db.execute(query + " GROUP BY task", params).fetchall()
+        return {row["task"]: row["count"] for row in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def parse_candidates(text: str) -> List[str]:
+    """Posts from a batch response: a JSON array, or one numbered/bulleted candidate per line"""
+    if not text:
+        return []
+    start, end = text.find("["), text.rfind("]")
+    if start != -1 and end > start:
+        try:
+            items = json.loads(text[start:end + 1])
+            if isinstance(items, list):
+                return [item.strip() for item in items if isinstance(item, str) and item.strip()]
+        except ValueError:
+            pass
+    lines = (re.sub(r"^\s*(?:\d+[.)]|[-*•])\s*", "", line).strip().strip('"').strip() for line in text.splitlines())
+    return [line for line in lines if line]
+
+
+def generate_candidates(agent, prompt: str, count: int, mode: str = BATCH) -> List[str]:
+    """
+    count candidate posts for prompt: one LLM request asking for all of them (batch),
+    or count identical requests sent at once (burst)
+    """
+    if mode == BURST:
+        # Through prompt_llm, so every request gets the LLM router's failover and hedging
+        with ThreadPoolExecutor(max_workers=max(1, count), thread_name_prefix="content-burst") as executor:
+            futures = [executor.submit(bind_context(agent.prompt_llm), prompt, cache=False) for _ in range(count)]
+            responses = [future.result() for future in futures]
+        return [response.strip() for response in responses if isinstance(response, str) and response.strip()]
+
+    # Every batch must differ, a cached response would queue the same posts again
+    response = agent.prompt_llm(BATCH_CANDIDATES_PROMPT.format(prompt=prompt, count=count), cache=False)
+    return parse_candidates(response)[:count]
+
+
+def refill(agent, queue: ContentQueue, task: str, settings: Dict[str, Any]) -> int:
+    """Top up the candidates of one task when it runs low. Returns how many were added"""
+    source = content_sources.get(task)
+    if source is None:
+        return 0
+    ready = queue.count(agent.name, task)
+    if ready >= settings.get("min_ready", DEFAULT_MIN_READY):
+        return 0
+    prompt = source.build_prompt(agent)
+    if not prompt:
+        return 0
+
+    count = min(settings.get("batch_size", DEFAULT_BATCH_SIZE), queue.max_size - ready)
+    if count <= 0:
+        return 0
+    started = time.monotonic()
+    candidates = generate_candidates(agent, prompt, count, settings.get("mode", BATCH))
+    if source.max_length:
+        candidates = [text for text in candidates if len(text) <= source.max_length]
+    if candidates:
+        queue.push(agent.name, task, candidates, settings.get("ttl", source.ttl))
+    logger.info(f"Pre-generated {len(candidates)} {task} candidates in {time.monotonic() - started:.1f}s")
+    return len(candidates)
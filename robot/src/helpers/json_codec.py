@@ -0,0 +1,143 @@
+import dataclasses
+import functools
+import json
+import logging
+import os
+from typing import Any, Optional, Union, get_args, get_origin
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+logger = logging.getLogger("helpers.json_codec")
+
+_DECODE_ERRORS = (ValueError, TypeError) + ((msgspec.DecodeError,) if msgspec else ())
+
+
+class JsonDecodeError(ValueError):
+    """Raised when a payload is not valid JSON or does not match the requested type"""
+    pass
+
+
+class _StdlibBackend:
+    name = "json"
+
+    @staticmethod
+    def loads(data: Union[bytes, str]) -> Any:
+        # json.loads detects the encoding of bytes itself
+        return json.loads(data)
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class _OrjsonBackend:
+    name = "orjson"
+
+    @staticmethod
+    def loads(data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+
+class _MsgspecBackend:
+    name = "msgspec"
+
+    @staticmethod
+    def loads(data: Union[bytes, str]) -> Any:
+        return msgspec.json.decode(data)
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        return msgspec.json.encode(obj)
+
+
+BACKENDS = {"json": _StdlibBackend}
+if orjson is not None:
+    BACKENDS["orjson"] = _OrjsonBackend
+if msgspec is not None:
+    BACKENDS["msgspec"] = _MsgspecBackend
+
+# orjson parses untyped documents fastest, msgspec is used for typed decoding whenever installed
+_backend = BACKENDS.get(os.getenv("JSON_CODEC", "")) or BACKENDS.get("orjson") or BACKENDS.get("msgspec") or _StdlibBackend
+
+
+def set_backend(name: str) -> None:
+    """Switch the codec, one of BACKENDS (json, plus orjson and msgspec when installed)"""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"JSON backend '{name}' is not available, choose from {', '.join(BACKENDS)}")
+    _backend = BACKENDS[name]
+    logger.debug(f"Using the {name} JSON backend")
+
+
+def backend_name() -> str:
+    return _backend.name
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    try:
+        return _backend.loads(data)
+    except _DECODE_ERRORS as e:
+        raise JsonDecodeError(str(e)) from e
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 encoded JSON, ready to send as a request body"""
+    return _backend.dumps(obj)
+
+
+@functools.lru_cache(maxsize=None)
+def _field_names(target: Any) -> tuple:
+    return tuple(field.name for field in dataclasses.fields(target))
+
+
+def _convert(obj: Any, target: Any) -> Any:
+    """Build dataclasses (and lists of them) from decoded JSON, unknown keys are dropped"""
+    if get_origin(target) is list:
+        (item_type,) = get_args(target) or (Any,)
+        if not isinstance(obj, list):
+            raise TypeError(f"Expected an array, got {type(obj).__name__}")
+        return [_convert(item, item_type) for item in obj]
+    if dataclasses.is_dataclass(target):
+        if not isinstance(obj, dict):
+            raise TypeError(f"Expected an object for {target.__name__}, got {type(obj).__name__}")
+        return target(**{name: obj[name] for name in _field_names(target) if name in obj})
+    return obj
+
+
+def decode(data: Union[bytes, str], type: Optional[Any] = None) -> Any:
+    """
+    Parse JSON, optionally validating it into a typed structure
+
+    Args:
+        data: Raw body, bytes are decoded without building an intermediate str
+        type: A dataclass, List[dataclass] or msgspec.Struct. msgspec only materialises
+            the declared fields, which is much cheaper than building dicts for large payloads
+
+    Raises:
+        JsonDecodeError: If the body is not JSON or does not match type
+    """
+    if type is None:
+        return loads(data)
+    try:
+        if msgspec is not None:
+            return msgspec.json.decode(data, type=type)
+        return _convert(_backend.loads(data), type)
+    except _DECODE_ERRORS as e:
+        raise JsonDecodeError(str(e)) from e
+
+
+def decode_response(response: Any, type: Optional[Any] = None) -> Any:
+    """decode() the body of a requests.Response straight from its bytes"""
+    return decode(response.content, type)
@@ -18,15 +18,16 @@ from solders.keypair import Keypair  # type: ignore
 class AssetLender:
     @staticmethod
     async def lend_asset(
-        async_client: AsyncClient, wallet: Keypair, amount: float
+        async_client: AsyncClient,
+        session: aiohttp.ClientSession,
+        wallet: Keypair,
+        amount: float,
     ) -> str:
         try:
             url = f"https://blink.lulo.fi/actions?amount={amount}&symbol=USDC"
             headers = {"Content-Type": "application/json"}
             payload = json.dumps({"account": str(wallet.pubkey())})
 
-            session = aiohttp.ClientSession()
-
             async with session.post(url, headers=headers, data=payload) as response:
                 if response.status != 200:
                     raise Exception(f"Lulo API Error: {response.status}")
@@ -49,7 +50,6 @@ class AssetLender:
             logger.debug(
                 f"Transaction sent: https://explorer.solana.com/tx/{transaction_id}"
             )
-            await session.close()
             return str(signature)
 
         except Exception as e:
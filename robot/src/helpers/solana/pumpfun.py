@@ -137,6 +137,7 @@ class PumpfunTokenManager:
     @staticmethod
     async def launch_pumpfun_token(
         async_client: AsyncClient,
+        session: aiohttp.ClientSession,
         wallet: Keypair,
         token_name: str,
         token_ticker: str,
@@ -148,7 +149,9 @@ class PumpfunTokenManager:
         Launches a new token on Pump.fun.
 
         Args:
-            agent: SolanaAgentKit instance
+            async_client: Solana RPC client
+            session: Shared aiohttp.ClientSession used for the Pump.fun API calls
+            wallet: Keypair paying for the launch
             token_name: Name of the token
             token_ticker: Token symbol/ticker
             description: Token description
@@ -162,41 +165,36 @@ class PumpfunTokenManager:
         mint_keypair = Keypair()
         logger.info(f"Mint public key: {mint_keypair.pubkey()}")
         try:
-            # Use a single aiohttp session for both metadata upload and transaction creation
-            async with aiohttp.ClientSession() as session:
-                logger.info("Uploading metadata to IPFS...")
-                metadata_response = await PumpfunTokenManager._upload_metadata(
-                    session, token_name, token_ticker, description, image_url, options
-                )
-                logger.info(f"Metadata response: {metadata_response}")
-
-                logger.info("Creating token transaction...")
-                tx_data = await PumpfunTokenManager._create_token_transaction(
-                    session, wallet, mint_keypair, metadata_response, options
-                )
-                logger.info("Deserializing transaction...")
-                tx = VersionedTransaction.from_bytes(tx_data)
-                logger.info("Signing transaction...")
-                signature = wallet.sign_message(message.to_bytes_versioned(tx.message))
-                logger.info("Sending transaction to Solana...")
-                signed_txn = VersionedTransaction.populate(tx.message, [signature])
-                logger.info("Transaction sent!")
-                opts = TxOpts(skip_preflight=False, preflight_commitment=Processed)
-                logger.info("Transaction sent!1")
-                result = await async_client.send_transaction(signed_txn, opts=opts)
-                logger.info("Transaction sent!2")
-                transaction_id = json.loads(result.to_json())["result"]
-
-                logger.info(
-                    f"Transaction sent: https://explorer.solana.com/tx/{transaction_id}"
-                )
-                logger.debug(
-                    f'Mint: {str(mint_keypair.pubkey())}\nSignature: {signature}\nMetadata URI: {metadata_response["metadataUri"]}'
-                )
-                # close the session
-                await session.close()
-
-                return True
+            logger.info("Uploading metadata to IPFS...")
+            metadata_response = await PumpfunTokenManager._upload_metadata(
+                session, token_name, token_ticker, description, image_url, options
+            )
+            logger.info(f"Metadata response: {metadata_response}")
+
+            logger.info("Creating token transaction...")
+            tx_data = await PumpfunTokenManager._create_token_transaction(
+                session, wallet, mint_keypair, metadata_response, options
+            )
+            logger.info("Deserializing transaction...")
+            tx = VersionedTransaction.from_bytes(tx_data)
+            logger.info("Signing transaction...")
+            signature = wallet.sign_message(message.to_bytes_versioned(tx.message))
+            logger.info("Sending transaction to Solana...")
+            signed_txn = VersionedTransaction.populate(tx.message, [signature])
+            logger.info("Transaction sent!")
+            opts = TxOpts(skip_preflight=False, preflight_commitment=Processed)
+            logger.info("Transaction sent!1")
+            result = await async_client.send_transaction(signed_txn, opts=opts)
+            logger.info("Transaction sent!2")
+            transaction_id = json.loads(result.to_json())["result"]
+
+            logger.info(
+                f"Transaction sent: https://explorer.solana.com/tx/{transaction_id}"
+            )
+            logger.debug(
+                f'Mint: {str(mint_keypair.pubkey())}\nSignature: {signature}\nMetadata URI: {metadata_response["metadataUri"]}'
+            )
+            return True
 
         except Exception as error:
             logger.error(f"Error in launch_pumpfun_token: {error}")
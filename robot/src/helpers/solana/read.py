@@ -9,7 +9,8 @@ from src.types import JupiterTokenData
 
 from solders.keypair import Keypair  # type: ignore
 from solders.pubkey import Pubkey  # type: ignore
-import requests
+from src.http_client import http_client
+from src.helpers import json_codec
 
 from spl.token.async_client import AsyncToken
 from spl.token.instructions import get_associated_token_address
@@ -58,9 +59,9 @@ class SolanaReadHelper:
         url = f"https://api.jup.ag/price/v2?ids={token_address}"
 
         try:
-            with requests.get(url) as response:
+            with http_client.get(url, service="jupiter") as response:
                 response.raise_for_status()
-                data = response.json()
+                data = json_codec.decode_response(response)
                 price = data.get("data", {}).get(token_address, {}).get("price")
 
                 if not price:
@@ -75,12 +76,14 @@ class SolanaReadHelper:
         ticker: str,
     ) -> str:
         try:
-            response = requests.get(
-                f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
+            response = http_client.get(
+                "https://api.dexscreener.com/latest/dex/search",
+                service="dexscreener",
+                params={"q": ticker}
             )
             response.raise_for_status()
 
-            data = response.json()
+            data = json_codec.decode_response(response)
             if not data.get("pairs"):
                 return None
 
@@ -110,13 +113,14 @@ class SolanaReadHelper:
         address: str,
     ) -> str:
         try:
-            response = requests.get(
+            response = http_client.get(
                 "https://tokens.jup.ag/tokens?tags=verified",
+                service="jupiter",
                 headers={"Content-Type": "application/json"},
             )
             response.raise_for_status()
 
-            data = response.json()
+            data = json_codec.decode_response(response)
             for token in data:
                 if token.get("address") == str(address):
                     return JupiterTokenData(
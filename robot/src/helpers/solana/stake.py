@@ -17,7 +17,10 @@ from solders.keypair import Keypair  # type: ignore
 class StakeManager:
     @staticmethod
     async def stake_with_jup(
-        async_client: AsyncClient, wallet: Keypair, amount: float
+        async_client: AsyncClient,
+        session: aiohttp.ClientSession,
+        wallet: Keypair,
+        amount: float,
     ) -> str:
 
         try:
@@ -25,12 +28,11 @@ class StakeManager:
             url = f"https://worker.jup.ag/blinks/swap/So11111111111111111111111111111111111111112/jupSoLaHXQiZZTSfEWMTRRgpnyFm8f6sZdosWBjx93v/{amount}"
             payload = {"account": str(wallet.pubkey())}
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as res:
-                    if res.status != 200:
-                        raise Exception(f"Failed to fetch transaction: {res.status}")
+            async with session.post(url, json=payload) as res:
+                if res.status != 200:
+                    raise Exception(f"Failed to fetch transaction: {res.status}")
 
-                    data = await res.json()
+                data = await res.json()
 
             raw_transaction = VersionedTransaction.from_bytes(
                 base64.b64decode(data["transaction"])
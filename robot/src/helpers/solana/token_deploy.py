@@ -130,8 +130,6 @@ class TokenDeploymentManager:
 
             logger.debug(f"https://explorer.solana.com/tx/{tx_resp}")
 
-            await client.close()
-
             logger.debug(f"Transaction Signature: {tx_resp}")
 
             return {
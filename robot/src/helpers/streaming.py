@@ -0,0 +1,24 @@
+import asyncio
+from typing import AsyncIterator, Iterable, Iterator
+
+_DONE = object()
+
+
+async def aiter_stream(chunks: Iterable[str]) -> AsyncIterator[str]:
+    """
+    Async iterator over a blocking text stream, e.g. a generate-text-stream result.
+    Each chunk is read in the default executor so the event loop keeps running
+    between tokens.
+    """
+    iterator: Iterator[str] = iter(chunks)
+    try:
+        while True:
+            chunk = await asyncio.to_thread(next, iterator, _DONE)
+            if chunk is _DONE:
+                return
+            yield chunk
+    finally:
+        # Closes the provider's HTTP response when the consumer stops early
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
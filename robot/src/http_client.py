@@ -0,0 +1,156 @@
+import logging
+import os
+import threading
+import time
+import weakref
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.metrics import observe_http
+from src.rate_limiter import limiter
+from src.tracing import span, SPAN_KIND_CLIENT
+
+logger = logging.getLogger("http_client")
+
+# (connect, read) seconds, used by every call that does not pass its own timeout
+DEFAULT_TIMEOUT: Tuple[float, float] = (5, 30)
+# Number of hosts whose keep-alive pool is cached, and sockets kept per host
+DEFAULT_POOL_HOSTS = 32
+DEFAULT_POOL_SIZE = 16
+
+Timeout = Union[float, Tuple[float, float], None]
+
+
+def parse_timeout(value: str) -> Timeout:
+    """'30' applies to connect and read, '5,30' sets them separately"""
+    parts = [float(part) for part in value.split(",")]
+    if len(parts) == 1:
+        return parts[0]
+    if len(parts) == 2:
+        return (parts[0], parts[1])
+    raise ValueError(f"Invalid timeout '{value}', expected 'seconds' or 'connect,read'")
+
+
+class HttpClient:
+    """
+    One requests.Session shared by every REST connection in the process, so
+    calls to the same host reuse keep-alive TCP/TLS connections instead of
+    handshaking each time. Requests go through the rate limiter, metrics and
+    tracing hooks. The session never stores cookies, so agents sharing it
+    cannot leak state into each other, but per-request cookies still work.
+    """
+
+    def __init__(
+        self,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        pool_hosts: int = DEFAULT_POOL_HOSTS,
+        pool_size: int = DEFAULT_POOL_SIZE
+    ):
+        self.timeout = timeout
+        self.adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size)
+        # Every session using the shared adapter, remounted when the adapter is replaced
+        self._sessions: "weakref.WeakSet[requests.Session]" = weakref.WeakSet()
+        self.session = self._new_session()
+        self._lock = threading.Lock()
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self.mount(session)
+        return session
+
+    def mount(self, session: requests.Session) -> requests.Session:
+        """Make another session (e.g. an OAuth1Session) use the shared connection pools"""
+        session.mount("https://", self.adapter)
+        session.mount("http://", self.adapter)
+        self._sessions.add(session)
+        return session
+
+    def _remount(self) -> None:
+        for session in list(self._sessions):
+            self.mount(session)
+
+    def configure(
+        self,
+        timeout: Timeout = None,
+        pool_hosts: Optional[int] = None,
+        pool_size: Optional[int] = None
+    ) -> None:
+        """Change the defaults, new pool sizes apply to connections opened from now on"""
+        with self._lock:
+            if timeout is not None:
+                self.timeout = timeout
+            if pool_hosts is not None or pool_size is not None:
+                self.adapter = HTTPAdapter(
+                    pool_connections=pool_hosts or self.adapter._pool_connections,
+                    pool_maxsize=pool_size or self.adapter._pool_maxsize
+                )
+                self._remount()
+
+    def set_adapter(self, adapter: HTTPAdapter) -> HTTPAdapter:
+        """Swap the transport (e.g. for a cassette), returns the previous one so it can be restored"""
+        with self._lock:
+            previous, self.adapter = self.adapter, adapter
+            self._remount()
+        return previous
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        service: Optional[str] = None,
+        route: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        **kwargs: Any
+    ) -> requests.Response:
+        """
+        Send a request through the shared pools
+
+        Args:
+            service: Label for metrics, defaults to the host name
+            route: Rate limiter route (see rate_limiter.route_key), None to skip rate limiting
+            session: Session to send with instead of the shared one, e.g. one that signs requests
+            **kwargs: Passed to requests, timeout defaults to the client's timeout
+        """
+        method = method.upper()
+        service = service or urlsplit(url).hostname or "unknown"
+        kwargs.setdefault("timeout", self.timeout)
+        session = session or self.session
+
+        if route:
+            limiter.acquire(route)
+
+        started = time.monotonic()
+        with span(f"HTTP {method}", kind=SPAN_KIND_CLIENT, **{"http.method": method, "http.url": url, "service": service}) as http_span:
+            try:
+                response = session.request(method, url, **kwargs)
+            except Exception as e:
+                observe_http(service, method, type(e).__name__, time.monotonic() - started)
+                raise
+            if http_span:
+                http_span.set_attribute("http.status_code", response.status_code)
+
+        observe_http(service, method, response.status_code, time.monotonic() - started)
+        if route:
+            limiter.update(route, response.headers, response.status_code)
+        return response
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+# HTTP_TIMEOUT is read from the environment so process pool workers pick it up too
+http_client = HttpClient(timeout=parse_timeout(os.environ["HTTP_TIMEOUT"]) if os.getenv("HTTP_TIMEOUT") else DEFAULT_TIMEOUT)
@@ -0,0 +1,387 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from src.metrics import registry as metrics_registry
+
+logger = logging.getLogger("job_queue")
+
+DEFAULT_JOB_DB = "jobs.sqlite"
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_BACKOFF = 30
+MAX_RETRY_BACKOFF = 900
+# Finished jobs are kept this long for inspection, then pruned
+DEFAULT_RETENTION = 7 * 24 * 3600
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+JOBS = metrics_registry.counter("zerepy_jobs_total", "Queued agent jobs by outcome", ("task", "outcome"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    agent TEXT NOT NULL,
+    task TEXT NOT NULL,
+    params TEXT NOT NULL DEFAULT '{}',
+    state TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_token TEXT,
+    lease_until REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (agent, status, priority DESC, available_at);
+"""
+
+
+@dataclass
+class Job:
+    """A leased job. Only the holder of lease_token may complete, fail or checkpoint it"""
+    id: int
+    agent: str
+    task: str
+    params: Dict[str, Any]
+    state: Dict[str, Any]
+    priority: int
+    attempts: int
+    max_attempts: int
+    lease_token: str
+    queue: Optional["JobQueue"] = field(default=None, repr=False)
+
+    def checkpoint(self, **state: Any) -> None:
+        """
+        Persist progress of a multi-step action (e.g. generated text not yet posted),
+        a retry after a crash sees it in job.state and can skip the finished steps
+        """
+        self.state.update(state)
+        if self.queue is not None:
+            self.queue.save_state(self)
+
+
+class JobQueue:
+    """
+    Durable queue of agent actions in an SQLite file.
+
+    Jobs are leased rather than popped: a job stays in the file until the worker that
+    leased it marks it done or failed, and a lease that runs out (the worker died) makes
+    the job available again. Delivery is at-least-once, so a job may run twice after a
+    crash. Actions with side effects should check job.state before redoing a step.
+    """
+
+    def __init__(self, path: str = DEFAULT_JOB_DB, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.clock = clock
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # One connection shared by the agent's threads, several processes may open the same file
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # IMMEDIATE takes the write lock up front, so two processes cannot lease the same job
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def enqueue(
+        self,
+        agent: str,
+        task: str,
+        params: Optional[Dict[str, Any]] = None,
+        priority: int = 0,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        delay: float = 0
+    ) -> int:
+        """Add a job, higher priority jobs are leased first. Returns the job id"""
+        now = self.clock()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "INSERT INTO jobs (agent, task, params, status, priority, max_attempts, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (agent, task, json.dumps(params or {}), PENDING, priority, max(1, max_attempts), now + delay, now, now)
+            )
+            return cursor.lastrowid
+
+    def lease(self, agent: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> Optional[Job]:
+        """Take the next available job of an agent, None if there is none"""
+        now = self.clock()
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT * FROM jobs WHERE agent = ? AND ("
+                "(status = ? AND available_at <= ?) OR (status = ? AND lease_until <= ?)"
+                ") ORDER BY priority DESC, available_at, id LIMIT 1",
+                (agent, PENDING, now, LEASED, now)
+            ).fetchone()
+            if row is None:
+                return None
+            if row["status"] == LEASED:
+                logger.warning(f"Lease on job {row['id']} ({row['task']}) expired, running it again")
+
+            token = os.urandom(8).hex()
+            db.execute(
+                "UPDATE jobs SET status = ?, lease_token = ?, lease_until = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (LEASED, token, now + lease_seconds, now, row["id"])
+            )
+        return Job(
+            id=row["id"],
+            agent=row["agent"],
+            task=row["task"],
+            params=json.loads(row["params"]),
+            state=json.loads(row["state"]),
+            priority=row["priority"],
+            attempts=row["attempts"] + 1,
+            max_attempts=row["max_attempts"],
+            lease_token=token,
+            queue=self
+        )
+
+    def extend(self, job: Job, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """Renew a lease, False if it was lost to another worker"""
+        now = self.clock()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET lease_until = ?, updated_at = ? WHERE id = ? AND lease_token = ?",
+                (now + lease_seconds, now, job.id, job.lease_token)
+            )
+        return cursor.rowcount == 1
+
+    def save_state(self, job: Job) -> bool:
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET state = ?, updated_at = ? WHERE id = ? AND lease_token = ?",
+                (json.dumps(job.state), self.clock(), job.id, job.lease_token)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job: Job) -> bool:
+        """Mark a job done, False if the lease was lost (the job will run again elsewhere)"""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = ?, lease_token = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE id = ? AND lease_token = ?",
+                (DONE, self.clock(), job.id, job.lease_token)
+            )
+        if cursor.rowcount != 1:
+            logger.warning(f"Job {job.id} ({job.task}) finished after its lease was lost")
+            return False
+        JOBS.labels(task=job.task, outcome=DONE).inc()
+        return True
+
+    def fail(self, job: Job, error: str, backoff: float = DEFAULT_RETRY_BACKOFF) -> bool:
+        """
+        Record a failed attempt. The job is retried with exponential backoff until it has
+        used max_attempts. Returns True if it will be retried
+        """
+        now = self.clock()
+        retry = job.attempts < job.max_attempts
+        delay = min(MAX_RETRY_BACKOFF, backoff * (2 ** (job.attempts - 1)))
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, lease_token = NULL, lease_until = NULL, "
+                "last_error = ?, updated_at = ? WHERE id = ? AND lease_token = ?",
+                (PENDING if retry else FAILED, now + delay, error, now, job.id, job.lease_token)
+            )
+        JOBS.labels(task=job.task, outcome="retry" if retry else FAILED).inc()
+        if retry:
+            logger.warning(f"Job {job.id} ({job.task}) failed attempt {job.attempts}/{job.max_attempts}, retrying in {delay:.0f}s: {error}")
+        else:
+            logger.error(f"Job {job.id} ({job.task}) failed after {job.attempts} attempts: {error}")
+        return retry
+
+    def recover(self, agent: str) -> int:
+        """
+        Make the expired leases of an agent available again, for use when the agent (re)starts.
+        Live leases may belong to another process running the same agent and are left alone
+        """
+        now = self.clock()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, lease_token = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE agent = ? AND status = ? AND lease_until <= ?",
+                (PENDING, now, now, agent, LEASED, now)
+            )
+        return cursor.rowcount
+
+    def unfinished_tasks(self, agent: str) -> Set[str]:
+        """Tasks that have a pending or leased job"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT task FROM jobs WHERE agent = ? AND status IN (?, ?)", (agent, PENDING, LEASED)
+            ).fetchall()
+        return {row["task"] for row in rows}
+
+    def seconds_until_available(self, agent: str) -> Optional[float]:
+        """Time until the next pending job can be leased, None if there is none"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MIN(available_at) AS at FROM jobs WHERE agent = ? AND status = ?", (agent, PENDING)
+            ).fetchone()
+        return None if row["at"] is None else max(0.0, row["at"] - self.clock())
+
+    def prune(self, retention: float = DEFAULT_RETENTION) -> int:
+        """Delete finished jobs older than retention seconds"""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?", (DONE, FAILED, self.clock() - retention)
+            )
+        return cursor.rowcount
+
+    def stats(self, agent: Optional[str] = None) -> Dict[str, int]:
+        query = "SELECT status, COUNT(*) AS count FROM jobs"
+        params = ()
+        if agent is not None:
+            query += " WHERE agent = ?"
+            params = (agent,)
+        with self._lock:
+            rows = self._db.execute(query + " GROUP BY status", params).fetchall()
+        return {row["status"]: row["count"] for row in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class JobWorkerPool:
+    """
+    Threads that lease an agent's jobs and run them.
+
+    handler(job) runs the action and returns its result. Raising or returning a falsy
+    result counts as a failed attempt and has the job retried.
+    on_finished(job, success) is called once the job is done or has failed for good.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        agent: str,
+        handler: Callable[[Job], Any],
+        on_finished: Optional[Callable[[Job, bool], None]] = None,
+        workers: int = 1,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+        poll_interval: float = 5
+    ):
+        self.queue = queue
+        self.agent = agent
+        self.handler = handler
+        self.on_finished = on_finished
+        self.workers = max(1, workers)
+        self.lease_seconds = lease_seconds
+        self.retry_backoff = retry_backoff
+        self.poll_interval = poll_interval
+
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._held: Dict[int, Job] = {}
+        self._held_lock = threading.Lock()
+
+    def start(self) -> None:
+        self._stopping.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"{self.agent}-job-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        keeper = threading.Thread(target=self._keep_leases, name=f"{self.agent}-job-leases", daemon=True)
+        keeper.start()
+        self._threads.append(keeper)
+
+    def notify(self) -> None:
+        """Wake an idle worker, call after enqueueing"""
+        with self._wakeup:
+            self._wakeup.notify()
+
+    def _idle(self) -> None:
+        wait = self.queue.seconds_until_available(self.agent)
+        wait = self.poll_interval if wait is None else min(wait, self.poll_interval)
+        with self._wakeup:
+            if not self._stopping.is_set():
+                self._wakeup.wait(timeout=max(wait, 0.05))
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = self.queue.lease(self.agent, self.lease_seconds)
+            except sqlite3.Error as e:
+                logger.error(f"Could not lease a job: {e}")
+                job = None
+            if job is None:
+                self._idle()
+                continue
+
+            with self._held_lock:
+                self._held[job.id] = job
+            try:
+                result = self.handler(job)
+                error = None if result else "Action reported failure"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            finally:
+                with self._held_lock:
+                    self._held.pop(job.id, None)
+
+            if error is not None:
+                if not self.queue.fail(job, error, self.retry_backoff):
+                    self._finished(job, False)
+            else:
+                # A lost lease still ends this run, the task must not stay in flight here
+                self.queue.complete(job)
+                self._finished(job, True)
+
+    def _finished(self, job: Job, success: bool) -> None:
+        if self.on_finished is not None:
+            try:
+                self.on_finished(job, success)
+            except Exception as e:
+                logger.error(f"Job {job.id} completion callback failed: {e}")
+
+    def _keep_leases(self) -> None:
+        """Renew the leases of running jobs, so only a dead worker lets its lease run out"""
+        while not self._stopping.wait(self.lease_seconds / 3):
+            with self._held_lock:
+                held = list(self._held.values())
+            for job in held:
+                try:
+                    self.queue.extend(job, self.lease_seconds)
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not renew the lease on job {job.id}: {e}")
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop leasing, running jobs finish (or are resumed on the next start if the process
+        exits first). Returns False if a worker was still busy when the timeout ran out
+        """
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0, deadline - time.monotonic()))
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        return not self._threads
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from src.helpers.cache import TTLCache
+from src.metrics import registry as metrics_registry
+
+logger = logging.getLogger("llm_cache")
+
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_DISK_BYTES = 64 * 2 ** 20
+# Responses are reused for a week, long enough for development and replay runs
+DEFAULT_TTL = 7 * 24 * 3600
+
+LOOKUPS = metrics_registry.counter("zerepy_llm_cache_lookups_total", "LLM response cache lookups by result", ("result",))
+
+
+def cache_key(provider: str, params: Dict[str, Any], system_prompt: str, prompt: str) -> str:
+    """
+    Content address of an LLM request
+
+    Args:
+        provider: Connection name, e.g. "openai"
+        params: Model and sampling parameters, usually the connection config
+    """
+    payload = json.dumps(
+        {"provider": provider, "params": params, "system": system_prompt, "prompt": prompt},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    One JSON file per entry under directory, named after its key. Reads refresh a file's
+    mtime, and the least recently used files are deleted once the directory grows past
+    max_bytes. Writes are atomic, so several processes can share the directory.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_DISK_BYTES, ttl: Optional[float] = DEFAULT_TTL):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> size in bytes, least recently used first. Built on first use
+        self._index: Optional["OrderedDict[str, int]"] = None
+        self._size = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        if self._index is None:
+            entries = []
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if not name.endswith(".json"):
+                        continue
+                    try:
+                        stat = os.stat(os.path.join(root, name))
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, name[:-5], stat.st_size))
+            self._index = OrderedDict((key, size) for _, key, size in sorted(entries))
+            self._size = sum(self._index.values())
+        return self._index
+
+    def _forget(self, key: str) -> None:
+        self._size -= self._index.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            index = self._load_index()
+            if self.ttl is not None and entry.get("created_at", 0) + self.ttl < time.time():
+                self._forget(key)
+                return None
+            if key in index:
+                index.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("response")
+
+    def set(self, key: str, response: str) -> None:
+        path = self._path(key)
+        data = json.dumps({"response": response, "created_at": time.time()}, ensure_ascii=False).encode("utf-8")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            index = self._load_index()
+            self._size += len(data) - index.pop(key, 0)
+            index[key] = len(data)
+            while self._size > self.max_bytes and len(index) > 1:
+                self._forget(next(iter(index)))
+
+    def clear(self) -> None:
+        with self._lock:
+            index = self._load_index()
+            for key in list(index):
+                self._forget(key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            index = self._load_index()
+            return {"entries": len(index), "bytes": self._size}
+
+
+class LLMCache:
+    """
+    Two tier cache of LLM responses keyed by cache_key(): an in-memory LRU in front of an
+    optional size bounded directory on disk. Disk hits are promoted to memory.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = DEFAULT_DISK_BYTES,
+        ttl: Optional[float] = DEFAULT_TTL
+    ):
+        self.configure(enabled, memory_entries, directory, max_disk_bytes, ttl)
+
+    def configure(
+        self,
+        enabled: bool = True,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = DEFAULT_DISK_BYTES,
+        ttl: Optional[float] = DEFAULT_TTL
+    ) -> None:
+        """Replace the tiers, dropping what the memory tier holds"""
+        self.enabled = enabled
+        self.ttl = ttl
+        self.memory = TTLCache(maxsize=memory_entries)
+        self.disk = DiskCache(directory, max_disk_bytes, ttl) if directory else None
+        if enabled:
+            logger.debug(f"LLM cache: {memory_entries} entries in memory" + (f", {max_disk_bytes} bytes in {directory}" if directory else ""))
+
+    def get(self, key: str) -> Optional[str]:
+        response = self.memory.get(key)
+        if response is not None:
+            LOOKUPS.labels(result="memory_hit").inc()
+            return response
+        if self.disk is not None:
+            response = self.disk.get(key)
+            if response is not None:
+                LOOKUPS.labels(result="disk_hit").inc()
+                self.memory.set(key, response, self._memory_ttl)
+                return response
+        LOOKUPS.labels(result="miss").inc()
+        return None
+
+    def set(self, key: str, response: str) -> None:
+        self.memory.set(key, response, self._memory_ttl)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, response)
+            except OSError as e:
+                logger.warning(f"Could not write LLM cache entry to {self.disk.directory}: {e}")
+
+    @property
+    def _memory_ttl(self) -> float:
+        return self.ttl if self.ttl is not None else float("inf")
+
+    def clear(self) -> None:
+        self.memory.invalidate()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {"enabled": self.enabled, "memory": self.memory.stats()}
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+
+def settings_from_env() -> Dict[str, Any]:
+    """LLMCache arguments from LLM_CACHE (on/off, off by default), LLM_CACHE_DIR and LLM_CACHE_MAX_MB"""
+    # Read from the environment so process pool workers pick the settings up too
+    return {
+        "enabled": os.getenv("LLM_CACHE", "off").lower() in ("1", "on", "true", "yes"),
+        "directory": os.getenv("LLM_CACHE_DIR") or None,
+        "max_disk_bytes": int(float(os.getenv("LLM_CACHE_MAX_MB", DEFAULT_DISK_BYTES / 2 ** 20)) * 2 ** 20)
+    }
+
+
+# Responses shared by every agent in the process
+llm_cache = LLMCache(**settings_from_env())
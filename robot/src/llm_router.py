@@ -0,0 +1,241 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.metrics import registry as metrics_registry
+from src.tracing import bind_context
+
+logger = logging.getLogger("llm_router")
+
+# Recent requests per provider the latency and error rate are computed over
+DEFAULT_WINDOW = 50
+# Latencies needed before a provider's quantile is trusted to trigger hedges
+DEFAULT_MIN_SAMPLES = 10
+DEFAULT_HEDGE_QUANTILE = 0.95
+# Never hedge sooner than this, short prompts would otherwise be sent twice all the time
+DEFAULT_MIN_HEDGE_DELAY = 1.0
+# Providers failing more often than this are only tried after the healthy ones
+DEFAULT_MAX_ERROR_RATE = 0.5
+
+# Agent llm_router options passed on to LLMRouter, next to providers and enabled
+ROUTER_SETTINGS = ("hedge", "hedge_quantile", "min_hedge_delay", "max_error_rate", "window", "min_samples")
+
+ROUTER_REQUESTS = metrics_registry.counter(
+    "zerepy_llm_router_requests_total",
+    "LLM router requests by provider and outcome (won, lost, error, hedged, empty)",
+    ("provider", "outcome")
+)
+
+
+def _close(chunks: Optional[Iterator[Any]]) -> None:
+    getattr(chunks, "close", lambda: None)()
+
+
+class ProviderStats:
+    """Latency and error rate over the last window requests of one provider"""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._outcomes = deque(maxlen=window)
+
+    def record(self, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self._outcomes.append(ok)
+            if ok:
+                self._latencies.append(seconds)
+
+    def quantile(self, q: float, min_samples: int = 1) -> Optional[float]:
+        with self._lock:
+            if len(self._latencies) < max(1, min_samples):
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = len(self._outcomes)
+        return {
+            "requests": requests,
+            "error_rate": round(self.error_rate(), 3),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95)
+        }
+
+
+class LLMRouter:
+    """
+    Sends generate-text to the first healthy provider in preference order. When it has
+    not answered within its recent p95 latency, a hedged duplicate goes to the next
+    provider and the first non-empty answer wins. Errors fail over to the next provider
+    right away. Requests go through ConnectionManager.call_action, so circuit breakers,
+    rate limits and action metrics apply per provider as usual.
+    """
+
+    def __init__(
+        self,
+        connection_manager,
+        providers: List[str],
+        hedge: bool = True,
+        hedge_quantile: float = DEFAULT_HEDGE_QUANTILE,
+        min_hedge_delay: float = DEFAULT_MIN_HEDGE_DELAY,
+        max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+        window: int = DEFAULT_WINDOW,
+        min_samples: int = DEFAULT_MIN_SAMPLES
+    ):
+        if not providers:
+            raise ValueError("LLMRouter needs at least one provider")
+        self.connection_manager = connection_manager
+        self.providers = list(providers)
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.min_hedge_delay = min_hedge_delay
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self.stats = {provider: ProviderStats(window) for provider in self.providers}
+        # Losing requests are left to finish in the background, their latency still counts
+        self._executor = ThreadPoolExecutor(
+            max_workers=4 * len(self.providers),
+            thread_name_prefix="llm-router"
+        )
+
+    def ranked(self) -> List[str]:
+        """Providers in the order they will be tried: healthy ones first, then preference order"""
+        return sorted(
+            self.providers,
+            key=lambda provider: self.stats[provider].error_rate() > self.max_error_rate
+        )
+
+    def hedge_delay(self, provider: str) -> Optional[float]:
+        """Seconds to wait on provider before hedging, None until enough latencies are known"""
+        if not self.hedge:
+            return None
+        latency = self.stats[provider].quantile(self.hedge_quantile, self.min_samples)
+        if latency is None:
+            return None
+        return max(latency, self.min_hedge_delay)
+
+    def _call(self, provider: str, prompt: str, system_prompt: str) -> Any:
+        started = time.monotonic()
+        try:
+            response = self.connection_manager.call_action(
+                connection_name=provider,
+                action_name="generate-text",
+                params=[prompt, system_prompt]
+            )
+        except Exception:
+            self.stats[provider].record(time.monotonic() - started, False)
+            raise
+        ok = isinstance(response, str) and bool(response)
+        self.stats[provider].record(time.monotonic() - started, ok)
+        if not ok:
+            raise ValueError(f"Empty response from {provider}")
+        return response
+
+    def generate(self, prompt: str, system_prompt: str) -> Optional[str]:
+        """First good answer across providers, None when every provider failed"""
+        candidates = self.ranked()
+        in_flight: Dict[Future, str] = {}
+
+        def launch() -> None:
+            provider = candidates.pop(0)
+            future = self._executor.submit(bind_context(self._call), provider, prompt, system_prompt)
+            in_flight[future] = provider
+
+        launch()
+        while in_flight:
+            # Only the newest request is hedged, once per provider left to try
+            newest = next(reversed(in_flight))
+            timeout = self.hedge_delay(in_flight[newest]) if candidates else None
+            done, _ = wait(list(in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                logger.info(f"{in_flight[newest]} is slower than usual, hedging with {candidates[0]}")
+                ROUTER_REQUESTS.labels(provider=in_flight[newest], outcome="hedged").inc()
+                launch()
+                continue
+
+            for future in done:
+                provider = in_flight.pop(future)
+                error = future.exception()
+                if error is None:
+                    ROUTER_REQUESTS.labels(provider=provider, outcome="won").inc()
+                    for loser in in_flight.values():
+                        ROUTER_REQUESTS.labels(provider=loser, outcome="lost").inc()
+                    return future.result()
+
+                ROUTER_REQUESTS.labels(provider=provider, outcome="error").inc()
+                logger.warning(f"LLM provider {provider} failed: {error}")
+                if candidates:
+                    launch()
+
+        logger.error("Every LLM provider failed")
+        return None
+
+    def stream(self, prompt: str, system_prompt: str) -> Iterator[str]:
+        """
+        Stream from the first provider that starts answering. Providers that fail before their
+        first chunk are skipped, once text has been yielded a failure is raised to the caller.
+        A provider whose stream ends without text answered, like for call_action, and is only
+        skipped. Streams are not hedged.
+
+        Raises:
+            Exception: The last provider's error when none of them could start a stream
+        """
+        last_error: Optional[BaseException] = None
+        for provider in self.ranked():
+            connection = self.connection_manager.connections.get(provider)
+            if connection is None or "generate-text-stream" not in connection.actions:
+                continue
+            started = time.monotonic()
+            chunks = None
+            try:
+                chunks = iter(self.connection_manager.call_action(
+                    connection_name=provider,
+                    action_name="generate-text-stream",
+                    params=[prompt, system_prompt]
+                ))
+                first = next((chunk for chunk in chunks if chunk), None)
+            except Exception as e:
+                _close(chunks)
+                self.stats[provider].record(time.monotonic() - started, False)
+                ROUTER_REQUESTS.labels(provider=provider, outcome="error").inc()
+                logger.warning(f"LLM provider {provider} failed to stream: {e}")
+                last_error = e
+                continue
+            if first is None:
+                self.stats[provider].record(time.monotonic() - started, True)
+                ROUTER_REQUESTS.labels(provider=provider, outcome="empty").inc()
+                logger.warning(f"LLM provider {provider} streamed an empty response")
+                last_error = ValueError(f"Empty response from {provider}")
+                continue
+
+            ROUTER_REQUESTS.labels(provider=provider, outcome="won").inc()
+            try:
+                yield first
+                for chunk in chunks:
+                    yield chunk
+            except Exception:
+                self.stats[provider].record(time.monotonic() - started, False)
+                raise
+            finally:
+                _close(chunks)
+            self.stats[provider].record(time.monotonic() - started, True)
+            return
+
+        raise last_error or ValueError("No LLM provider can stream")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {provider: self.stats[provider].snapshot() for provider in self.providers}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
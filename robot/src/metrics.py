@@ -0,0 +1,275 @@
+import logging
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("metrics")
+
+# Seconds, covers fast cache hits up to slow LLM generations
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def labels(self, **labels: str):
+        """Child metric for one combination of label values"""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {', '.join(self.labelnames)}")
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+            return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _Value:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            children = list(self._children.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}" for key, child in children]
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Sequence[float]):
+        self._lock = threading.Lock()
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[index] += 1
+                    break
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside the bucket, like histogram_quantile()"""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = q * self.count
+            seen = 0
+            lower = 0.0
+            for bound, count in zip(self.buckets, self.counts):
+                if count and seen + count >= rank:
+                    return lower + (bound - lower) * (rank - seen) / count
+                seen += count
+                lower = bound
+            # Above the last bucket, the best we can say is the largest finite bound
+            return self.buckets[-1]
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            children = list(self._children.items())
+        lines = []
+        for key, child in children:
+            with child._lock:
+                counts, total, count = list(child.counts), child.sum, child.count
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', _format_value(bound)))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', '+Inf'))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """All metrics of the process, rendered in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered with a different type or labels")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, description: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, description, labelnames))
+
+    def gauge(self, name: str, description: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, description, labelnames))
+
+    def histogram(self, name: str, description: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, description, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+    def write_file(self, path: str) -> None:
+        """Write the metrics atomically, for node_exporter's textfile collector or a sidecar"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+registry = MetricsRegistry()
+
+ACTION_CALLS = registry.counter(
+    "zerepy_action_calls_total",
+    "Connection actions performed, by outcome (success, error, rejected, cache_hit, cancelled)",
+    ("connection", "action", "outcome")
+)
+ACTION_DURATION = registry.histogram(
+    "zerepy_action_duration_seconds",
+    "Time spent performing connection actions",
+    ("connection", "action")
+)
+HTTP_REQUESTS = registry.counter(
+    "zerepy_http_requests_total",
+    "Outbound HTTP requests, by service and status code",
+    ("service", "method", "status")
+)
+HTTP_DURATION = registry.histogram(
+    "zerepy_http_request_duration_seconds",
+    "Latency of outbound HTTP requests",
+    ("service", "method")
+)
+
+
+def observe_action(connection: str, action: str, outcome: str, seconds: Optional[float] = None) -> None:
+    ACTION_CALLS.labels(connection=connection, action=action, outcome=outcome).inc()
+    if seconds is not None:
+        ACTION_DURATION.labels(connection=connection, action=action).observe(seconds)
+
+
+def observe_http(service: str, method: str, status: object, seconds: float) -> None:
+    """Record one outbound request, status is the HTTP code or an error name"""
+    HTTP_REQUESTS.labels(service=service, method=method.upper(), status=status).inc()
+    HTTP_DURATION.labels(service=service, method=method.upper()).observe(seconds)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def start_http_exporter(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve /metrics from a daemon thread, returns the server so callers can shut it down"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True).start()
+    logger.info(f"Serving Prometheus metrics on http://{host}:{server.server_port}/metrics")
+    return server
+
+
+def start_file_exporter(path: str, interval: float = 15) -> threading.Event:
+    """Rewrite path every interval seconds from a daemon thread, set the returned event to stop"""
+    stop = threading.Event()
+
+    def run():
+        while not stop.is_set():
+            try:
+                registry.write_file(path)
+            except OSError as e:
+                logger.warning(f"Could not write metrics to {path}: {e}")
+            stop.wait(interval)
+
+    threading.Thread(target=run, name="metrics-file-exporter", daemon=True).start()
+    return stop
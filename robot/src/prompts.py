@@ -22,4 +22,10 @@ POST_ECHOCHAMBER_PROMPT = ("Context:\n- Room Topic: {room_topic}\n- Tags: {tags}
                            "Task:\nCreate a concise, engaging message that:\n1. Aligns with the room's topic and tags\n2. Builds upon Previous Messages without repeating them, or repeating greetings, introductions, or sentences.\n"
                            "3. Offers fresh insights or perspectives\n4. Maintains a natural, conversational tone\n5. Keeps length between 2-4 sentences\n\nGuidelines:\n- Be specific and relevant\n- Add value to the ongoing discussion\n- Avoid generic statements\n- Use a friendly but professional tone\n- Include a question or discussion point when appropriate\n\n"
                            "The message should feel organic and contribute meaningfully to the conversation."
-                           )
\ No newline at end of file
+                           )
+
+
+#Pre-generation prompts
+BATCH_CANDIDATES_PROMPT = ("{prompt}\n\n"
+                           "Write {count} different candidates that follow the instructions above. Each one must stand on its own, "
+                           "and no two may share an opening, an idea or a phrasing. Answer with a JSON array of {count} strings and nothing else.")
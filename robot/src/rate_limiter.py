@@ -0,0 +1,199 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+logger = logging.getLogger("rate_limiter")
+
+# Longest a caller is delayed before acquire() gives up and raises
+DEFAULT_MAX_WAIT = 60
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a route has no budget left for longer than the caller is willing to wait"""
+
+    def __init__(self, route: str, retry_after: float):
+        super().__init__(f"Rate limit for '{route}' exhausted, retry in {retry_after:.0f}s")
+        self.route = route
+        self.retry_after = retry_after
+
+
+def scope_key(name: str, *credentials: Any) -> str:
+    """
+    Budget scope of one credential (API key, bot token, server), e.g. "discord@1a2b3c4d5e".
+    Agents with different credentials never block each other, secrets are only kept as a hash
+    """
+    digest = hashlib.sha1("\0".join(str(value) for value in credentials).encode()).hexdigest()[:10]
+    return f"{name}@{digest}"
+
+
+def route_key(scope: str, method: str, path: str, keep_ids: bool = False) -> str:
+    """
+    Route name used to track a budget, e.g. "twitter:GET /tweets/:id"
+
+    Args:
+        scope: Connection, or its scope_key, the budget belongs to
+        keep_ids: Keep numeric path segments, for APIs that budget per resource (Discord channels)
+    """
+    path = "/" + path.split("?", 1)[0].lstrip("/")
+    if not keep_ids:
+        path = _ID_SEGMENT.sub("/:id", path)
+    return f"{scope}:{method.upper()} {path}"
+
+
+def _header(headers: Mapping[str, str], *names: str) -> Optional[str]:
+    # requests returns case-insensitive headers, plain dicts are matched by hand
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            value = next((v for k, v in headers.items() if k.lower() == name.lower()), None)
+        if value is not None:
+            return value
+    return None
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+@dataclass
+class _Bucket:
+    """Token bucket refilled to limit at reset_at, as announced by the provider"""
+    limit: Optional[float] = None
+    remaining: Optional[float] = None
+    reset_at: float = 0.0
+    blocked_until: float = 0.0
+
+    def wait_time(self, now: float) -> float:
+        wait = max(0.0, self.blocked_until - now)
+        if self.remaining is not None and self.remaining <= 0 and self.reset_at > now:
+            wait = max(wait, self.reset_at - now)
+        return wait
+
+    def refill(self, now: float) -> None:
+        if self.reset_at and now >= self.reset_at and self.limit is not None:
+            self.remaining = self.limit
+            self.reset_at = 0.0
+
+
+class RateLimiter:
+    """
+    Shared rate limiter that learns per-route budgets from response headers
+    (x-rate-limit-*, X-RateLimit-*, Retry-After) and delays calls before the
+    provider answers with 429. Routes reporting the same X-RateLimit-Bucket share
+    one budget, and a global limit (or a bare Retry-After) blocks the whole scope.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, _Bucket] = {}
+        # Route -> provider bucket id, so routes sharing a bucket share a budget
+        self._aliases: Dict[str, str] = {}
+
+    def _bucket(self, key: str) -> _Bucket:
+        key = self._aliases.get(key, key)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket()
+        return bucket
+
+    @staticmethod
+    def _scope(route: str) -> str:
+        return route.split(":", 1)[0]
+
+    def acquire(self, route: str, max_wait: float = DEFAULT_MAX_WAIT) -> float:
+        """
+        Take one call from the route's budget, sleeping until the budget resets if needed.
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            RateLimitExceeded: If the wait would be longer than max_wait
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                bucket = self._bucket(route)
+                scope = self._buckets.get(self._scope(route))
+                bucket.refill(now)
+                wait = max(bucket.wait_time(now), scope.wait_time(now) if scope else 0.0)
+                if wait <= 0:
+                    if bucket.remaining is not None:
+                        bucket.remaining -= 1
+                    return waited
+            if waited + wait > max_wait:
+                raise RateLimitExceeded(route, wait)
+            logger.info(f"Rate limit budget for {route} exhausted, waiting {wait:.1f}s")
+            time.sleep(wait)
+            waited += wait
+
+    def update(self, route: str, headers: Mapping[str, str], status_code: int = 200) -> None:
+        """Learn the route's budget from a response"""
+        now = time.time()
+        monotonic_now = time.monotonic()
+
+        bucket_id = _header(headers, "X-RateLimit-Bucket")
+        limit = _number(_header(headers, "x-rate-limit-limit", "X-RateLimit-Limit"))
+        remaining = _number(_header(headers, "x-rate-limit-remaining", "X-RateLimit-Remaining"))
+        reset_after = _number(_header(headers, "X-RateLimit-Reset-After"))
+        reset = _number(_header(headers, "x-rate-limit-reset", "X-RateLimit-Reset"))
+        retry_after = _number(_header(headers, "Retry-After"))
+        is_global = (_header(headers, "X-RateLimit-Global") or "").lower() == "true" \
+            or (_header(headers, "X-RateLimit-Scope") or "").lower() == "global"
+
+        with self._lock:
+            if bucket_id:
+                self._aliases[route] = f"{self._scope(route)}:bucket:{bucket_id}"
+            bucket = self._bucket(route)
+
+            if limit is not None:
+                bucket.limit = limit
+            if remaining is not None:
+                bucket.remaining = remaining
+            if reset_after is not None:
+                bucket.reset_at = monotonic_now + reset_after
+            elif reset is not None:
+                # Epoch seconds, converted to the monotonic clock used for waiting
+                bucket.reset_at = monotonic_now + max(0.0, reset - now)
+
+            if status_code == 429:
+                delay = retry_after
+                if delay is None:
+                    delay = max(0.0, bucket.reset_at - monotonic_now) if bucket.reset_at else DEFAULT_MAX_WAIT
+                # Without any per-route budget information treat the limit as scope-wide
+                target = self._bucket(self._scope(route)) if is_global or (limit is None and remaining is None) else bucket
+                target.blocked_until = max(target.blocked_until, monotonic_now + delay)
+                logger.warning(f"Rate limited on {route}, blocking for {delay:.0f}s")
+
+    def retry_after(self, scope: str) -> float:
+        """Seconds until a scope-wide block (global limit or Retry-After) ends, used by the scheduler"""
+        with self._lock:
+            bucket = self._buckets.get(scope)
+            return bucket.wait_time(time.monotonic()) if bucket else 0.0
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Known budget per route or provider bucket"""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                key: {
+                    "limit": bucket.limit,
+                    "remaining": bucket.remaining,
+                    "reset_in": max(0.0, bucket.reset_at - now) if bucket.reset_at else None,
+                    "wait": bucket.wait_time(now)
+                }
+                for key, bucket in self._buckets.items()
+            }
+
+
+limiter = RateLimiter()
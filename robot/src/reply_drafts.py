@@ -0,0 +1,135 @@
+import logging
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.metrics import registry as metrics_registry
+
+logger = logging.getLogger("reply_drafts")
+
+DEFAULT_MAX_WORKERS = 2
+# Tweets at the front of the timeline that get a draft. like-tweet pops from the same
+# queue, so drafting all of them would pay for replies that are never posted
+DEFAULT_LOOKAHEAD = 5
+# Tweets older than this get no draft, the conversation has moved on
+DEFAULT_MAX_AGE = 600
+
+DRAFTS = metrics_registry.counter(
+    "zerepy_reply_drafts_total",
+    "Speculative reply drafts by outcome (used, missed, stale, discarded, failed)",
+    ("outcome",)
+)
+
+
+def tweet_time(tweet: Dict[str, Any]) -> Optional[float]:
+    """When a tweet was posted (the API v2 created_at field), None if it is missing or malformed"""
+    created_at = tweet.get("created_at")
+    if not isinstance(created_at, str):
+        return None
+    try:
+        return datetime.fromisoformat(created_at.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+class ReplyDrafter:
+    """
+    Generates replies in the background for the tweets at the front of the timeline,
+    so reply-to-tweet can post right away instead of waiting on the LLM.
+
+    generate(tweet) returns the reply text. sync() is called whenever the timeline may
+    have changed, take() hands the draft of a tweet to the reply action. Age is measured
+    from when the tweet was posted, or from when sync() first saw it if the tweet has no
+    created_at, so an old tweet is never served a draft just because the draft is new.
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[Dict[str, Any]], Optional[str]],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        lookahead: int = DEFAULT_LOOKAHEAD,
+        max_age: float = DEFAULT_MAX_AGE,
+        name: str = "reply-drafts",
+        clock: Callable[[], float] = time.time
+    ):
+        self.generate = generate
+        self.lookahead = lookahead
+        self.max_age = max_age
+        self.clock = clock
+        self._lock = threading.Lock()
+        # tweet id -> (draft, tweet posted or first seen at)
+        self._drafts: Dict[str, Tuple[Future, float]] = {}
+        # tweet id -> first seen at, for the queued tweets without created_at
+        self._seen: Dict[str, float] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix=name)
+
+    def _discard(self, tweet_id: str, outcome: str) -> None:
+        future, _ = self._drafts.pop(tweet_id)
+        future.cancel()
+        DRAFTS.labels(outcome=outcome).inc()
+
+    def sync(self, tweets: Optional[List[Dict[str, Any]]]) -> None:
+        """Draft the first lookahead tweets that are not too old, drop drafts of tweets no longer queued or too old"""
+        upcoming = [tweet for tweet in (tweets or []) if tweet.get("id")][:self.lookahead]
+        upcoming_ids = {str(tweet["id"]) for tweet in upcoming}
+        now = self.clock()
+        with self._lock:
+            # Kept across drafts, so a tweet whose draft went stale is not drafted again
+            queued_ids = {str(tweet["id"]) for tweet in (tweets or []) if tweet.get("id")}
+            self._seen = {tweet_id: self._seen.get(tweet_id, now) for tweet_id in queued_ids}
+            for tweet_id, (_, since) in list(self._drafts.items()):
+                if tweet_id not in upcoming_ids:
+                    self._discard(tweet_id, "discarded")
+                elif now - since > self.max_age:
+                    self._discard(tweet_id, "stale")
+            for tweet in upcoming:
+                tweet_id = str(tweet["id"])
+                if tweet_id in self._drafts:
+                    continue
+                since = tweet_time(tweet) or self._seen[tweet_id]
+                if now - since <= self.max_age:
+                    self._drafts[tweet_id] = (self._executor.submit(self.generate, tweet), since)
+
+    def take(self, tweet_id: Any, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        The draft reply to a tweet, waiting for it if it is still being generated.
+        None when there is no usable draft, the caller then generates the reply itself.
+        """
+        with self._lock:
+            entry = self._drafts.pop(str(tweet_id), None)
+        if entry is None:
+            DRAFTS.labels(outcome="missed").inc()
+            return None
+
+        future, since = entry
+        if self.clock() - since > self.max_age:
+            future.cancel()
+            DRAFTS.labels(outcome="stale").inc()
+            return None
+        try:
+            draft = future.result(timeout=timeout)
+        except CancelledError:
+            DRAFTS.labels(outcome="discarded").inc()
+            return None
+        except Exception as e:
+            logger.warning(f"Reply draft for tweet {tweet_id} failed: {e}")
+            DRAFTS.labels(outcome="failed").inc()
+            return None
+        if not draft:
+            DRAFTS.labels(outcome="failed").inc()
+            return None
+        DRAFTS.labels(outcome="used").inc()
+        return draft
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._drafts)
+
+    def close(self) -> None:
+        """Drop every draft, generation already underway finishes in the background"""
+        with self._lock:
+            for tweet_id in list(self._drafts):
+                self._discard(tweet_id, "discarded")
+        self._executor.shutdown(wait=False)
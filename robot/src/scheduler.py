@@ -0,0 +1,141 @@
+import heapq
+import itertools
+import logging
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("scheduler")
+
+DEFAULT_RETRY_DELAY = 60
+
+
+class TaskScheduler:
+    """
+    Keeps the next eligible time of every agent task in a priority queue.
+
+    Tasks with a non-positive weight are never scheduled. A task that has been
+    handed out is "in flight" and is not eligible again until complete() is
+    called for it, at which point it is rescheduled after its interval (or
+    after retry_delay if it did not succeed). Both intervals and min_gap are
+    measured from when a task completes, so a slow action is never followed
+    straight away by the next one.
+    """
+
+    def __init__(
+        self,
+        tasks: List[Dict[str, Any]],
+        intervals: Dict[str, float],
+        min_gap: float = 0,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        clock: Callable[[], float] = time.time
+    ):
+        self.tasks = {task["name"]: task for task in tasks if task.get("weight", 0) > 0}
+        self.intervals = intervals
+        self.min_gap = min_gap
+        self.retry_delay = retry_delay
+        self.clock = clock
+
+        self._heap = []
+        self._deadlines: Dict[str, Optional[float]] = {}
+        self._counter = itertools.count()
+        self._not_before = 0.0
+
+        now = self.clock()
+        for name in self.tasks:
+            self._schedule(name, now)
+
+    def _schedule(self, name: str, at: float) -> None:
+        self._deadlines[name] = at
+        heapq.heappush(self._heap, (at, next(self._counter), name))
+
+    def _prune(self) -> None:
+        """Drop heap entries that were superseded or are in flight"""
+        while self._heap:
+            at, _, name = self._heap[0]
+            if self._deadlines.get(name) == at:
+                return
+            heapq.heappop(self._heap)
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest time at which a task can be handed out, None if nothing is scheduled"""
+        self._prune()
+        if not self._heap:
+            return None
+        return max(self._heap[0][0], self._not_before)
+
+    def seconds_until_next(self) -> Optional[float]:
+        deadline = self.next_deadline()
+        if deadline is None:
+            return None
+        return max(0.0, deadline - self.clock())
+
+    def eligible(self) -> List[str]:
+        """Names of the tasks whose deadline has passed"""
+        now = self.clock()
+        if now < self._not_before:
+            return []
+        return [
+            name for name, at in self._deadlines.items()
+            if at is not None and at <= now
+        ]
+
+    def acquire(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        blocked_for: Optional[Callable[[str], float]] = None
+    ) -> Optional[str]:
+        """
+        Pick one eligible task by weight and mark it in flight.
+
+        Args:
+            weights: Per-task weight overrides (e.g. time based weights)
+            blocked_for: Optional callback returning how many seconds a task cannot run
+                for (e.g. its connection's circuit is open), 0 if it can run now
+
+        Returns:
+            The task name, or None if no task is currently eligible
+        """
+        candidates = self.eligible()
+        if blocked_for is not None:
+            blocked = {name: blocked_for(name) for name in candidates}
+            # Sleep through the block instead of spinning on a task that cannot run right now
+            for name, seconds in blocked.items():
+                if seconds > 0:
+                    self.defer(name, seconds)
+            candidates = [name for name in candidates if blocked[name] <= 0]
+
+        weights = weights or {}
+        weighted = [(name, weights.get(name, self.tasks[name].get("weight", 0))) for name in candidates]
+        for name, weight in weighted:
+            if weight <= 0:
+                self.defer(name, self.retry_delay)
+        weighted = [(name, weight) for name, weight in weighted if weight > 0]
+        if not weighted:
+            return None
+
+        candidates, candidate_weights = zip(*weighted)
+
+        name = random.choices(candidates, weights=candidate_weights, k=1)[0]
+        self._deadlines[name] = None
+        self._not_before = self.clock() + self.min_gap
+        return name
+
+    def complete(self, name: str, success: bool) -> None:
+        """Reschedule a task that was handed out by acquire()"""
+        if name not in self.tasks:
+            return
+        now = self.clock()
+        delay = self.intervals.get(name, 0) if success else self.retry_delay
+        self._schedule(name, now + delay)
+        self._not_before = max(self._not_before, now + self.min_gap)
+
+    def hold(self, name: str) -> None:
+        """Mark a task in flight without handing it out, e.g. while a job left over from a previous run finishes"""
+        if name in self.tasks:
+            self._deadlines[name] = None
+
+    def defer(self, name: str, seconds: float) -> None:
+        """Push a scheduled task back without running it"""
+        if name in self.tasks and self._deadlines.get(name) is not None:
+            self._schedule(name, self.clock() + seconds)
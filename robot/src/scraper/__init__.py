@@ -7,6 +7,7 @@ from http.cookiejar import CookieJar
 import http.cookiejar
 import requests
 from requests.utils import cookiejar_from_dict
+from src.http_client import http_client
 from typing import Union, Dict, TypedDict, Optional,Any
 import pyotp
 import time
@@ -86,7 +87,7 @@ class Scraper:
             return media_id
         else:
             # Handle image upload
-            response = requests.post(upload_url, headers=headers, files={'media': media_data})
+            response = http_client.post(upload_url, headers=headers, files={'media': media_data})
 
             if response.status_code != 200:
                 raise Exception(response.text)
@@ -103,7 +104,7 @@ class Scraper:
             'total_bytes': str(len(media_data)),
         }
 
-        init_response = requests.post(upload_url, headers=headers, params=init_params)
+        init_response = http_client.post(upload_url, headers=headers, params=init_params)
 
         if init_response.status_code != 200:
             raise Exception(init_response.text)
@@ -124,7 +125,7 @@ class Scraper:
                 'media': chunk,
             }
 
-            append_response = requests.post(upload_url, headers=headers, files=append_form)
+            append_response = http_client.post(upload_url, headers=headers, files=append_form)
 
             if append_response.status_code != 200:
                 raise Exception(append_response.text)
@@ -137,7 +138,7 @@ class Scraper:
             'media_id': media_id,
         }
 
-        finalize_response = requests.post(upload_url, headers=headers, params=finalize_params)
+        finalize_response = http_client.post(upload_url, headers=headers, params=finalize_params)
 
         if finalize_response.status_code != 200:
             raise Exception(finalize_response.text)
@@ -161,7 +162,7 @@ class Scraper:
                 'media_id': media_id,
             }
 
-            status_response = requests.get(f'{upload_url}?{status_params}', headers=headers)
+            status_response = http_client.get(f'{upload_url}?{status_params}', headers=headers)
 
             if status_response.status_code != 200:
                 raise Exception(status_response.text)
@@ -256,7 +257,7 @@ class Scraper:
             'fieldToggles': {},
         }
 
-        response = requests.post(
+        response = http_client.post(
             'https://twitter.com/i/api/graphql/a1p9RWpkYKBjWv_I3WzS-A/CreateTweet',
             headers=headers,
             data=json.dumps(payload),
@@ -300,7 +301,7 @@ class TwitterGuestAuth:
         Fetches a guest token required for making unauthenticated API requests.
         """
         url = "https://api.twitter.com/1.1/guest/activate.json"
-        response = requests.post(url, headers=self.headers, cookies=self.cookie_jar)
+        response = http_client.post(url, headers=self.headers, cookies=self.cookie_jar)
 
         self.update_cookie_jar(self.cookie_jar,response.headers)
 
@@ -402,7 +403,7 @@ class TwitterGuestAuth:
             "fieldToggles": {}
         }
 
-        response = requests.post(url, headers=self.headers, json=payload)
+        response = http_client.post(url, headers=self.headers, json=payload)
 
         if response.status_code == 200:
             return response.json()
@@ -428,7 +429,7 @@ class TwitterGuestAuth:
         Extracts CSRF token from cookies.
         """
         url = "https://api.twitter.com/1.1/onboarding/task.json"
-        response = requests.get(url, headers=self.headers)
+        response = http_client.get(url, headers=self.headers)
 
         if response.status_code == 200:
             cookies = response.cookies
@@ -649,7 +650,7 @@ class TwitterUserAuth(TwitterGuestAuth):
 
         self.install_csrf_token(headers)
 
-        response = requests.post(
+        response = http_client.post(
             onboarding_task_url, headers=headers, json=data
         )
 
@@ -0,0 +1,284 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from src.metrics import registry as metrics_registry
+
+logger = logging.getLogger("supervisor")
+
+AGENT_STATES = metrics_registry.gauge("zerepy_supervisor_agents", "Supervised agents by state", ("state",))
+AGENT_RESTARTS = metrics_registry.counter("zerepy_supervisor_restarts_total", "Agent restarts after a crash", ("agent",))
+
+POOL_MODES = ("thread", "process")
+
+
+def list_agent_names(agents_dir: str = "agents") -> List[str]:
+    """Every agent JSON file in agents_dir, except the CLI defaults file"""
+    return sorted(
+        path.stem for path in Path(agents_dir).glob("*.json")
+        if path.stem != "general"
+    )
+
+
+def run_agent(agent_name: str, stop_event, trace_file: Optional[str] = None, agents_dir: str = "agents") -> None:
+    """Pool entry point: load an agent and run its loop until stop_event is set"""
+    # Imported here so that process pool workers load the agent stack themselves
+    from src.agent import ZerePyAgent
+    from src import tracing
+
+    if trace_file and not tracing.is_enabled():
+        # One file per worker process, concurrent appends from several processes could interleave
+        tracing.configure_tracing(f"{trace_file}.{os.getpid()}", service_name=f"zerepy-{agent_name}")
+
+    agent = ZerePyAgent(agent_name, stop_event=stop_event, agents_dir=agents_dir)
+    try:
+        agent.loop(countdown=False)
+    finally:
+        agent.connection_manager.close()
+
+
+@dataclass
+class AgentStatus:
+    """Supervisor view of one agent"""
+    name: str
+    state: str = "pending"
+    restarts: int = 0
+    started_at: Optional[float] = None
+    last_exit_at: Optional[float] = None
+    last_error: Optional[str] = None
+    restart_at: Optional[float] = None
+    future: Optional[Future] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "restarts": self.restarts,
+            "started_at": self.started_at,
+            "last_exit_at": self.last_exit_at,
+            "last_error": self.last_error,
+            "restart_at": self.restart_at
+        }
+
+
+class AgentSupervisor:
+    """
+    Runs many ZerePy agents in a thread pool, or in one process each with at most
+    max_workers processes alive at once.
+
+    Agents whose loop crashes (or returns while the supervisor is still running)
+    are restarted with capped exponential backoff. After max_restarts consecutive
+    failures an agent is marked failed and left alone.
+    """
+
+    def __init__(
+        self,
+        agent_names: List[str],
+        mode: str = "thread",
+        max_workers: Optional[int] = None,
+        max_restarts: int = 5,
+        restart_backoff: float = 5,
+        max_backoff: float = 300,
+        healthy_after: float = 600,
+        trace_file: Optional[str] = None,
+        agents_dir: str = "agents"
+    ):
+        if mode not in POOL_MODES:
+            raise ValueError(f"Unknown pool mode '{mode}', expected one of {', '.join(POOL_MODES)}")
+        if not agent_names:
+            raise ValueError("No agents to supervise")
+
+        self.mode = mode
+        # Every agent holds a worker for as long as it runs
+        self.max_workers = max_workers or len(agent_names)
+        self.max_restarts = max_restarts
+        self.restart_backoff = restart_backoff
+        self.max_backoff = max_backoff
+        self.healthy_after = healthy_after
+        # Thread mode agents share the tracing set up by the caller, process workers open their own file
+        self.trace_file = trace_file if mode == "process" else None
+        self.agents_dir = agents_dir
+
+        self.agents: Dict[str, AgentStatus] = {name: AgentStatus(name=name) for name in agent_names}
+        # Re-entrant: done callbacks run inline when a future finishes before add_done_callback
+        self._lock = threading.RLock()
+        self._executor = None
+        self._manager = None
+        self._stop_event = None
+        self._processes: Dict[str, multiprocessing.Process] = {}
+        self._running = False
+
+    def start(self) -> None:
+        if self._running:
+            return
+
+        if self.mode == "process":
+            # Workers cannot share a threading.Event, hand them a manager proxy instead
+            self._manager = multiprocessing.Manager()
+            self._stop_event = self._manager.Event()
+        else:
+            self._stop_event = threading.Event()
+        # In process mode each pool thread starts and watches one agent process, the pool caps how many run
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="agent")
+
+        self._running = True
+        logger.info(f"Starting {len(self.agents)} agents in a {self.mode} pool of {self.max_workers} workers")
+        with self._lock:
+            for status in self.agents.values():
+                self._launch(status)
+
+    def _run_in_process(self, name: str) -> None:
+        """
+        Process mode worker: run one agent in its own process and wait for it. A process that
+        dies abruptly (OOM, segfault, os._exit) only takes its own agent down, which a shared
+        ProcessPoolExecutor would not allow.
+        """
+        process = multiprocessing.Process(
+            target=run_agent,
+            args=(name, self._stop_event, self.trace_file, self.agents_dir),
+            name=f"agent-{name}",
+            daemon=True
+        )
+        process.start()
+        with self._lock:
+            self._processes[name] = process
+        try:
+            process.join()
+        finally:
+            with self._lock:
+                self._processes.pop(name, None)
+        if process.exitcode != 0:
+            raise RuntimeError(f"agent process exited with code {process.exitcode}")
+
+    def _launch(self, status: AgentStatus) -> None:
+        # Queued until a pool worker picks it up, agents beyond max_workers wait for a free one
+        status.state = "queued"
+        status.started_at = None
+        status.restart_at = None
+        if self.mode == "process":
+            status.future = self._executor.submit(self._run_in_process, status.name)
+        else:
+            status.future = self._executor.submit(run_agent, status.name, self._stop_event, self.trace_file, self.agents_dir)
+        status.future.add_done_callback(lambda future, name=status.name: self._on_exit(name, future))
+
+    def _refresh_started(self) -> None:
+        """Mark queued agents whose future a worker has picked up as running"""
+        for status in self.agents.values():
+            if status.state == "queued" and status.future is not None and status.future.running():
+                status.state = "running"
+                status.started_at = time.time()
+
+    def _on_exit(self, name: str, future: Future) -> None:
+        with self._lock:
+            status = self.agents[name]
+            if status.future is not future:
+                return
+            status.future = None
+            status.last_exit_at = time.time()
+
+            if not self._running:
+                status.state = "stopped"
+                return
+
+            error = None if future.cancelled() else future.exception()
+            status.last_error = repr(error) if error else "agent loop exited"
+            logger.error(f"Agent {name} exited: {status.last_error}")
+
+            # A long healthy run resets the backoff
+            if status.started_at and status.last_exit_at - status.started_at >= self.healthy_after:
+                status.restarts = 0
+
+            if status.restarts >= self.max_restarts:
+                status.state = "failed"
+                logger.error(f"Agent {name} failed {status.restarts} restarts in a row, giving up")
+                return
+
+            delay = min(self.max_backoff, self.restart_backoff * (2 ** status.restarts))
+            status.restarts += 1
+            AGENT_RESTARTS.labels(agent=name).inc()
+            status.state = "backoff"
+            status.restart_at = time.time() + delay
+            logger.info(f"Restarting agent {name} in {delay:.0f} seconds (restart {status.restarts}/{self.max_restarts})")
+
+    def poll(self) -> None:
+        """Relaunch agents whose backoff has elapsed"""
+        now = time.time()
+        with self._lock:
+            if not self._running:
+                return
+            self._refresh_started()
+            for status in self.agents.values():
+                if status.state == "backoff" and status.restart_at <= now:
+                    self._launch(status)
+
+    def status(self) -> Dict[str, Any]:
+        """Aggregate status of the fleet"""
+        with self._lock:
+            if self._running:
+                self._refresh_started()
+            agents = {name: status.to_dict() for name, status in self.agents.items()}
+        states = {}
+        for agent in agents.values():
+            states[agent["state"]] = states.get(agent["state"], 0) + 1
+        for state in ("pending", "queued", "running", "backoff", "failed", "stopped"):
+            AGENT_STATES.labels(state=state).set(states.get(state, 0))
+        return {
+            "mode": self.mode,
+            "workers": self.max_workers,
+            "total": len(agents),
+            "states": states,
+            "agents": agents
+        }
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Signal every agent to stop and wait for the pool to drain"""
+        if not self._running:
+            return
+        logger.info("Stopping all agents...")
+        with self._lock:
+            self._running = False
+            for status in self.agents.values():
+                if status.state in ("backoff", "pending", "queued"):
+                    status.state = "stopped"
+        self._stop_event.set()
+
+        self._executor.shutdown(wait=timeout is None, cancel_futures=True)
+        if timeout is not None:
+            deadline = time.time() + timeout
+            for status in list(self.agents.values()):
+                future = status.future
+                if future is not None:
+                    try:
+                        future.exception(timeout=max(0, deadline - time.time()))
+                    except Exception:
+                        logger.warning(f"Agent {status.name} did not stop within {timeout} seconds")
+            with self._lock:
+                stuck = list(self._processes.values())
+            for process in stuck:
+                process.terminate()
+
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    def run_forever(self, poll_interval: float = 1, status_interval: float = 60) -> None:
+        """Start the fleet and supervise it until interrupted"""
+        self.start()
+        last_report = 0.0
+        try:
+            while True:
+                self.poll()
+                if status_interval and time.time() - last_report >= status_interval:
+                    summary = self.status()
+                    states = ", ".join(f"{state}={count}" for state, count in sorted(summary["states"].items()))
+                    logger.info(f"Fleet status: {summary['total']} agents ({states})")
+                    last_report = time.time()
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            logger.info("\n🛑 Supervisor stopped by user.")
+        finally:
+            self.stop()
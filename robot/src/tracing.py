@@ -0,0 +1,215 @@
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger("tracing")
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    kind: int = SPAN_KIND_INTERNAL
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status_code: int = STATUS_OK
+    status_message: str = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.status_code = STATUS_ERROR
+        self.status_message = f"{type(error).__name__}: {error}"
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Seconds, None while the span is open"""
+        return None if self.end_ns is None else (self.end_ns - self.start_ns) / 1e9
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items() if value is not None],
+            "status": {"code": self.status_code}
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        # OTLP/JSON encodes 64 bit integers as strings
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+class JsonlSpanExporter:
+    """
+    Appends finished spans to a file, one OTLP/JSON ExportTraceServiceRequest per line.
+    This is the format the OpenTelemetry collector's file exporter writes and its
+    otlpjsonfile receiver (and Jaeger/Tempo through it) reads.
+    """
+
+    def __init__(self, path: str, service_name: str = "zerepy"):
+        self.path = path
+        self.resource = {
+            "attributes": [
+                _otlp_attribute("service.name", service_name),
+                _otlp_attribute("process.pid", os.getpid())
+            ]
+        }
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, spans: List[Span]) -> None:
+        line = json.dumps({
+            "resourceSpans": [{
+                "resource": self.resource,
+                "scopeSpans": [{
+                    "scope": {"name": "zerepy"},
+                    "spans": [span.to_otlp() for span in spans]
+                }]
+            }]
+        }, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+_exporter: Optional[JsonlSpanExporter] = None
+
+
+def configure_tracing(path: Optional[str], service_name: str = "zerepy") -> None:
+    """Export spans to path, or turn tracing off with None"""
+    global _exporter
+    previous, _exporter = _exporter, (JsonlSpanExporter(path, service_name) if path else None)
+    if previous is not None:
+        previous.close()
+    if path:
+        logger.info(f"Writing trace spans to {path}")
+
+
+def set_exporter(exporter: Optional[Any]) -> Optional[Any]:
+    """Install any object with export(spans) and close() (e.g. an in-memory collector), returns the previous one"""
+    global _exporter
+    previous, _exporter = _exporter, exporter
+    return previous
+
+
+def is_enabled() -> bool:
+    return _exporter is not None
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def start_span(name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any) -> Optional[Span]:
+    """
+    Open a child of the current span without making it current, None when tracing is off.
+    For work that ends somewhere else than it started (e.g. a stream), end it with end_span().
+    """
+    if _exporter is None:
+        return None
+    parent = _current_span.get()
+    return Span(
+        name=name,
+        trace_id=parent.trace_id if parent else os.urandom(16).hex(),
+        span_id=os.urandom(8).hex(),
+        parent_span_id=parent.span_id if parent else None,
+        kind=kind,
+        attributes=attributes
+    )
+
+
+def end_span(current: Optional[Span], error: Optional[BaseException] = None) -> None:
+    if current is None:
+        return
+    if error is not None:
+        current.record_error(error)
+    current.end_ns = time.time_ns()
+    exporter = _exporter
+    if exporter is None:
+        return
+    try:
+        exporter.export([current])
+    except (OSError, ValueError) as e:
+        logger.debug(f"Could not export span {current.name}: {e}")
+
+
+@contextmanager
+def use_span(current: Optional[Span]) -> Iterator[Optional[Span]]:
+    """Make a span the parent of the spans opened in the block, without ending it"""
+    if current is None:
+        yield None
+        return
+    token = _current_span.set(current)
+    try:
+        yield current
+    finally:
+        _current_span.reset(token)
+
+
+@contextmanager
+def span(name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Time a block as a child of the current span. Yields None when tracing is off,
+    so instrumented code costs one check unless spans are exported.
+    """
+    current = start_span(name, kind, **attributes)
+    if current is None:
+        yield None
+        return
+
+    error = None
+    try:
+        with use_span(current):
+            yield current
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        end_span(current, error)
+
+
+def bind_context(func: Callable) -> Callable:
+    """Carry the current span into a thread pool worker, executors do not copy contextvars"""
+    context = contextvars.copy_context()
+    return functools.partial(context.run, func)
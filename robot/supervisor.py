@@ -0,0 +1,71 @@
+import argparse
+import json
+import logging
+import os
+
+from src.supervisor import AgentSupervisor, POOL_MODES, list_agent_names
+from src.metrics import start_http_exporter, start_file_exporter
+from src.tracing import configure_tracing
+from src.http_client import http_client, parse_timeout
+from src.llm_cache import llm_cache, settings_from_env
+
+logging.basicConfig(level=logging.INFO, format='[%(processName)s/%(threadName)s] %(message)s')
+logger = logging.getLogger("supervisor")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fleet of ZerePy agents headless")
+    parser.add_argument("agents", nargs="*", help="Agent names from agents/ (default: all of them)")
+    parser.add_argument("--mode", choices=POOL_MODES, default="thread", help="Run each agent in a thread or in its own process")
+    parser.add_argument("--workers", type=int, default=None, help="Agents running at once, the rest are queued (default: all of them)")
+    parser.add_argument("--max-restarts", type=int, default=5, help="Consecutive restarts before an agent is marked failed")
+    parser.add_argument("--restart-backoff", type=float, default=5, help="Initial restart delay in seconds, doubled on every restart")
+    parser.add_argument("--status-interval", type=float, default=60, help="Seconds between fleet status reports")
+    parser.add_argument("--status", action="store_true", help="Print the initial fleet status as JSON and exit")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Serve Prometheus metrics on this local port")
+    parser.add_argument("--metrics-file", default=None, help="Write Prometheus metrics to this file every 15 seconds")
+    parser.add_argument("--http-timeout", default=None, help="Default timeout of outbound HTTP requests, 'seconds' or 'connect,read' (default: 5,30)")
+    parser.add_argument("--llm-cache", action="store_true", help="Answer repeated LLM prompts from a cache (default: off)")
+    parser.add_argument("--llm-cache-dir", default=None, help="Turn the LLM cache on and persist it in this directory (default: memory only)")
+    parser.add_argument("--trace-file", default=None, help="Append OTLP/JSON trace spans to this file (one file per worker in process mode)")
+    args = parser.parse_args()
+
+    if args.http_timeout:
+        http_client.configure(timeout=parse_timeout(args.http_timeout))
+        # Inherited by process pool workers, which build their own client
+        os.environ["HTTP_TIMEOUT"] = args.http_timeout
+
+    if args.llm_cache or args.llm_cache_dir:
+        # Through the environment, so agent processes build the same cache
+        os.environ["LLM_CACHE"] = "on"
+        if args.llm_cache_dir:
+            os.environ["LLM_CACHE_DIR"] = args.llm_cache_dir
+        llm_cache.configure(**settings_from_env())
+
+    agent_names = args.agents or list_agent_names()
+    supervisor = AgentSupervisor(
+        agent_names,
+        mode=args.mode,
+        max_workers=args.workers,
+        max_restarts=args.max_restarts,
+        restart_backoff=args.restart_backoff,
+        trace_file=args.trace_file
+    )
+
+    if args.status:
+        print(json.dumps(supervisor.status(), indent=2))
+        return
+
+    # Agents in process mode record metrics in their own worker processes, use thread mode to export them here
+    if args.metrics_port is not None:
+        start_http_exporter(args.metrics_port)
+    if args.metrics_file:
+        start_file_exporter(args.metrics_file)
+    if args.trace_file and args.mode == "thread":
+        configure_tracing(args.trace_file)
+
+    supervisor.run_forever(status_interval=args.status_interval)
+
+
+if __name__ == "__main__":
+    main()
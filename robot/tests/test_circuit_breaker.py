@@ -0,0 +1,75 @@
+import time
+
+from src.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakerRegistry
+
+
+def make_breaker(**kwargs) -> CircuitBreaker:
+    settings = {"failure_threshold": 2, "backoff": 0.05, "max_backoff": 1, "jitter": 0}
+    settings.update(kwargs)
+    return CircuitBreaker("test", **settings)
+
+
+def trip(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow()
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures():
+    breaker = make_breaker()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert 0 < breaker.retry_after() <= 0.05
+
+
+def test_success_resets_the_failure_count():
+    breaker = make_breaker()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_lets_one_trial_through_and_closes_on_success():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens_with_a_longer_backoff():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.retry_after() > 0.05
+
+
+def test_cancel_gives_back_the_trial():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.cancel()
+    assert breaker.allow()
+
+
+def test_registry_keeps_the_settings_of_the_first_use():
+    registry = CircuitBreakerRegistry()
+    breaker = registry.get("twitter@abc", {"failure_threshold": 1})
+    assert registry.get("twitter@abc") is breaker
+    assert registry.retry_after("never-used") == 0.0
+    breaker.record_failure()
+    assert registry.retry_after("twitter@abc") > 0
@@ -0,0 +1,51 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROBOT_DIR = Path(__file__).resolve().parent.parent
+
+# Cumulative microseconds src.connection_manager may take to import, override with
+# IMPORT_TIME_BUDGET_US on slow machines. It takes well under 0.1s when nothing heavy is loaded
+BUDGET_US = int(os.getenv("IMPORT_TIME_BUDGET_US", 500_000))
+
+# SDKs that must only be imported by the connections that use them
+HEAVY_MODULES = (
+    "web3", "solana", "solders", "jupiter_python_sdk", "anthropic", "openai",
+    "farcaster", "goat", "allora_sdk", "tweepy", "discord", "requests_oauthlib"
+)
+
+
+def importtime(module: str) -> dict:
+    """module -> cumulative import time in microseconds, from a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROBOT_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        pytest.skip(f"{module} cannot be imported here: {result.stderr.strip().splitlines()[-1]}")
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|(\s*)(\S+)", line)
+        if match:
+            times[match.group(3)] = int(match.group(1))
+    return times
+
+
+def test_connection_manager_does_not_import_connection_sdks():
+    loaded = importtime("src.connection_manager")
+    heavy = sorted(name for name in loaded if name.split(".")[0] in HEAVY_MODULES)
+    assert not heavy, f"src.connection_manager imports {', '.join(heavy)} eagerly"
+    connections = sorted(name for name in loaded if name.startswith("src.connections.") and name != "src.connections.base_connection")
+    assert not connections, f"src.connection_manager imports {', '.join(connections)} eagerly"
+
+
+def test_connection_manager_import_budget():
+    loaded = importtime("src.connection_manager")
+    assert loaded["src.connection_manager"] <= BUDGET_US, (
+        f"importing src.connection_manager took {loaded['src.connection_manager'] / 1000:.0f}ms, "
+        f"budget is {BUDGET_US / 1000:.0f}ms"
+    )
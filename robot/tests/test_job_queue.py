@@ -0,0 +1,134 @@
+import threading
+
+import pytest
+
+from src.job_queue import DONE, FAILED, LEASED, PENDING, JobQueue, JobWorkerPool
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"), clock=clock)
+    yield queue
+    queue.close()
+
+
+def test_leased_job_is_not_leased_twice(queue):
+    queue.enqueue("agent", "post-tweet")
+    assert queue.lease("agent", lease_seconds=10) is not None
+    assert queue.lease("agent", lease_seconds=10) is None
+
+
+def test_expired_lease_is_leased_again(queue, clock):
+    job_id = queue.enqueue("agent", "post-tweet")
+    first = queue.lease("agent", lease_seconds=10)
+    clock.now += 11
+    second = queue.lease("agent", lease_seconds=10)
+    assert second.id == job_id and second.attempts == 2
+    # The first worker lost its lease and cannot finish the job any more
+    assert not queue.complete(first)
+    assert queue.complete(second)
+    assert queue.stats("agent") == {DONE: 1}
+
+
+def test_extend_keeps_the_lease(queue, clock):
+    queue.enqueue("agent", "post-tweet")
+    job = queue.lease("agent", lease_seconds=10)
+    clock.now += 8
+    assert queue.extend(job, lease_seconds=10)
+    clock.now += 8
+    assert queue.lease("agent") is None
+
+
+def test_higher_priority_is_leased_first(queue):
+    queue.enqueue("agent", "like-tweet")
+    queue.enqueue("agent", "post-tweet", priority=5)
+    assert queue.lease("agent").task == "post-tweet"
+
+
+def test_retry_backoff_doubles(queue, clock):
+    queue.enqueue("agent", "post-tweet", max_attempts=3)
+    job = queue.lease("agent")
+    assert queue.fail(job, "boom", backoff=5)
+    assert queue.seconds_until_available("agent") == 5
+    assert queue.lease("agent") is None
+
+    clock.now += 5
+    job = queue.lease("agent")
+    assert queue.fail(job, "boom", backoff=5)
+    assert queue.seconds_until_available("agent") == 10
+
+    clock.now += 10
+    job = queue.lease("agent")
+    assert not queue.fail(job, "boom", backoff=5)
+    assert queue.stats("agent") == {FAILED: 1}
+
+
+def test_checkpoint_survives_a_retry(queue, clock):
+    queue.enqueue("agent", "post-tweet")
+    job = queue.lease("agent")
+    job.checkpoint(tweet_text="hello")
+    queue.fail(job, "post failed", backoff=0)
+    assert queue.lease("agent").state == {"tweet_text": "hello"}
+
+
+def test_recover_only_takes_expired_leases(queue, clock):
+    queue.enqueue("agent", "post-tweet")
+    queue.enqueue("agent", "like-tweet")
+    queue.lease("agent", lease_seconds=10)
+    clock.now += 5
+    queue.lease("agent", lease_seconds=10)
+    clock.now += 6
+    assert queue.recover("agent") == 1
+    assert queue.stats("agent") == {LEASED: 1, PENDING: 1}
+
+
+def run_pool(queue, handler):
+    finished = []
+    done = threading.Event()
+
+    def on_finished(job, success):
+        finished.append((job.task, success))
+        done.set()
+
+    pool = JobWorkerPool(queue, "agent", handler, on_finished, poll_interval=0.05, retry_backoff=0)
+    pool.start()
+    try:
+        assert done.wait(5)
+    finally:
+        pool.stop(timeout=5)
+    return finished
+
+
+def test_falsy_result_fails_the_job(queue):
+    queue.enqueue("agent", "post-tweet", max_attempts=1)
+    assert run_pool(queue, lambda job: None) == [("post-tweet", False)]
+    assert queue.stats("agent") == {FAILED: 1}
+
+
+def test_truthy_result_completes_the_job(queue):
+    queue.enqueue("agent", "post-tweet")
+    assert run_pool(queue, lambda job: True) == [("post-tweet", True)]
+    assert queue.stats("agent") == {DONE: 1}
+
+
+def test_lost_lease_still_finishes_the_task(queue):
+    queue.enqueue("agent", "post-tweet")
+
+    def handler(job):
+        job.lease_token = "taken over"
+        return True
+
+    assert run_pool(queue, handler) == [("post-tweet", True)]
@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+from src.llm_router import LLMRouter
+
+
+class FakeManager:
+    """call_action answered by one function per provider"""
+
+    def __init__(self, **providers):
+        self.providers = providers
+        self.calls = []
+
+    def call_action(self, connection_name, action_name, params):
+        self.calls.append(connection_name)
+        return self.providers[connection_name](*params)
+
+
+def fail(prompt, system_prompt):
+    raise RuntimeError("provider down")
+
+
+@pytest.fixture
+def make_router():
+    routers = []
+
+    def make(manager, providers, **settings):
+        router = LLMRouter(manager, providers, **settings)
+        routers.append(router)
+        return router
+
+    yield make
+    for router in routers:
+        router.close()
+
+
+def test_uses_the_preferred_provider(make_router):
+    manager = FakeManager(a=lambda p, s: "from a", b=lambda p, s: "from b")
+    assert make_router(manager, ["a", "b"]).generate("hi", "sys") == "from a"
+    assert manager.calls == ["a"]
+
+
+def test_fails_over_on_error_and_empty_answer(make_router):
+    manager = FakeManager(a=fail, b=lambda p, s: "", c=lambda p, s: "from c")
+    router = make_router(manager, ["a", "b", "c"])
+    assert router.generate("hi", "sys") == "from c"
+    assert manager.calls == ["a", "b", "c"]
+    assert router.snapshot()["a"]["error_rate"] == 1.0
+
+
+def test_returns_none_when_every_provider_fails(make_router):
+    router = make_router(FakeManager(a=fail, b=fail), ["a", "b"])
+    assert router.generate("hi", "sys") is None
+
+
+def test_unhealthy_provider_drops_to_the_back(make_router):
+    router = make_router(FakeManager(), ["a", "b"], max_error_rate=0.5)
+    for _ in range(3):
+        router.stats["a"].record(1.0, False)
+    assert router.ranked() == ["b", "a"]
+
+
+def test_no_hedge_until_enough_samples(make_router):
+    router = make_router(FakeManager(), ["a", "b"], min_samples=3, min_hedge_delay=0.01)
+    router.stats["a"].record(0.5, True)
+    assert router.hedge_delay("a") is None
+    router.stats["a"].record(0.5, True)
+    router.stats["a"].record(0.5, True)
+    assert router.hedge_delay("a") == 0.5
+
+
+def test_slow_provider_is_hedged(make_router):
+    release = threading.Event()
+
+    def slow(prompt, system_prompt):
+        release.wait(5)
+        return "from a"
+
+    manager = FakeManager(a=slow, b=lambda p, s: "from b")
+    router = make_router(manager, ["a", "b"], min_samples=1, min_hedge_delay=0.05)
+    router.stats["a"].record(0.01, True)
+    started = time.monotonic()
+    try:
+        assert router.generate("hi", "sys") == "from b"
+    finally:
+        release.set()
+    assert time.monotonic() - started < 1
+    assert manager.calls == ["a", "b"]
+
+
+def test_hedging_can_be_turned_off(make_router):
+    router = make_router(FakeManager(), ["a", "b"], hedge=False, min_samples=1)
+    router.stats["a"].record(0.01, True)
+    assert router.hedge_delay("a") is None
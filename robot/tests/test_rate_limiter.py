@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from src.rate_limiter import RateLimiter, RateLimitExceeded, route_key, scope_key
+
+
+def test_route_key_collapses_ids_unless_kept():
+    assert route_key("twitter", "get", "/tweets/123?x=1") == "twitter:GET /tweets/:id"
+    assert route_key("discord", "post", "channels/42/messages", keep_ids=True) == "discord:POST /channels/42/messages"
+
+
+def test_scope_key_hashes_credentials():
+    scope = scope_key("discord", "secret-token")
+    assert scope.startswith("discord@") and "secret" not in scope
+    assert scope == scope_key("discord", "secret-token")
+    assert scope != scope_key("discord", "other-token")
+
+
+def test_learns_the_budget_from_headers():
+    limiter = RateLimiter()
+    route = route_key("twitter", "GET", "/users/me")
+    limiter.update(route, {"x-rate-limit-limit": "5", "x-rate-limit-remaining": "1", "x-rate-limit-reset": str(time.time() + 30)})
+    assert limiter.acquire(route) == 0
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire(route, max_wait=1)
+    assert limiter.snapshot()[route]["limit"] == 5
+
+
+def test_waits_for_the_budget_to_reset():
+    limiter = RateLimiter()
+    route = route_key("discord", "GET", "/channels/1/messages", keep_ids=True)
+    limiter.update(route, {"X-RateLimit-Limit": "2", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.1"})
+    assert 0 < limiter.acquire(route, max_wait=1) < 1
+    # Refilled to the limit, minus the call that waited
+    assert limiter.snapshot()[route]["remaining"] == 1
+
+
+def test_routes_sharing_a_bucket_share_the_budget():
+    limiter = RateLimiter()
+    first = route_key("discord", "GET", "/channels/1", keep_ids=True)
+    second = route_key("discord", "GET", "/channels/2", keep_ids=True)
+    headers = {"X-RateLimit-Bucket": "abc", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "30"}
+    limiter.update(first, headers)
+    limiter.update(second, headers)
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire(second, max_wait=1)
+
+
+def test_bare_429_blocks_only_its_scope():
+    limiter = RateLimiter()
+    ours, theirs = scope_key("echochambers", "a"), scope_key("echochambers", "b")
+    limiter.update(route_key(ours, "POST", "/api/rooms/x/message"), {"Retry-After": "30"}, status_code=429)
+    assert 29 < limiter.retry_after(ours) <= 30
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire(route_key(ours, "GET", "/api/rooms"), max_wait=1)
+    assert limiter.retry_after(theirs) == 0
+    assert limiter.acquire(route_key(theirs, "GET", "/api/rooms"), max_wait=0) == 0
+
+
+def test_global_limit_blocks_the_scope_even_with_route_headers():
+    limiter = RateLimiter()
+    route = route_key("discord", "GET", "/channels/1", keep_ids=True)
+    limiter.update(route, {"X-RateLimit-Remaining": "3", "X-RateLimit-Global": "true", "Retry-After": "10"}, status_code=429)
+    assert limiter.retry_after("discord") > 9
@@ -0,0 +1,113 @@
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+from src.reply_drafts import ReplyDrafter, tweet_time
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def posted_at(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def make_drafter(clock):
+    drafters = []
+
+    def make(generate=lambda tweet: f"reply to {tweet['id']}", **kwargs):
+        drafter = ReplyDrafter(generate, clock=clock, **kwargs)
+        drafters.append(drafter)
+        return drafter
+
+    yield make
+    for drafter in drafters:
+        drafter.close()
+
+
+def test_tweet_time_reads_created_at():
+    assert tweet_time({"created_at": posted_at(1000)}) == 1000
+    assert tweet_time({"created_at": "yesterday"}) is None
+    assert tweet_time({}) is None
+
+
+def test_drafts_only_the_lookahead(make_drafter):
+    drafter = make_drafter(lookahead=2)
+    drafter.sync([{"id": "1"}, {"id": "2"}, {"id": "3"}])
+    assert drafter.pending() == 2
+    assert drafter.take("1", timeout=5) == "reply to 1"
+    assert drafter.take("3") is None
+
+
+def test_tweet_that_left_the_queue_loses_its_draft(make_drafter):
+    drafter = make_drafter()
+    drafter.sync([{"id": "1"}, {"id": "2"}])
+    # like-tweet took tweet 1
+    drafter.sync([{"id": "2"}])
+    assert drafter.pending() == 1
+    assert drafter.take("1") is None
+    assert drafter.take("2", timeout=5) == "reply to 2"
+
+
+def test_tweet_older_than_max_age_gets_no_draft(make_drafter, clock):
+    drafter = make_drafter(max_age=600)
+    drafter.sync([{"id": "old", "created_at": posted_at(clock.now - 601)}, {"id": "new", "created_at": posted_at(clock.now - 60)}])
+    assert drafter.pending() == 1
+    assert drafter.take("old") is None
+
+
+def test_age_counts_from_the_tweet_not_the_draft(make_drafter, clock):
+    drafter = make_drafter(max_age=600)
+    drafter.sync([{"id": "1", "created_at": posted_at(clock.now - 500)}])
+    clock.now += 101
+    assert drafter.take("1", timeout=5) is None
+
+
+def test_age_counts_from_first_sight_without_created_at(make_drafter, clock):
+    drafter = make_drafter(max_age=600)
+    drafter.sync([{"id": "1"}])
+    clock.now += 599
+    drafter.sync([{"id": "1"}])
+    assert drafter.take("1", timeout=5) == "reply to 1"
+
+    drafter.sync([{"id": "2"}])
+    clock.now += 601
+    drafter.sync([{"id": "2"}])
+    assert drafter.pending() == 0
+
+
+def test_take_waits_for_a_draft_in_progress(make_drafter):
+    release = threading.Event()
+
+    def generate(tweet):
+        release.wait(5)
+        return "late reply"
+
+    drafter = make_drafter(generate)
+    drafter.sync([{"id": "1"}])
+    threading.Timer(0.05, release.set).start()
+    assert drafter.take("1", timeout=5) == "late reply"
+
+
+def test_failed_or_empty_draft_is_not_used(make_drafter):
+    def generate(tweet):
+        if tweet["id"] == "1":
+            raise RuntimeError("provider down")
+        return ""
+
+    drafter = make_drafter(generate)
+    drafter.sync([{"id": "1"}, {"id": "2"}])
+    assert drafter.take("1", timeout=5) is None
+    assert drafter.take("2", timeout=5) is None
@@ -0,0 +1,96 @@
+from src.scheduler import TaskScheduler
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_scheduler(clock, **kwargs):
+    tasks = [{"name": "post", "weight": 1}, {"name": "reply", "weight": 1}, {"name": "off", "weight": 0}]
+    return TaskScheduler(tasks, {"post": 60, "reply": 10}, clock=clock, **kwargs)
+
+
+def test_weightless_tasks_are_never_scheduled():
+    scheduler = make_scheduler(FakeClock())
+    assert sorted(scheduler.eligible()) == ["post", "reply"]
+
+
+def test_task_in_flight_is_not_handed_out_again():
+    scheduler = make_scheduler(FakeClock())
+    first = scheduler.acquire()
+    second = scheduler.acquire()
+    assert {first, second} == {"post", "reply"}
+    assert scheduler.acquire() is None
+
+
+def test_interval_runs_from_completion():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock)
+    assert scheduler.acquire(weights={"post": 1, "reply": 0}) == "post"
+    clock.now += 30
+    scheduler.complete("post", True)
+    clock.now += 59
+    assert "post" not in scheduler.eligible()
+    clock.now += 1
+    assert "post" in scheduler.eligible()
+
+
+def test_failed_task_is_retried_after_retry_delay():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, retry_delay=5)
+    assert scheduler.acquire(weights={"post": 1, "reply": 0}) == "post"
+    scheduler.complete("post", False)
+    clock.now += 5
+    assert "post" in scheduler.eligible()
+
+
+def test_zero_weight_override_defers_the_task():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, retry_delay=20)
+    assert scheduler.acquire(weights={"post": 1, "reply": 0}) == "post"
+    assert scheduler.eligible() == []
+    assert scheduler.seconds_until_next() == 20
+
+
+def test_blocked_tasks_are_deferred_for_the_block():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock)
+    blocked = {"post": 45, "reply": 0}
+    assert scheduler.acquire(blocked_for=blocked.get) == "reply"
+    assert scheduler.next_deadline() == clock.now + 45
+
+
+def test_next_deadline_is_the_earliest_task():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock)
+    scheduler.defer("post", 30)
+    scheduler.defer("reply", 10)
+    assert scheduler.seconds_until_next() == 10
+    clock.now += 10
+    assert scheduler.eligible() == ["reply"]
+
+
+def test_min_gap_runs_from_completion():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, min_gap=15)
+    assert scheduler.acquire(weights={"post": 1, "reply": 0}) is not None
+    clock.now += 120
+    scheduler.complete("post", True)
+    clock.now += 14
+    assert scheduler.acquire() is None
+    clock.now += 1
+    assert scheduler.acquire() == "reply"
+
+
+def test_held_task_waits_for_completion():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock)
+    scheduler.hold("post")
+    assert scheduler.eligible() == ["reply"]
+    scheduler.complete("post", True)
+    clock.now += 60
+    assert "post" in scheduler.eligible()